@@ -1,6 +1,9 @@
-from django.apps import AppConfig
-
-
-class CrawlerConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'crawler'
+from django.apps import AppConfig
+
+
+class CrawlerConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'crawler'
+    
+    def ready(self):
+        from . import signals
@@ -0,0 +1,342 @@
+import asyncio
+import time
+import httpx
+from contextvars import ContextVar
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from .models import SearchHistory, CrawlStatus
+from .fetching import RETRY_STATUSES, CircuitOpenError, FetchError, backoff_delay, parse_retry_after
+from .metrics import CrawlMetrics
+from .http_cache import HttpCache
+from .jobs import heartbeat
+from .related import collect_related_changes, refresh_related
+from .services import (
+    USER_AGENT, default_circuit_breaker, default_rate_limiter, describe_fetch_errors, fetch_url,
+    filter_known_articles, finish_crawls, parse_article_html, parse_feed, save_articles_data, tag_feed_url
+)
+
+
+class AsyncMediumCrawler:
+    """
+    Asyncio counterpart of MediumCrawler built on one pooled httpx.AsyncClient,
+    so one event loop can keep many feed and page fetches in flight.
+    
+    It follows the same retry, rate limit, circuit breaker, HTTP cache and
+    metrics rules as MediumCrawler. Database work, cache file I/O and HTML
+    parsing run off the event loop. Use it as an async context manager (or
+    call aclose()) so the pool is shut down:
+    
+        async with AsyncMediumCrawler() as crawler:
+            await asyncio.gather(*(crawler.crawl_tag_articles(tag) for tag in tags))
+    
+    Crawls running at the same time on one crawler share its connection
+    pool, rate limiter and breaker; each keeps its own metrics.
+    """
+    
+    def __init__(self, max_connections=None, rate_limit=None, rate_burst=None, save_batch_size=None,
+                 use_cache=True, refresh_older_than=None, rate_limiter=None, circuit_breaker=None,
+                 transport=None):
+        self.max_connections = max_connections or getattr(settings, 'CRAWLER_ASYNC_MAX_CONNECTIONS', 100)
+        self.save_batch_size = save_batch_size or getattr(settings, 'CRAWLER_SAVE_BATCH_SIZE', 100)
+        self.save_batch_interval = getattr(settings, 'CRAWLER_SAVE_BATCH_INTERVAL', 2)
+        self.rate_limiter = rate_limiter or default_rate_limiter(rate_limit, rate_burst)
+        
+        self.client = httpx.AsyncClient(
+            headers={'User-Agent': USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            timeout=httpx.Timeout(
+                getattr(settings, 'CRAWLER_READ_TIMEOUT', 15),
+                connect=getattr(settings, 'CRAWLER_CONNECT_TIMEOUT', 5)
+            ),
+            follow_redirects=True,
+            transport=transport
+        )
+        self.max_retries = getattr(settings, 'CRAWLER_MAX_RETRIES', 3)
+        self.retry_backoff = getattr(settings, 'CRAWLER_RETRY_BACKOFF', 0.5)
+        self.retry_max_delay = getattr(settings, 'CRAWLER_RETRY_MAX_DELAY', 30)
+        self.circuit_breaker = circuit_breaker or default_circuit_breaker()
+        
+        self.http_cache = HttpCache.from_settings() if use_cache else None
+        self.refresh_older_than = refresh_older_than or getattr(settings, 'CRAWLER_REFRESH_OLDER_THAN', None)
+        # One CrawlMetrics per crawl task; see crawler.metrics
+        self._metrics = ContextVar('crawl_metrics', default=None)
+    
+    @property
+    def metrics(self):
+        metrics = self._metrics.get()
+        if metrics is None:
+            metrics = CrawlMetrics()
+            self._metrics.set(metrics)
+        return metrics
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        await self.client.aclose()
+    
+    async def _db(self, func, *args, **kwargs):
+        """
+        Run database work on Django's sync thread, counting its queries
+        """
+        def run():
+            with connection.execute_wrapper(self.metrics.count_queries):
+                return func(*args, **kwargs)
+        return await sync_to_async(run)()
+    
+    async def _get(self, url):
+        """
+        GET a URL through the HTTP cache, the per-host rate limiter and the
+        retry policy of _request
+        """
+        url = fetch_url(url)
+        meta = await asyncio.to_thread(self.http_cache.lookup, url) if self.http_cache else None
+        if meta and self.http_cache.is_fresh(meta):
+            cached = await asyncio.to_thread(self.http_cache.load, url, meta)
+            if cached:
+                self.metrics.incr('cache_hits')
+                return cached
+        
+        headers = self.http_cache.conditional_headers(meta) if meta else {}
+        response = await self._request(url, headers)
+        
+        if self.http_cache:
+            if response.status_code == 304 and meta:
+                cached = await asyncio.to_thread(self.http_cache.load, url, meta)
+                if cached:
+                    await asyncio.to_thread(self.http_cache.revalidated, url, meta, response.headers)
+                    self.metrics.incr('cache_hits')
+                    return cached
+                # The body vanished under us; fetch it again unconditionally
+                response = await self._request(url)
+            if response.status_code == 200:
+                await asyncio.to_thread(self.http_cache.store, url, response.headers, response.content)
+        
+        return response
+    
+    async def _request(self, url, headers=None):
+        """
+        GET a URL, retrying 429 and 5xx responses, connection errors and
+        timeouts like MediumCrawler._request, but waiting with asyncio.sleep.
+        Raises FetchError once the retries run out, when the server asks for
+        a longer wait than CRAWLER_RETRY_MAX_DELAY, or while the host's
+        circuit is open.
+        """
+        breaker = self.circuit_breaker.breaker_for(url)
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                self.metrics.incr('failed_fetches')
+                raise CircuitOpenError(url, 'Circuit open')
+            
+            delay = self.rate_limiter.reserve(url)
+            if delay > 0:
+                with self.metrics.stage('rate_limit_wait'):
+                    await asyncio.sleep(delay)
+            status = retry_after = None
+            try:
+                response = await self.client.get(url, headers=headers)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                reason = type(e).__name__
+            else:
+                self.metrics.incr('requests')
+                self.metrics.incr('bytes_downloaded', len(response.content))
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                status = response.status_code
+                reason = f"HTTP {status}"
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            
+            if attempt == self.max_retries:
+                break
+            delay = retry_after if retry_after is not None else backoff_delay(
+                attempt, self.retry_backoff, self.retry_max_delay
+            )
+            if delay > self.retry_max_delay:
+                reason += f" (Retry-After {delay:.0f}s)"
+                break
+            
+            self.metrics.incr('retries')
+            if retry_after is not None or status == 429:
+                self.rate_limiter.pause(url, delay)
+            else:
+                with self.metrics.stage('retry_wait'):
+                    await asyncio.sleep(delay)
+        
+        self.metrics.incr('failed_fetches')
+        raise FetchError(url, reason, status)
+    
+    async def search_by_tag(self, tag_name, limit=10):
+        """
+        Search Medium articles by tag using RSS feed.
+        Raises FetchError when the feed cannot be fetched.
+        """
+        try:
+            rss_url = tag_feed_url(tag_name)
+            
+            with self.metrics.stage('feed_fetch'):
+                response = await self._get(rss_url)
+            if response.status_code != 200:
+                return []
+            
+            with self.metrics.stage('feed_parse'):
+                return await asyncio.to_thread(parse_feed, response.content, tag_name, limit)
+        
+        except FetchError:
+            raise
+        except Exception as e:
+            print(f"Error fetching RSS feed for {tag_name}: {str(e)}")
+            return []
+    
+    async def crawl_article_content(self, article_url):
+        """
+        Extract full article content from Medium URL.
+        Returns None when the page is missing or cannot be parsed and raises
+        FetchError when it cannot be fetched.
+        """
+        try:
+            with self.metrics.stage('article_fetch'):
+                response = await self._get(article_url)
+            if response.status_code != 200:
+                return None
+            
+            with self.metrics.stage('article_parse'):
+                return await asyncio.to_thread(parse_article_html, response.content)
+        
+        except FetchError:
+            raise
+        except Exception as e:
+            print(f"Error extracting content from {article_url}: {str(e)}")
+            return None
+    
+    async def crawl_tag_articles(self, tag_name, limit=10, status_callback=None, crawl_status=None, blog_callback=None):
+        """
+        Crawl articles for a specific tag, like MediumCrawler.crawl_tag_articles.
+        All article pages are fetched at once, paced by the per-host rate
+        limiter. The callbacks are plain functions and run through
+        sync_to_async. Returns the number of blogs saved.
+        """
+        start_time = time.time()
+        self._metrics.set(CrawlMetrics())
+        
+        if crawl_status is None:
+            crawl_status = await self._db(
+                CrawlStatus.objects.create,
+                tag=tag_name,
+                status='in_progress',
+                claimed_at=timezone.now()
+            )
+        
+        try:
+            with heartbeat([crawl_status.id]):
+                saved, errors = await self._crawl(tag_name, limit, status_callback, blog_callback)
+                
+                if errors and not saved:
+                    await self._db(
+                        finish_crawls, [crawl_status], self.metrics, 'failed',
+                        blogs_found=0, error_message=describe_fetch_errors(errors)
+                    )
+                    return 0
+                
+                if saved is None:
+                    await self._db(
+                        finish_crawls, [crawl_status], self.metrics, 'completed',
+                        blogs_found=0, error_message="No articles found for this tag"
+                    )
+                    return 0
+                
+                await self._db(
+                    finish_crawls, [crawl_status], self.metrics, 'completed', blogs_found=saved,
+                    error_message=describe_fetch_errors(errors) if errors else None
+                )
+                
+                # Save search history
+                duration = time.time() - start_time
+                await self._db(
+                    SearchHistory.objects.create,
+                    tag_searched=tag_name,
+                    results_count=saved,
+                    crawl_duration=duration
+                )
+            
+            return saved
+        
+        except Exception as e:
+            await self._db(finish_crawls, [crawl_status], self.metrics, 'failed', error_message=str(e))
+            return 0
+    
+    async def _crawl(self, tag_name, limit, status_callback=None, blog_callback=None):
+        """
+        Fetch a tag's feed, then its new article pages concurrently, saving
+        them in batches as they complete. Returns (blogs saved, or None when
+        the feed listed nothing, [fetch errors]).
+        """
+        try:
+            articles = await self.search_by_tag(tag_name, limit)
+        except FetchError as e:
+            return 0, [str(e)]
+        if not articles:
+            return None, []
+        
+        with collect_related_changes() as changed_blogs:
+            # Skip articles we already have before spending requests on them
+            articles = await self._db(filter_known_articles, articles, self.refresh_older_than)
+            
+            async def fetch(article_data):
+                try:
+                    return article_data, await self.crawl_article_content(article_data['url'])
+                except FetchError as e:
+                    return article_data, e
+            
+            saved = 0
+            errors = []
+            batch = []
+            for i, task in enumerate(asyncio.as_completed([fetch(article_data) for article_data in articles])):
+                article_data, additional_content = await task
+                if isinstance(additional_content, FetchError):
+                    errors.append(str(additional_content))
+                    continue
+                
+                if status_callback:
+                    await sync_to_async(status_callback)(f"Crawled article {i+1}: {article_data['title'][:50]}...")
+                
+                if additional_content:
+                    article_data.update(additional_content)
+                
+                batch.append(article_data)
+                if len(batch) == 1:
+                    batch_started = time.monotonic()
+                if len(batch) >= self.save_batch_size or time.monotonic() - batch_started >= self.save_batch_interval:
+                    saved += await self._save_batch(batch, blog_callback)
+                    batch = []
+            
+            # Save whatever is left of the last batch
+            if batch:
+                saved += await self._save_batch(batch, blog_callback)
+        
+        # Related blogs are refreshed once per crawl, not once per batch
+        with self.metrics.stage('db_save'):
+            await self._db(refresh_related, changed_blogs)
+        return saved, errors
+    
+    async def _save_batch(self, articles, blog_callback=None):
+        """
+        Save a batch of crawled articles, report the saved blogs and return
+        how many were saved
+        """
+        with self.metrics.stage('db_save'):
+            blogs = await self._db(save_articles_data, articles)
+        self.metrics.incr('articles_saved', len(blogs))
+        if blogs and blog_callback:
+            await sync_to_async(blog_callback)(blogs)
+        return len(blogs)
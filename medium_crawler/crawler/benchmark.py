@@ -0,0 +1,214 @@
+import hashlib
+import math
+import random
+import threading
+import time
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+from xml.sax.saxutils import escape
+from django.utils import timezone
+
+
+WORDS = (
+    'python django data model query index cache crawler feed article tag author '
+    'server request latency thread worker queue batch search engine vector graph '
+    'design system network memory storage parser token stream learning cloud code'
+).split()
+
+
+def post_id(tag, position):
+    # Twelve hex digits, like a Medium post id; the leading 0 guarantees a digit
+    return '0' + hashlib.sha1(f'{tag}:{position}'.encode('utf-8')).hexdigest()[:11]
+
+
+def article_page(article_id, paragraphs=40):
+    """
+    A Medium-like article page with text unique to the article, so the
+    near-duplicate check does not fold the articles together
+    """
+    rng = random.Random(article_id)
+    body = ''.join(
+        f'<section><h2>Section {i}</h2><p class="pw-post-body-paragraph">'
+        + ' '.join(rng.choice(WORDS) + str(rng.randrange(1000)) for _ in range(40))
+        + '</p></section>'
+        for i in range(paragraphs)
+    )
+    return (
+        f'<!DOCTYPE html><html><head><title>Article {article_id}</title>'
+        '<script>window.__APOLLO_STATE__ = {"clapCount": 999};</script></head><body><article>'
+        f'<h1>Article {article_id}</h1><div><span>{rng.randrange(1, 20)} min read</span></div>'
+        f'{body}<div><span>{rng.randrange(1000)} claps</span></div>'
+        '</article></body></html>'
+    ).encode('utf-8')
+
+
+def feed_xml(tag, articles_per_feed):
+    """
+    A Medium tag feed listing generated articles. Links point at medium.com
+    like real ones; the crawler maps them to the stand-in server.
+    """
+    now = timezone.now()
+    items = []
+    for position in range(articles_per_feed):
+        article_id = post_id(tag, position)
+        items.append(
+            '<item>'
+            f'<title>{escape(tag.title())} story {position}</title>'
+            f'<link>https://medium.com/@author{position % 5}/{escape(tag)}-story-{position}-{article_id}?source=rss</link>'
+            f'<dc:creator>Author {position % 5}</dc:creator>'
+            f'<pubDate>{format_datetime(now)}</pubDate>'
+            f'<category>{escape(tag)}</category>'
+            f'<description>{escape(f"<p>Summary of {tag} story {position}</p>")}</description>'
+            '</item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+        f'<title>{escape(tag)} on Medium</title><link>https://medium.com/tag/{escape(tag)}</link>'
+        + ''.join(items) + '</channel></rss>'
+    ).encode('utf-8')
+
+
+class StandInServer:
+    """
+    Local HTTP server standing in for medium.com: tag feeds under
+    /feed/tag/<tag> and article pages under /p/<id>.
+    
+    Feeds are recorded files ({tag: bytes}) when given, generated otherwise.
+    Article pages cycle through the recorded pages, or are generated per id.
+    Every response is delayed by `latency` seconds, `error_rate` of them
+    fail with a 503 and `throttle_rate` of them are refused with a 429
+    asking the client to retry after `retry_after` seconds.
+    """
+    
+    def __init__(self, feeds=None, pages=None, articles_per_feed=10, latency=0.0, error_rate=0.0,
+                 throttle_rate=0.0, retry_after=1, seed=0):
+        self.feeds = feeds or {}
+        self.pages = pages or []
+        self.articles_per_feed = articles_per_feed
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.server = None
+        self.thread = None
+    
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+    
+    def start(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler_class())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+    
+    def injected_status(self):
+        """
+        503 or 429 when this request is picked to fail, None otherwise
+        """
+        with self.lock:
+            self.requests += 1
+            draw = self.random.random()
+            if draw < self.error_rate:
+                self.errors += 1
+                return 503
+            if draw < self.error_rate + self.throttle_rate:
+                self.throttled += 1
+                return 429
+            return None
+    
+    def respond(self, path):
+        """
+        (status, content type, body) for a request path
+        """
+        path = unquote(urlsplit(path).path).rstrip('/')
+        if path.startswith('/feed/tag/'):
+            tag = path[len('/feed/tag/'):]
+            if self.feeds:
+                feed = self.feeds.get(tag)
+                return (200, 'application/rss+xml', feed) if feed else (404, 'text/plain', b'Unknown tag')
+            return 200, 'application/rss+xml', feed_xml(tag, self.articles_per_feed)
+        if path.startswith('/p/'):
+            article_id = path[len('/p/'):]
+            if self.pages:
+                index = int(hashlib.sha1(article_id.encode('utf-8')).hexdigest(), 16) % len(self.pages)
+                return 200, 'text/html; charset=utf-8', self.pages[index]
+            return 200, 'text/html; charset=utf-8', article_page(article_id)
+        return 404, 'text/plain', b'Not found'
+    
+    def handler_class(self):
+        stand_in = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; with Nagle's algorithm
+            # the body would wait for the client's delayed ACK
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+                status = stand_in.injected_status()
+                if status == 503:
+                    content_type, body = 'text/plain', b'Service unavailable'
+                elif status == 429:
+                    content_type, body = 'text/plain', b'Too many requests'
+                else:
+                    status, content_type, body = stand_in.respond(self.path)
+                self.send_response(status)
+                if status == 429:
+                    self.send_header('Retry-After', str(stand_in.retry_after))
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of a list of numbers
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)), 1) - 1]
+
+
+def latency_summary(seconds):
+    """
+    Count, mean, p50 and p99 in milliseconds of a list of durations
+    """
+    if not seconds:
+        return {'count': 0, 'mean_ms': None, 'p50_ms': None, 'p99_ms': None}
+    return {
+        'count': len(seconds),
+        'mean_ms': round(sum(seconds) / len(seconds) * 1000, 3),
+        'p50_ms': round(percentile(seconds, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(seconds, 0.99) * 1000, 3),
+    }
@@ -0,0 +1,136 @@
+import hashlib
+import re
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit
+from django.conf import settings
+from django.db.models import Q
+from .models import BlogAlias, ContentFingerprint
+
+
+# Medium post ids: the hex suffix of the slug ("my-story-1a2b3c4d5e6f") or a /p/<id> path
+POST_ID_RE = re.compile(r'(?:^|[-/])(?=[0-9a-f]*[0-9])([0-9a-f]{10,16})$')
+WORD_RE = re.compile(r'\w+')
+
+SIMHASH_BITS = 64
+BAND_BITS = 16
+SHINGLE_SIZE = 3
+
+
+def canonical_url(url):
+    """
+    One URL per Medium story. Publication, @user and custom domain paths of
+    a post all end in its id, so they map to https://medium.com/p/<id>;
+    other URLs lose their query string (?source=rss...) and fragment.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/')
+    match = POST_ID_RE.search(path.lower())
+    if match:
+        return f"https://medium.com/p/{match.group(1)}"
+    return urlunsplit(('https', parts.netloc.lower(), path or '/', '', ''))
+
+
+def simhash(text):
+    """
+    64-bit SimHash of the word 3-shingles of a text, or None when the text is
+    too short for the fingerprint to mean anything
+    """
+    words = WORD_RE.findall(text.lower())
+    if len(words) < getattr(settings, 'CRAWLER_NEAR_DUPLICATE_MIN_WORDS', 50):
+        return None
+    shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    digests = b''.join(
+        hashlib.blake2b(shingle.encode('utf-8'), digest_size=SIMHASH_BITS // 8).digest()
+        for shingle in shingles
+    )
+    
+    # Count set bits per position a byte column at a time, which keeps the
+    # per-shingle work in C instead of looping over 64 bits in Python
+    threshold = len(shingles) / 2
+    value = 0
+    for position in range(SIMHASH_BITS // 8):
+        byte_counts = Counter(digests[position::SIMHASH_BITS // 8])
+        shift = SIMHASH_BITS - 8 * (position + 1)
+        for bit in range(8):
+            if sum(count for byte, count in byte_counts.items() if byte >> bit & 1) > threshold:
+                value |= 1 << (shift + bit)
+    return value
+
+
+def to_signed(value):
+    # BigIntegerField is signed
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def bands(value):
+    """
+    The four 16-bit bands of a SimHash
+    """
+    value &= (1 << SIMHASH_BITS) - 1
+    return [(value >> (i * BAND_BITS)) & ((1 << BAND_BITS) - 1) for i in range(SIMHASH_BITS // BAND_BITS)]
+
+
+def probes(band):
+    """
+    A band and its variants with one bit flipped. Two hashes within 7 bits
+    of each other differ in at most one bit in at least one of the four
+    bands, so probing these finds every candidate.
+    """
+    return [band] + [band ^ (1 << bit) for bit in range(BAND_BITS)]
+
+
+def hamming(a, b):
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count('1')
+
+
+def fingerprint(blog_id, value):
+    band_values = bands(value)
+    return ContentFingerprint(
+        blog_id=blog_id, simhash=to_signed(value),
+        band0=band_values[0], band1=band_values[1], band2=band_values[2], band3=band_values[3]
+    )
+
+
+def max_distance():
+    # The band probes only guarantee recall up to 7 bits
+    distance = getattr(settings, 'CRAWLER_NEAR_DUPLICATE_DISTANCE', 6)
+    return min(distance, 7) if distance is not None else None
+
+
+def find_near_duplicates(hashes):
+    """
+    Map each {key: simhash} entry to the id of a stored blog whose content
+    is within CRAWLER_NEAR_DUPLICATE_DISTANCE bits of it. Candidates come
+    from one query on the indexed bands, not a scan of every fingerprint.
+    """
+    distance = max_distance()
+    hashes = {key: value for key, value in hashes.items() if value is not None}
+    if distance is None or not hashes:
+        return {}
+
+    probed = [set(), set(), set(), set()]
+    for value in hashes.values():
+        for i, band in enumerate(bands(value)):
+            probed[i].update(probes(band))
+    condition = (
+        Q(band0__in=probed[0]) | Q(band1__in=probed[1]) | Q(band2__in=probed[2]) | Q(band3__in=probed[3])
+    )
+    candidates = list(ContentFingerprint.objects.filter(condition).values_list('blog_id', 'simhash'))
+
+    duplicates = {}
+    for key, value in hashes.items():
+        matches = [(hamming(value, other), blog_id) for blog_id, other in candidates]
+        matches = [match for match in matches if match[0] <= distance]
+        if matches:
+            duplicates[key] = min(matches)[1]
+    return duplicates
+
+
+def add_aliases(aliases):
+    """
+    Record {url: blog_id} for URLs found to be copies of stored blogs
+    """
+    BlogAlias.objects.bulk_create(
+        [BlogAlias(url=url, blog_id=blog_id) for url, blog_id in aliases.items()],
+        ignore_conflicts=True
+    )
@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.core.cache import caches
+from .models import Blog
+
+
+EVENT_TIMEOUT = 60 * 60
+
+
+def event_cache():
+    """
+    Cache shared by crawl workers and the web process that carries crawl events
+    """
+    return caches[getattr(settings, 'CRAWLER_EVENTS_CACHE', 'default')]
+
+
+def sequence_key(job_id):
+    return f"crawl-events:{job_id}:seq"
+
+
+def event_key(job_id, seq):
+    return f"crawl-events:{job_id}:{seq}"
+
+
+def serialize_blog(blog, tags):
+    """
+    Blog data in the same shape as the crawl progress API
+    """
+    return {
+        'title': blog.title,
+        'author': blog.author.name,
+        'summary': blog.summary or '',
+        'url': blog.medium_url,
+        'published_date': blog.published_date.strftime('%Y-%m-%d') if blog.published_date else 'Unknown',
+        'reading_time': blog.reading_time,
+        'tags': tags,
+    }
+
+
+class CrawlEventPublisher:
+    """
+    Callbacks for crawl_tag_articles that append each progress message (as
+    status_callback) and saved blog (`saved`, as blog_callback) to the job's
+    event log, where the SSE endpoint picks them up
+    """
+    
+    def __init__(self, crawl_status):
+        self.crawl_status = crawl_status
+        self.cache = event_cache()
+    
+    def publish(self, event_type, data):
+        key = sequence_key(self.crawl_status.id)
+        self.cache.add(key, 0, EVENT_TIMEOUT)
+        seq = self.cache.incr(key)
+        self.cache.set(event_key(self.crawl_status.id, seq), {'type': event_type, 'data': data}, EVENT_TIMEOUT)
+    
+    def __call__(self, message):
+        self.publish('progress', {'message': message})
+    
+    def saved(self, blogs):
+        # One query for the tags of the whole saved batch
+        blog_tags = {}
+        for blog_id, name in Blog.tags.through.objects.filter(
+            blog_id__in=[blog.id for blog in blogs]
+        ).values_list('blog_id', 'tag__name'):
+            blog_tags.setdefault(blog_id, []).append(name)
+        for blog in blogs:
+            self.publish('blog', serialize_blog(blog, blog_tags.get(blog.id, [])))
+    
+    def status(self):
+        crawl_status = self.crawl_status
+        self.publish('status', {
+            'status': crawl_status.status,
+            'blogs_found': crawl_status.blogs_found,
+            'completed_at': crawl_status.completed_at.isoformat() if crawl_status.completed_at else None,
+            'error_message': crawl_status.error_message,
+        })
+
+
+def read_events(job_id, after_seq):
+    """
+    Return [(seq, event)] published for a job after `after_seq`, in order
+    """
+    cache = event_cache()
+    last_seq = cache.get(sequence_key(job_id), 0)
+    if last_seq <= after_seq:
+        return []
+    found = cache.get_many([event_key(job_id, seq) for seq in range(after_seq + 1, last_seq + 1)])
+    
+    # The sequence is bumped just before the event is written, so stop at the
+    # first gap and pick the rest up on the next read
+    events = []
+    for seq in range(after_seq + 1, last_seq + 1):
+        event = found.get(event_key(job_id, seq))
+        if event is None:
+            break
+        events.append((seq, event))
+    return events
@@ -0,0 +1,231 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class FetchError(Exception):
+    """
+    A request that failed for good: its retries ran out or the host's
+    circuit is open
+    """
+    
+    def __init__(self, url, reason, status=None):
+        super().__init__(f"{reason} for {url}")
+        self.url = url
+        self.reason = reason
+        self.status = status
+
+
+class CircuitOpenError(FetchError):
+    pass
+
+
+def host_of(url):
+    return urlparse(url).netloc.lower()
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second with bursts of `capacity`
+    """
+    
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        """
+        Take one token and return how many seconds the caller must wait
+        before using it
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def pause(self, seconds):
+        """
+        Hold back every caller for at least `seconds`, as asked by a
+        throttled response
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens = min(self.tokens, -seconds * self.rate)
+    
+    def acquire(self):
+        """
+        Block until a token is available
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class HostRateLimiter:
+    """
+    Keeps one token bucket per host so every site gets its own politeness budget
+    """
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+        self.lock = threading.Lock()
+    
+    def bucket_for(self, url):
+        host = host_of(url)
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self.buckets[host] = bucket
+            return bucket
+    
+    def reserve(self, url):
+        return self.bucket_for(url).reserve()
+    
+    def acquire(self, url):
+        self.bucket_for(url).acquire()
+    
+    def pause(self, url, seconds):
+        self.bucket_for(url).pause(seconds)
+
+
+class CircuitBreaker:
+    """
+    Fails requests to a struggling host fast instead of letting each one
+    burn its retries and timeouts.
+    
+    After `threshold` failures in a row the circuit opens and `allow()`
+    refuses requests for `reset_timeout` seconds. Then a single trial request
+    is let through: a success closes the circuit, a failure opens it again.
+    """
+    
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.half_open = False
+        self.lock = threading.Lock()
+    
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            # Let one trial through; restarting the clock also covers a
+            # trial that never reports back
+            self.opened_at = now
+            self.half_open = True
+            return True
+    
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.half_open = False
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.half_open or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                self.half_open = False
+
+
+class HostCircuitBreaker:
+    """
+    Keeps one circuit breaker per host, so one failing site does not stop
+    requests to the others
+    """
+    
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}
+        self.lock = threading.Lock()
+    
+    def breaker_for(self, url):
+        host = host_of(url)
+        with self.lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.threshold, self.reset_timeout)
+                self.breakers[host] = breaker
+            return breaker
+
+
+def backoff_delay(attempt, base, cap):
+    """
+    Exponential backoff with full jitter: a random delay of up to
+    base * 2 ** attempt seconds, at most `cap`. The jitter keeps threads
+    that failed together from retrying together.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def parse_retry_after(value):
+    """
+    Seconds to wait according to a Retry-After header, given either as
+    seconds or as an HTTP date; None when missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def bounded_map(executor, func, items, max_pending):
+    """
+    Yield (item, func(item)) pairs as the calls run on `executor` complete.
+    
+    At most `max_pending` calls are queued or running at a time and `items`
+    is consumed lazily, only when a slot frees up, so a slow consumer holds
+    back the producer instead of results piling up in memory.
+    """
+    items = iter(items)
+    pending = {}
+    
+    def fill():
+        while len(pending) < max_pending:
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            pending[executor.submit(func, item)] = item
+    
+    fill()
+    while pending:
+        done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = pending.pop(future)
+            yield item, future.result()
+        fill()
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from django.conf import settings
+
+
+class CachedResponse:
+    """
+    Minimal response object for bodies served from the HTTP cache
+    """
+    
+    def __init__(self, url, content, headers=None, status_code=200):
+        self.url = url
+        self.content = content
+        self.headers = headers or {}
+        self.status_code = status_code
+        self.from_cache = True
+
+
+class HttpCache:
+    """
+    On-disk cache of response bodies keyed by URL.
+    
+    Each entry is a zlib-compressed body plus a small JSON file holding the
+    validators (ETag / Last-Modified) used to revalidate it with a conditional
+    request. Entries younger than `ttl` seconds are served without any request.
+    When the bodies exceed `max_bytes`, the least recently used are evicted.
+    """
+    
+    def __init__(self, directory, ttl=300, max_bytes=200 * 1024 * 1024):
+        self.directory = str(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size = None
+        self.lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+    
+    @classmethod
+    def from_settings(cls):
+        """
+        Build the cache configured in settings, or return None when disabled
+        """
+        directory = getattr(settings, 'CRAWLER_HTTP_CACHE_DIR', None)
+        if not directory:
+            return None
+        return cls(
+            directory,
+            ttl=getattr(settings, 'CRAWLER_HTTP_CACHE_TTL', 300),
+            max_bytes=getattr(settings, 'CRAWLER_HTTP_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+        )
+    
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return base + '.json', base + '.body'
+    
+    def _write(self, path, data):
+        # Write to a temp file and rename so readers never see partial entries
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    
+    def lookup(self, url):
+        """
+        Return the stored metadata for a URL, or None
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'rb') as f:
+                meta = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path):
+            return None
+        return meta
+    
+    def is_fresh(self, meta):
+        return time.time() - meta['stored_at'] < self.ttl
+    
+    def conditional_headers(self, meta):
+        """
+        Validators to send so the server can answer 304 Not Modified
+        """
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+    
+    def load(self, url, meta):
+        """
+        Read a cached body and return it as a CachedResponse.
+        Returns None if the entry disappeared (e.g. it was just evicted).
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                content = zlib.decompress(f.read())
+            # Reads count as use for LRU eviction
+            os.utime(body_path)
+        except (OSError, zlib.error):
+            return None
+        return CachedResponse(url, content, headers=meta.get('headers'))
+    
+    def store(self, url, headers, content):
+        """
+        Cache a 200 response body with its validators
+        """
+        meta_path, body_path = self._paths(url)
+        body = zlib.compress(content)
+        meta = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'headers': {'Content-Type': headers.get('Content-Type', '')},
+            'stored_at': time.time(),
+        }
+        self._write(body_path, body)
+        self._write(meta_path, json.dumps(meta).encode('utf-8'))
+        
+        with self.lock:
+            if self.size is not None:
+                self.size += len(body)
+            if self.size is None or self.size > self.max_bytes:
+                self.evict()
+    
+    def revalidated(self, url, meta, headers):
+        """
+        Record a 304 answer: the body is still valid, restart its TTL
+        """
+        meta_path, body_path = self._paths(url)
+        meta['stored_at'] = time.time()
+        meta['etag'] = headers.get('ETag') or meta.get('etag')
+        meta['last_modified'] = headers.get('Last-Modified') or meta.get('last_modified')
+        self._write(meta_path, json.dumps(meta).encode('utf-8'))
+    
+    def evict(self):
+        """
+        Delete least recently used entries until the cache fits in max_bytes
+        """
+        entries = []
+        total = 0
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.body'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        
+        if total > self.max_bytes:
+            # Leave some headroom so we don't evict again on the next store
+            target = self.max_bytes * 0.9
+            for mtime, size, path in sorted(entries):
+                if total <= target:
+                    break
+                for stale_path in (path, path[:-len('.body')] + '.json'):
+                    try:
+                        os.remove(stale_path)
+                    except OSError:
+                        pass
+                total -= size
+        
+        self.size = total
@@ -0,0 +1,95 @@
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from .models import CrawlStatus
+
+
+def enqueue_crawl(tag_name):
+    """
+    Queue a crawl for a tag, reusing a pending job for the same tag if one exists.
+    The crawler_crawl_one_pending constraint settles concurrent requests.
+    """
+    while True:
+        try:
+            job, created = CrawlStatus.objects.get_or_create(tag=tag_name, status='pending')
+            return job
+        except IntegrityError:
+            # The other request's job was claimed before we could look it up
+            continue
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest pending job to in_progress and return it.
+    Returns None when the queue is empty.
+    """
+    while True:
+        job_id = CrawlStatus.objects.filter(
+            status='pending'
+        ).order_by('started_at', 'id').values_list('id', flat=True).first()
+        if job_id is None:
+            return None
+
+        # Only one worker can win the pending -> in_progress transition
+        claimed = CrawlStatus.objects.filter(id=job_id, status='pending').update(
+            status='in_progress', claimed_at=timezone.now()
+        )
+        if claimed:
+            return CrawlStatus.objects.get(id=job_id)
+
+
+@contextmanager
+def heartbeat(job_ids):
+    """
+    Refresh the claimed_at of running jobs every CRAWLER_JOB_HEARTBEAT seconds
+    while the block runs, so requeue_stale_jobs leaves live crawls alone
+    however long they take
+    """
+    interval = getattr(settings, 'CRAWLER_JOB_HEARTBEAT', 60)
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                CrawlStatus.objects.filter(id__in=job_ids, status='in_progress').update(claimed_at=timezone.now())
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name='crawl-heartbeat', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def requeue_stale_jobs(older_than):
+    """
+    Put in_progress jobs whose claimed_at is more than `older_than` seconds old
+    back to pending. Running crawls keep it fresh (see heartbeat), so these
+    are jobs whose worker died before finishing them; one whose tag has been
+    queued again since is failed instead. `older_than` must be well above
+    CRAWLER_JOB_HEARTBEAT.
+    """
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    requeued = 0
+    stale_ids = CrawlStatus.objects.filter(
+        status='in_progress',
+        claimed_at__lt=cutoff
+    ).order_by('claimed_at').values_list('id', flat=True)
+    for job_id in list(stale_ids):
+        try:
+            with transaction.atomic():
+                requeued += CrawlStatus.objects.filter(id=job_id, status='in_progress').update(
+                    status='pending', claimed_at=None
+                )
+        except IntegrityError:
+            CrawlStatus.objects.filter(id=job_id, status='in_progress').update(
+                status='failed', completed_at=timezone.now(),
+                error_message='Worker stopped; the tag was queued again'
+            )
+    return requeued
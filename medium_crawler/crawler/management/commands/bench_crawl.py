@@ -0,0 +1,216 @@
+import json
+import subprocess
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from crawler.benchmark import StandInServer, latency_summary
+from crawler.fetching import FetchError
+from crawler.services import MediumCrawler
+
+
+# (label, path in the results, True when higher is better) shown by --compare
+COMPARED_METRICS = [
+    ('articles/sec', ('end_to_end', 'articles_per_sec'), True),
+    ('queries/article', ('end_to_end', 'queries_per_article'), False),
+    ('feed p50 ms', ('stages', 'feed', 'p50_ms'), False),
+    ('feed p99 ms', ('stages', 'feed', 'p99_ms'), False),
+    ('article p50 ms', ('stages', 'article', 'p50_ms'), False),
+    ('article p99 ms', ('stages', 'article', 'p99_ms'), False),
+    ('save p50 ms', ('stages', 'save', 'p50_ms'), False),
+    ('save p99 ms', ('stages', 'save', 'p99_ms'), False),
+    ('save queries/article', ('stages', 'save', 'queries_per_article'), False),
+]
+
+
+def git_commit():
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def lookup(results, path):
+    for key in path:
+        if not isinstance(results, dict):
+            return None
+        results = results.get(key)
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the crawl pipeline against a local stand-in for medium.com'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('tags', nargs='*', help='Tags to crawl (defaults to the recorded feeds, or python django data-science)')
+        parser.add_argument('--feeds', help='Directory of recorded feeds named <tag>.xml')
+        parser.add_argument('--pages', help='Directory of recorded article pages (*.html), served in turn')
+        parser.add_argument('--limit', type=int, default=10, help='Articles per feed')
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'CRAWLER_MAX_WORKERS', 4),
+                            help='Concurrent article requests in the end-to-end run')
+        parser.add_argument('--latency', type=float, default=0.0, help='Server latency per response (ms)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of responses failing with a 503')
+        parser.add_argument('--throttle-rate', type=float, default=0.0,
+                            help='Fraction of responses refused with a 429 and a Retry-After')
+        parser.add_argument('--retry-after', type=int, default=1, help='Retry-After of the injected 429s (seconds)')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the injected errors')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Results JSON of an earlier run to compare against')
+    
+    def handle(self, *args, **options):
+        feeds = {}
+        if options['feeds']:
+            feeds = {path.stem: path.read_bytes() for path in sorted(Path(options['feeds']).glob('*.xml'))}
+            if not feeds:
+                raise CommandError(f"No *.xml feeds in {options['feeds']}")
+        pages = []
+        if options['pages']:
+            pages = [path.read_bytes() for path in sorted(Path(options['pages']).glob('*.html'))]
+            if not pages:
+                raise CommandError(f"No *.html pages in {options['pages']}")
+        tag_names = options['tags'] or list(feeds) or ['python', 'django', 'data-science']
+        
+        server = StandInServer(
+            feeds=feeds, pages=pages, articles_per_feed=options['limit'],
+            latency=options['latency'] / 1000, error_rate=options['error_rate'],
+            throttle_rate=options['throttle_rate'], retry_after=options['retry_after'], seed=options['seed']
+        )
+        # A throwaway test database, so the benchmark never touches real data
+        old_database_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with server, override_settings(CRAWLER_MEDIUM_BASE_URL=server.url):
+                # Rate limiting and the HTTP cache would only measure themselves
+                crawler = MediumCrawler(max_workers=options['workers'], rate_limit=1e6, rate_burst=1e6, use_cache=False)
+                self.stdout.write(f"Stand-in server at {server.url}, {len(tag_names)} tag(s) x {options['limit']} articles")
+                stages = self.run_stages(crawler, tag_names, options['limit'])
+                call_command('flush', interactive=False, verbosity=0)
+                end_to_end = self.run_end_to_end(crawler, tag_names, options['limit'])
+        finally:
+            connection.creation.destroy_test_db(old_database_name, verbosity=0)
+        
+        results = {
+            'created_at': timezone.now().isoformat(),
+            'commit': git_commit(),
+            'config': {
+                'tags': tag_names,
+                'limit': options['limit'],
+                'workers': options['workers'],
+                'latency_ms': options['latency'],
+                'error_rate': options['error_rate'],
+                'throttle_rate': options['throttle_rate'],
+                'recorded_feeds': bool(feeds),
+                'recorded_pages': len(pages),
+                'database': connection.vendor,
+            },
+            'stages': stages,
+            'end_to_end': end_to_end,
+            'server': {'requests': server.requests, 'errors': server.errors, 'throttled': server.throttled},
+        }
+        self.print_results(results)
+        
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                self.print_comparison(json.load(f), results)
+    
+    def run_stages(self, crawler, tag_names, limit):
+        """
+        Time each stage on its own, one call at a time: feed fetch and parse,
+        article fetch and parse, and saving one article
+        """
+        timings = {'feed': [], 'article': [], 'save': []}
+        save_queries = 0
+        articles = []
+        for tag_name in tag_names:
+            start = time.perf_counter()
+            try:
+                articles.extend(crawler.search_by_tag(tag_name, limit))
+            except FetchError as e:
+                self.stderr.write(str(e))
+            timings['feed'].append(time.perf_counter() - start)
+        
+        for article_data in articles:
+            start = time.perf_counter()
+            try:
+                additional_content = crawler.crawl_article_content(article_data['url'])
+            except FetchError:
+                additional_content = None
+            timings['article'].append(time.perf_counter() - start)
+            if additional_content:
+                article_data.update(additional_content)
+        
+        for article_data in articles:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                crawler._save_article_data(article_data)
+                timings['save'].append(time.perf_counter() - start)
+            save_queries += len(queries)
+        
+        stages = {name: latency_summary(seconds) for name, seconds in timings.items()}
+        stages['save']['queries_per_article'] = round(save_queries / len(articles), 2) if articles else None
+        return stages
+    
+    def run_end_to_end(self, crawler, tag_names, limit):
+        """
+        Crawl every tag with crawl_tag_articles, as a crawl job does
+        """
+        retries = failed_fetches = queries = 0
+        saved = 0
+        start = time.perf_counter()
+        for tag_name in tag_names:
+            saved += crawler.crawl_tag_articles(tag_name, limit)
+            retries += crawler.metrics.counters['retries']
+            failed_fetches += crawler.metrics.counters['failed_fetches']
+            # Counted by the crawl itself; the debug query log keeps only the last 9000
+            queries += crawler.metrics.counters['db_queries']
+        seconds = time.perf_counter() - start
+        return {
+            'articles': saved,
+            'seconds': round(seconds, 3),
+            'articles_per_sec': round(saved / seconds, 2) if seconds else None,
+            'queries': queries,
+            'queries_per_article': round(queries / saved, 2) if saved else None,
+            'retries': retries,
+            'failed_fetches': failed_fetches,
+        }
+    
+    def print_results(self, results):
+        self.stdout.write(f"{'stage':<10} {'count':>6} {'p50 ms':>10} {'p99 ms':>10} {'mean ms':>10}")
+        for name, stage in results['stages'].items():
+            if stage['count']:
+                self.stdout.write(
+                    f"{name:<10} {stage['count']:>6} {stage['p50_ms']:>10.2f} {stage['p99_ms']:>10.2f} {stage['mean_ms']:>10.2f}"
+                )
+        self.stdout.write(f"Save queries per article: {results['stages']['save']['queries_per_article']}")
+        end_to_end = results['end_to_end']
+        self.stdout.write(
+            f"End to end: {end_to_end['articles']} articles in {end_to_end['seconds']:.2f}s "
+            f"({end_to_end['articles_per_sec']} articles/sec, {end_to_end['queries_per_article']} queries/article, "
+            f"{end_to_end['retries']} retries, {end_to_end['failed_fetches']} failed fetches)"
+        )
+        server = results['server']
+        self.stdout.write(
+            f"Server: {server['requests']} requests, {server['errors']} injected errors, {server['throttled']} throttled"
+        )
+    
+    def print_comparison(self, previous, results):
+        self.stdout.write(f"Compared with {previous.get('commit') or 'previous run'}:")
+        for label, path, higher_is_better in COMPARED_METRICS:
+            old, new = lookup(previous, path), lookup(results, path)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = change < 0 if higher_is_better else change > 0
+            marker = '  worse' if worse and abs(change) >= 10 else ''
+            self.stdout.write(f"  {label:<22} {old:>10} -> {new:<10} {change:+6.1f}%{marker}")
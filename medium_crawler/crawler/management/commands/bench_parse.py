@@ -0,0 +1,92 @@
+import re
+import statistics
+import time
+from pathlib import Path
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+from crawler.services import parse_article_html
+
+
+def legacy_parse_article_html(html):
+    """
+    The previous html.parser based extractor, kept as the benchmark baseline
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    content_elements = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+    full_content = '\n\n'.join([elem.get_text().strip()
+                              for elem in content_elements
+                              if elem.get_text().strip()])
+    
+    reading_time = 'Unknown'
+    page_text = soup.get_text()
+    for pattern in [r'\d+\s*min\s*read', r'\d+\s*minute\s*read']:
+        match = re.search(pattern, page_text, re.IGNORECASE)
+        if match:
+            reading_time = match.group()
+            break
+    
+    claps_count = 0
+    for pattern in [r'(\d+)\s*clap', r'(\d+)\s*applause']:
+        match = re.search(pattern, page_text, re.IGNORECASE)
+        if match:
+            claps_count = int(match.group(1))
+            break
+    
+    return {'content': full_content, 'reading_time': reading_time, 'claps_count': claps_count}
+
+
+def sample_page(paragraphs=120):
+    """
+    A Medium-like article page used when no saved pages are given
+    """
+    body = ''.join(
+        f'<section><h2>Section {i}</h2><p class="pw-post-body-paragraph">Paragraph {i} '
+        f'with <a href="#">a link</a>, <strong>bold text</strong> and <code>inline code</code>.</p></section>'
+        for i in range(paragraphs)
+    )
+    return (
+        '<!DOCTYPE html><html><head><title>Sample</title>'
+        '<script>window.__APOLLO_STATE__ = {"clapCount": 999};</script>'
+        '<style>.a{color:red}</style></head><body><article>'
+        '<h1>Sample article</h1><div><span>7 min read</span> · <span>Jan 5</span></div>'
+        f'{body}<div><button>1.2K</button><span>312 claps</span></div>'
+        '</article></body></html>'
+    ).encode('utf-8')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark article HTML parsing over saved Medium pages'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='*',
+            help='Saved article pages, or directories of *.html files (defaults to a generated page)'
+        )
+        parser.add_argument('--repeat', type=int, default=20, help='Parses per page for each parser')
+    
+    def handle(self, *args, **options):
+        pages = []
+        for path in map(Path, options['paths']):
+            files = sorted(path.glob('*.html')) if path.is_dir() else [path]
+            pages.extend((str(f), f.read_bytes()) for f in files)
+        if not pages:
+            pages = [('<generated sample>', sample_page())]
+        
+        parsers = [('html.parser (legacy)', legacy_parse_article_html), ('lxml single pass', parse_article_html)]
+        totals = {name: [] for name, parser in parsers}
+        
+        for label, html in pages:
+            self.stdout.write(f"{label} ({len(html) / 1024:.0f} KiB)")
+            for name, parser in parsers:
+                timings = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    parser(html)
+                    timings.append(time.perf_counter() - start)
+                median = statistics.median(timings) * 1000
+                totals[name].append(median)
+                self.stdout.write(f"  {name:<22} {median:8.2f} ms/page")
+        
+        self.stdout.write(f"Median over {len(pages)} page(s):")
+        for name, parser in parsers:
+            self.stdout.write(f"  {name:<22} {statistics.median(totals[name]):8.2f} ms/page")
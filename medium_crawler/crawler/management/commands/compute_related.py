@@ -0,0 +1,15 @@
+import time
+from django.core.management.base import BaseCommand
+from crawler.related import rebuild_related
+
+
+class Command(BaseCommand):
+    help = 'Recompute the related articles of every blog from their tags'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Blogs written per transaction')
+    
+    def handle(self, *args, **options):
+        start_time = time.time()
+        count = rebuild_related(batch_size=options['batch_size'])
+        self.stdout.write(f"Computed related articles for {count} blog(s) in {time.time() - start_time:.1f}s")
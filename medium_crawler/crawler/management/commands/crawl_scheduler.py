@@ -0,0 +1,63 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from crawler.scheduling import due_schedules, record_polls, seconds_until_next_due, sync_schedules
+from crawler.services import MediumCrawler
+
+
+class Command(BaseCommand):
+    help = 'Poll tag feeds continuously, each tag at an interval adapted to how often it has new articles'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help='Feed entries read per tag')
+        parser.add_argument('--batch-size', type=int, default=50, help='Most due tags crawled per round')
+        parser.add_argument(
+            '--workers', type=int,
+            default=getattr(settings, 'CRAWLER_MAX_WORKERS', 4),
+            help='Concurrent feed and article requests'
+        )
+        parser.add_argument(
+            '--max-sleep', type=float, default=60.0,
+            help='Longest wait between rounds, so newly searched tags get picked up'
+        )
+        parser.add_argument('--once', action='store_true', help='Run one round of due tags and exit')
+    
+    def handle(self, *args, **options):
+        crawler = MediumCrawler(max_workers=options['workers'])
+        seen = None
+        try:
+            while True:
+                created, seen = sync_schedules(seen)
+                if created:
+                    self.stdout.write(f"Scheduled {created} new tag(s)")
+                
+                schedules = due_schedules(options['batch_size'])
+                if schedules:
+                    self.poll(crawler, schedules, options['limit'])
+                if options['once']:
+                    break
+                if len(schedules) == options['batch_size']:
+                    # More tags are overdue, keep going
+                    continue
+                
+                wait = seconds_until_next_due()
+                wait = options['max_sleep'] if wait is None else min(wait, options['max_sleep'])
+                connection.close()
+                time.sleep(wait)
+        except KeyboardInterrupt:
+            self.stdout.write("Scheduler stopped")
+    
+    def poll(self, crawler, schedules, limit):
+        start_time = time.time()
+        # Polls are not searches, so they stay out of the search history
+        results = crawler.crawl_tags([schedule.tag for schedule in schedules], limit=limit, record_history=False)
+        record_polls(schedules, results, limit, failed=crawler.failed_tags)
+        for schedule in schedules:
+            outcome = 'failed' if schedule.tag in crawler.failed_tags else f"{schedule.last_new_count} new"
+            self.stdout.write(
+                f"  {schedule.tag:<30} {outcome}, "
+                f"next in {(schedule.next_due_at - timezone.now()).total_seconds() / 60:.0f} min"
+            )
+        self.stdout.write(f"Polled {len(schedules)} tag(s) in {time.time() - start_time:.1f}s")
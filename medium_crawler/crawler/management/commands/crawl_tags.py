@@ -0,0 +1,49 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from crawler.models import Tag
+from crawler.services import MediumCrawler
+
+
+class Command(BaseCommand):
+    help = 'Crawl many tags in one run, fetching articles shared between tags once'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('tags', nargs='*', help='Tags to crawl')
+        parser.add_argument('--file', help='File with one tag per line (# starts a comment)')
+        parser.add_argument('--from-db', action='store_true', help='Crawl every tag already in the database')
+        parser.add_argument('--limit', type=int, default=10, help='Feed entries read per tag')
+        parser.add_argument(
+            '--workers', type=int,
+            default=getattr(settings, 'CRAWLER_MAX_WORKERS', 4),
+            help='Concurrent feed and article requests'
+        )
+    
+    def handle(self, *args, **options):
+        tag_names = list(options['tags'])
+        if options['file']:
+            with open(options['file'], encoding='utf-8') as f:
+                for line in f:
+                    line = line.split('#', 1)[0].strip()
+                    if line:
+                        tag_names.append(line)
+        if options['from_db']:
+            tag_names.extend(Tag.objects.order_by('name').values_list('name', flat=True))
+        if not tag_names:
+            raise CommandError('Give tags as arguments, with --file or with --from-db')
+        if any(not tag_name.strip() for tag_name in tag_names):
+            raise CommandError('Tags cannot be empty or whitespace')
+        
+        crawler = MediumCrawler(max_workers=options['workers'])
+        start_time = time.time()
+        results = crawler.crawl_tags(tag_names, limit=options['limit'], status_callback=self.report)
+        
+        if not results:
+            raise CommandError('Crawl failed, see the crawl status records for details')
+        for tag_name, count in results.items():
+            outcome = 'failed' if tag_name in crawler.failed_tags else f"{count} new"
+            self.stdout.write(f"  {tag_name:<30} {outcome}")
+        self.stdout.write(f"Crawled {len(results)} tag(s) in {time.time() - start_time:.1f}s")
+    
+    def report(self, message):
+        self.stdout.write(message)
@@ -0,0 +1,85 @@
+import threading
+import time
+import traceback
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from crawler.events import CrawlEventPublisher
+from crawler.jobs import claim_next_job, requeue_stale_jobs
+from crawler.services import MediumCrawler, default_circuit_breaker, default_rate_limiter
+
+
+class Command(BaseCommand):
+    help = 'Run a pool of workers that drain the crawl job queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int,
+            default=getattr(settings, 'CRAWLER_QUEUE_WORKERS', 2),
+            help='Number of crawl jobs processed at the same time'
+        )
+        parser.add_argument('--limit', type=int, default=10, help='Articles crawled per tag')
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help='Seconds an idle worker waits before checking the queue again'
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=3600,
+            help='Requeue in_progress jobs older than this many seconds on startup (0 disables)'
+        )
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        if options['stale_after']:
+            requeued = requeue_stale_jobs(options['stale_after'])
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+        # One politeness budget and breaker per host for the whole process
+        options['rate_limiter'] = default_rate_limiter()
+        options['circuit_breaker'] = default_circuit_breaker()
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=self.work, args=(stop, options), name=f"crawl-worker-{i}")
+            for i in range(options['workers'])
+        ]
+        for thread in threads:
+            thread.start()
+
+        self.stdout.write(f"Started {len(threads)} crawl worker(s)")
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping after the current jobs finish...")
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def work(self, stop, options):
+        crawler = MediumCrawler(rate_limiter=options['rate_limiter'], circuit_breaker=options['circuit_breaker'])
+        try:
+            while not stop.is_set():
+                job = claim_next_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    stop.wait(options['poll_interval'])
+                    continue
+
+                self.stdout.write(f"Crawling '{job.tag}' (job {job.id})")
+                start_time = time.time()
+                events = CrawlEventPublisher(job)
+                try:
+                    events.status()
+                    crawler.crawl_tag_articles(
+                        job.tag, limit=options['limit'], status_callback=events, crawl_status=job,
+                        blog_callback=events.saved
+                    )
+                    events.status()
+                except Exception:
+                    self.stderr.write(f"Error crawling '{job.tag}' (job {job.id}):\n{traceback.format_exc()}")
+                self.stdout.write(f"Finished '{job.tag}' in {time.time() - start_time:.1f}s")
+        finally:
+            connection.close()
@@ -0,0 +1,123 @@
+import threading
+import time
+from contextlib import contextmanager
+from django.db import transaction
+from django.db.models import Count, F
+from .models import CrawlMetricTotal, CrawlStatus
+
+
+# Stages timed during a crawl. The fetch stages include time spent waiting
+# for the rate limiter and backing off before retries, which are also
+# reported on their own.
+STAGES = ('feed_fetch', 'feed_parse', 'article_fetch', 'article_parse', 'db_save', 'rate_limit_wait', 'retry_wait')
+
+COUNTERS = {
+    'requests': 'HTTP requests sent',
+    'cache_hits': 'Responses served from the HTTP cache, revalidated ones included',
+    'bytes_downloaded': 'Response bytes downloaded',
+    'retries': 'Requests retried after a 429, a 5xx response, a connection error or a timeout',
+    'failed_fetches': 'Requests given up on after retries or refused by an open circuit',
+    'db_queries': 'Database queries issued by crawls',
+    'articles_saved': 'Articles saved or refreshed',
+}
+
+
+class CrawlMetrics:
+    """
+    Stage timings and counters of one crawl, safe to update from the fetch
+    threads
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+    
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+    
+    def add_time(self, name, seconds):
+        with self.lock:
+            self.seconds[name] += seconds
+            self.calls[name] += 1
+    
+    def incr(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+    
+    def count_queries(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper (connection.execute_wrapper) counting queries
+        """
+        self.incr('db_queries')
+        return execute(sql, params, many, context)
+    
+    def as_dict(self):
+        with self.lock:
+            return {
+                'stages': {
+                    name: {'seconds': round(self.seconds[name], 6), 'calls': self.calls[name]}
+                    for name in STAGES
+                },
+                'counters': dict(self.counters),
+            }
+
+
+def record_totals(metrics, crawls=1):
+    """
+    Add a crawl's metrics (CrawlMetrics.as_dict()) to the running totals
+    exported by /metrics. Increments are done in SQL, so concurrent crawl
+    workers never lose each other's updates.
+    """
+    values = {'crawls': crawls}
+    for name, stage in metrics.get('stages', {}).items():
+        values[f'stage_seconds:{name}'] = stage['seconds']
+        values[f'stage_calls:{name}'] = stage['calls']
+    for name, value in metrics.get('counters', {}).items():
+        values[f'counter:{name}'] = value
+    
+    with transaction.atomic():
+        CrawlMetricTotal.objects.bulk_create(
+            [CrawlMetricTotal(name=name) for name in values], ignore_conflicts=True
+        )
+        for name, value in values.items():
+            if value:
+                CrawlMetricTotal.objects.filter(name=name).update(value=F('value') + value)
+
+
+def prometheus_value(value):
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+def render_metrics():
+    """
+    Crawl totals and the job queue in the Prometheus text exposition format
+    """
+    totals = dict(CrawlMetricTotal.objects.values_list('name', 'value'))
+    jobs = dict(CrawlStatus.objects.values_list('status').annotate(count=Count('*')).order_by())
+    lines = []
+    
+    def metric(name, kind, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{label}"' for key, label in labels.items())
+            lines.append(f'{name}{{{label_text}}} {prometheus_value(value)}' if label_text else f'{name} {prometheus_value(value)}')
+    
+    metric('crawler_crawls_total', 'counter', 'Crawls finished, failed ones included',
+           [({}, int(totals.get('crawls', 0)))])
+    metric('crawler_stage_seconds_total', 'counter', 'Time spent in each crawl stage, summed over threads',
+           [({'stage': name}, totals.get(f'stage_seconds:{name}', 0.0)) for name in STAGES])
+    metric('crawler_stage_calls_total', 'counter', 'Times each crawl stage ran',
+           [({'stage': name}, int(totals.get(f'stage_calls:{name}', 0))) for name in STAGES])
+    for name, help_text in COUNTERS.items():
+        metric(f'crawler_{name}_total', 'counter', help_text, [({}, int(totals.get(f'counter:{name}', 0)))])
+    metric('crawler_jobs', 'gauge', 'Crawl jobs by status',
+           [({'status': status}, jobs.get(status, 0)) for status, label in CrawlStatus.CRAWL_STATUS_CHOICES])
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,98 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Author',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('medium_username', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Blog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=500)),
+                ('content', models.TextField()),
+                ('summary', models.TextField(blank=True, null=True)),
+                ('medium_url', models.URLField(unique=True)),
+                ('published_date', models.DateTimeField(blank=True, null=True)),
+                ('crawled_at', models.DateTimeField(auto_now_add=True)),
+                ('claps_count', models.IntegerField(default=0)),
+                ('reading_time', models.CharField(blank=True, max_length=50, null=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blogs', to='crawler.author')),
+            ],
+            options={
+                'ordering': ['-published_date', '-crawled_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CrawlStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('blogs_found', models.IntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag_searched', models.CharField(max_length=100)),
+                ('search_time', models.DateTimeField(auto_now_add=True)),
+                ('results_count', models.IntegerField(default=0)),
+                ('crawl_duration', models.FloatField(help_text='Duration in seconds')),
+            ],
+            options={
+                'verbose_name_plural': 'Search Histories',
+                'ordering': ['-search_time'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('author_name', models.CharField(max_length=200)),
+                ('content', models.TextField()),
+                ('published_date', models.DateTimeField(blank=True, null=True)),
+                ('crawled_at', models.DateTimeField(auto_now_add=True)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='crawler.blog')),
+            ],
+            options={
+                'ordering': ['-published_date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='tags',
+            field=models.ManyToManyField(related_name='blogs', to='crawler.tag'),
+        ),
+    ]
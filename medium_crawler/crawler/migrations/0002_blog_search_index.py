@@ -0,0 +1,77 @@
+from django.db import migrations
+
+
+# SQLite FTS5 index over blog title, content and author name. Triggers keep it
+# in sync with crawler_blog for every write path, bulk_create included.
+CREATE_INDEX_SQL = [
+    """
+    CREATE VIRTUAL TABLE crawler_blog_fts USING fts5(
+        title, content, author, tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER crawler_blog_fts_insert AFTER INSERT ON crawler_blog BEGIN
+        INSERT INTO crawler_blog_fts (rowid, title, content, author)
+        VALUES (new.id, new.title, new.content,
+                COALESCE((SELECT name FROM crawler_author WHERE id = new.author_id), ''));
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_blog_fts_delete AFTER DELETE ON crawler_blog BEGIN
+        DELETE FROM crawler_blog_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_blog_fts_update AFTER UPDATE OF title, content, author_id ON crawler_blog BEGIN
+        DELETE FROM crawler_blog_fts WHERE rowid = old.id;
+        INSERT INTO crawler_blog_fts (rowid, title, content, author)
+        VALUES (new.id, new.title, new.content,
+                COALESCE((SELECT name FROM crawler_author WHERE id = new.author_id), ''));
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_author_fts_update AFTER UPDATE OF name ON crawler_author BEGIN
+        UPDATE crawler_blog_fts SET author = new.name
+        WHERE rowid IN (SELECT id FROM crawler_blog WHERE author_id = new.id);
+    END
+    """,
+    """
+    INSERT INTO crawler_blog_fts (rowid, title, content, author)
+    SELECT blog.id, blog.title, blog.content, author.name
+    FROM crawler_blog blog JOIN crawler_author author ON author.id = blog.author_id
+    """,
+]
+
+DROP_INDEX_SQL = [
+    "DROP TRIGGER IF EXISTS crawler_author_fts_update",
+    "DROP TRIGGER IF EXISTS crawler_blog_fts_update",
+    "DROP TRIGGER IF EXISTS crawler_blog_fts_delete",
+    "DROP TRIGGER IF EXISTS crawler_blog_fts_insert",
+    "DROP TABLE IF EXISTS crawler_blog_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    # Other backends fall back to icontains filtering in the views
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_INDEX_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_INDEX_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0001_initial'),
+    ]
+    
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0002_blog_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=100, unique=True)),
+                ('interval', models.FloatField(help_text='Seconds between polls')),
+                ('next_due_at', models.DateTimeField(db_index=True)),
+                ('last_crawled_at', models.DateTimeField(blank=True, null=True)),
+                ('last_new_count', models.IntegerField(default=0)),
+                ('empty_streak', models.IntegerField(default=0, help_text='Consecutive polls without new articles')),
+            ],
+            options={
+                'ordering': ['next_due_at'],
+            },
+        ),
+    ]
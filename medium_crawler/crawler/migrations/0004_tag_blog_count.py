@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:21
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_blog_count(apps, schema_editor):
+    Tag = apps.get_model('crawler', 'Tag')
+    Blog = apps.get_model('crawler', 'Blog')
+    counts = Blog.tags.through.objects.filter(
+        tag_id=OuterRef('id')
+    ).values('tag_id').annotate(count=Count('*')).values('count')
+    Tag.objects.update(blog_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0003_tag_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='blog_count',
+            field=models.IntegerField(default=0, help_text='Maintained by crawler.tags.refresh_tag_counts'),
+        ),
+        migrations.RunPython(backfill_blog_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:24
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0004_tag_blog_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['-published_date', '-crawled_at', '-id'], name='crawler_blog_published'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['crawled_at'], name='crawler_blog_crawled_at'),
+        ),
+        migrations.AddIndex(
+            model_name='crawlstatus',
+            index=models.Index(fields=['tag', '-started_at'], name='crawler_crawl_tag_started'),
+        ),
+        migrations.AddIndex(
+            model_name='crawlstatus',
+            index=models.Index(fields=['status', 'started_at'], name='crawler_crawl_status_started'),
+        ),
+        migrations.AddIndex(
+            model_name='searchhistory',
+            index=models.Index(fields=['-search_time', '-id'], name='crawler_search_time'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='crawler_tag_name_lower'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:25
+
+import heapq
+from collections import Counter
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_related(apps, schema_editor):
+    """
+    Compute the related blogs of the existing blogs, as crawler.related did
+    when this migration was written: the Jaccard similarity of their tags,
+    ties going to the newer blog
+    """
+    Blog = apps.get_model('crawler', 'Blog')
+    RelatedBlog = apps.get_model('crawler', 'RelatedBlog')
+    BlogTag = Blog.tags.through
+    limit = getattr(settings, 'CRAWLER_RELATED_PER_BLOG', 5)
+    
+    blog_tags = {}
+    postings = {}
+    for blog_id, tag_id in BlogTag.objects.values_list('blog_id', 'tag_id').iterator():
+        blog_tags.setdefault(blog_id, set()).add(tag_id)
+        postings.setdefault(tag_id, []).append(blog_id)
+    
+    rows = []
+    for blog_id, tags in blog_tags.items():
+        overlaps = Counter()
+        for tag_id in tags:
+            overlaps.update(postings[tag_id])
+        overlaps.pop(blog_id, None)
+        rows.extend(
+            RelatedBlog(blog_id=blog_id, related_id=related_id, score=score)
+            for score, related_id in heapq.nlargest(limit, (
+                (shared / (len(tags) + len(blog_tags[other_id]) - shared), other_id)
+                for other_id, shared in overlaps.items()
+            ))
+        )
+        if len(rows) >= 5000:
+            RelatedBlog.objects.bulk_create(rows)
+            rows = []
+    RelatedBlog.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0005_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedBlog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text="Jaccard similarity of the two blogs' tags")),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='crawler.blog')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='crawler.blog')),
+            ],
+            options={
+                'ordering': ['blog', '-score'],
+                'indexes': [models.Index(fields=['blog', '-score'], name='crawler_related_blog_score')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedblog',
+            constraint=models.UniqueConstraint(fields=('blog', 'related'), name='crawler_related_unique'),
+        ),
+        migrations.RunPython(fill_related, migrations.RunPython.noop),
+    ]
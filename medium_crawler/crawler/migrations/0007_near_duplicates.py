@@ -0,0 +1,119 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:27
+
+import hashlib
+import re
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Copies of the crawler.dedup helpers as they were when this migration was
+# written, so later changes to that module cannot change what it does
+
+POST_ID_RE = re.compile(r'(?:^|[-/])(?=[0-9a-f]*[0-9])([0-9a-f]{10,16})$')
+WORD_RE = re.compile(r'\w+')
+
+SIMHASH_BITS = 64
+BAND_BITS = 16
+SHINGLE_SIZE = 3
+
+
+def canonical_url(url):
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/')
+    match = POST_ID_RE.search(path.lower())
+    if match:
+        return f"https://medium.com/p/{match.group(1)}"
+    return urlunsplit(('https', parts.netloc.lower(), path or '/', '', ''))
+
+
+def simhash(text):
+    words = WORD_RE.findall(text.lower())
+    if len(words) < getattr(settings, 'CRAWLER_NEAR_DUPLICATE_MIN_WORDS', 50):
+        return None
+    shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    digests = b''.join(
+        hashlib.blake2b(shingle.encode('utf-8'), digest_size=SIMHASH_BITS // 8).digest()
+        for shingle in shingles
+    )
+    threshold = len(shingles) / 2
+    value = 0
+    for position in range(SIMHASH_BITS // 8):
+        byte_counts = Counter(digests[position::SIMHASH_BITS // 8])
+        shift = SIMHASH_BITS - 8 * (position + 1)
+        for bit in range(8):
+            if sum(count for byte, count in byte_counts.items() if byte >> bit & 1) > threshold:
+                value |= 1 << (shift + bit)
+    return value
+
+
+def to_signed(value):
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def bands(value):
+    value &= (1 << SIMHASH_BITS) - 1
+    return [(value >> (i * BAND_BITS)) & ((1 << BAND_BITS) - 1) for i in range(SIMHASH_BITS // BAND_BITS)]
+
+
+def canonicalize_and_fingerprint(apps, schema_editor):
+    """
+    Store existing blogs under their canonical URL and fingerprint their
+    content. A blog whose canonical URL is taken by another row keeps its URL.
+    """
+    Blog = apps.get_model('crawler', 'Blog')
+    ContentFingerprint = apps.get_model('crawler', 'ContentFingerprint')
+    taken = set(Blog.objects.values_list('medium_url', flat=True))
+    renamed = []
+    fingerprints = []
+    for blog in Blog.objects.only('id', 'medium_url', 'content').iterator():
+        url = canonical_url(blog.medium_url)
+        if url != blog.medium_url and url not in taken:
+            taken.add(url)
+            blog.medium_url = url
+            renamed.append(blog)
+        value = simhash(blog.content)
+        if value is not None:
+            band0, band1, band2, band3 = bands(value)
+            fingerprints.append(ContentFingerprint(
+                blog_id=blog.id, simhash=to_signed(value),
+                band0=band0, band1=band1, band2=band2, band3=band3
+            ))
+    Blog.objects.bulk_update(renamed, ['medium_url'], batch_size=500)
+    ContentFingerprint.objects.bulk_create(fingerprints, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0006_related_blog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentFingerprint',
+            fields=[
+                ('blog', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='fingerprint', serialize=False, to='crawler.blog')),
+                ('simhash', models.BigIntegerField()),
+                ('band0', models.IntegerField(db_index=True)),
+                ('band1', models.IntegerField(db_index=True)),
+                ('band2', models.IntegerField(db_index=True)),
+                ('band3', models.IntegerField(db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BlogAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='crawler.blog')),
+            ],
+            options={
+                'verbose_name_plural': 'Blog Aliases',
+            },
+        ),
+        migrations.RunPython(canonicalize_and_fingerprint, migrations.RunPython.noop),
+    ]
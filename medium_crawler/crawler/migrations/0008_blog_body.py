@@ -0,0 +1,149 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:31
+
+import zlib
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# The FTS5 index of migration 0002 keeps its own copy of the text and stays.
+# Its triggers read crawler_blog.content, which moves to crawler_blogbody
+# compressed, out of SQL's reach: triggers now index titles and author names
+# only, and BlogBody.store indexes body text (crawler.search.index_contents).
+CREATE_TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER crawler_blog_fts_insert AFTER INSERT ON crawler_blog BEGIN
+        INSERT INTO crawler_blog_fts (rowid, title, content, author)
+        VALUES (new.id, new.title, '',
+                COALESCE((SELECT name FROM crawler_author WHERE id = new.author_id), ''));
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_blog_fts_delete AFTER DELETE ON crawler_blog BEGIN
+        DELETE FROM crawler_blog_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_blog_fts_update AFTER UPDATE OF title, author_id ON crawler_blog BEGIN
+        UPDATE crawler_blog_fts
+        SET title = new.title,
+            author = COALESCE((SELECT name FROM crawler_author WHERE id = new.author_id), '')
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_author_fts_update AFTER UPDATE OF name ON crawler_author BEGIN
+        UPDATE crawler_blog_fts SET author = new.name
+        WHERE rowid IN (SELECT id FROM crawler_blog WHERE author_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_body_fts_delete AFTER DELETE ON crawler_blogbody BEGIN
+        UPDATE crawler_blog_fts SET content = '' WHERE rowid = old.blog_id;
+    END
+    """,
+]
+
+DROP_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS crawler_body_fts_delete",
+    "DROP TRIGGER IF EXISTS crawler_author_fts_update",
+    "DROP TRIGGER IF EXISTS crawler_blog_fts_update",
+    "DROP TRIGGER IF EXISTS crawler_blog_fts_delete",
+    "DROP TRIGGER IF EXISTS crawler_blog_fts_insert",
+]
+
+# The triggers of migration 0002, which read crawler_blog.content
+OLD_CREATE_TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER crawler_blog_fts_insert AFTER INSERT ON crawler_blog BEGIN
+        INSERT INTO crawler_blog_fts (rowid, title, content, author)
+        VALUES (new.id, new.title, new.content,
+                COALESCE((SELECT name FROM crawler_author WHERE id = new.author_id), ''));
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_blog_fts_delete AFTER DELETE ON crawler_blog BEGIN
+        DELETE FROM crawler_blog_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_blog_fts_update AFTER UPDATE OF title, content, author_id ON crawler_blog BEGIN
+        DELETE FROM crawler_blog_fts WHERE rowid = old.id;
+        INSERT INTO crawler_blog_fts (rowid, title, content, author)
+        VALUES (new.id, new.title, new.content,
+                COALESCE((SELECT name FROM crawler_author WHERE id = new.author_id), ''));
+    END
+    """,
+    """
+    CREATE TRIGGER crawler_author_fts_update AFTER UPDATE OF name ON crawler_author BEGIN
+        UPDATE crawler_blog_fts SET author = new.name
+        WHERE rowid IN (SELECT id FROM crawler_blog WHERE author_id = new.id);
+    END
+    """,
+]
+
+OLD_DROP_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS crawler_author_fts_update",
+    "DROP TRIGGER IF EXISTS crawler_blog_fts_update",
+    "DROP TRIGGER IF EXISTS crawler_blog_fts_delete",
+    "DROP TRIGGER IF EXISTS crawler_blog_fts_insert",
+]
+
+
+def move_content_to_bodies(apps, schema_editor):
+    Blog = apps.get_model('crawler', 'Blog')
+    BlogBody = apps.get_model('crawler', 'BlogBody')
+    bodies = []
+    for blog_id, content in Blog.objects.values_list('id', 'content').iterator():
+        bodies.append(BlogBody(blog_id=blog_id, data=zlib.compress((content or '').encode('utf-8'), 6)))
+        if len(bodies) >= 500:
+            BlogBody.objects.bulk_create(bodies)
+            bodies = []
+    BlogBody.objects.bulk_create(bodies)
+
+
+def move_bodies_to_content(apps, schema_editor):
+    Blog = apps.get_model('crawler', 'Blog')
+    BlogBody = apps.get_model('crawler', 'BlogBody')
+    for blog_id, data in BlogBody.objects.values_list('blog_id', 'data').iterator():
+        Blog.objects.filter(id=blog_id).update(content=zlib.decompress(data).decode('utf-8'))
+
+
+def run_sql(statements):
+    def run(apps, schema_editor):
+        # Other backends fall back to icontains filtering in the views
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0007_near_duplicates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogBody',
+            fields=[
+                ('blog', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='body', serialize=False, to='crawler.blog')),
+                ('data', models.BinaryField()),
+            ],
+        ),
+        migrations.RunPython(move_content_to_bodies, move_bodies_to_content),
+        # The old triggers read crawler_blog.content
+        migrations.RunPython(run_sql(OLD_DROP_TRIGGERS_SQL), run_sql(OLD_CREATE_TRIGGERS_SQL)),
+        # A default lets the column come back empty when migrating backwards
+        migrations.AlterField(
+            model_name='blog',
+            name='content',
+            field=models.TextField(default=''),
+        ),
+        migrations.RemoveField(
+            model_name='blog',
+            name='content',
+        ),
+        migrations.RunPython(run_sql(CREATE_TRIGGERS_SQL), run_sql(DROP_TRIGGERS_SQL)),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0008_blog_body'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlMetricTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('value', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='crawlstatus',
+            name='metrics',
+            field=models.JSONField(blank=True, default=dict, help_text='Stage timings and counters, see crawler.metrics'),
+        ),
+    ]
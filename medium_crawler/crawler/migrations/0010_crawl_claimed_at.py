@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:24
+
+from django.db import migrations, models
+
+
+def prepare_jobs(apps, schema_editor):
+    """
+    Drop duplicate pending jobs before the constraint is added, keeping each
+    tag's oldest, and treat running jobs as claimed when they were queued
+    """
+    CrawlStatus = apps.get_model('crawler', 'CrawlStatus')
+    kept = set()
+    for job_id, tag in CrawlStatus.objects.filter(status='pending').order_by('started_at', 'id').values_list('id', 'tag'):
+        if tag in kept:
+            CrawlStatus.objects.filter(id=job_id).delete()
+        kept.add(tag)
+    CrawlStatus.objects.filter(status='in_progress', claimed_at__isnull=True).update(claimed_at=models.F('started_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawler', '0009_crawl_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crawlstatus',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When a worker started running the crawl', null=True),
+        ),
+        migrations.RunPython(prepare_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='crawlstatus',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('tag',), name='crawler_crawl_one_pending'),
+        ),
+    ]
@@ -1,88 +1,258 @@
-from django.db import models
-from django.utils import timezone
-
-
-class Tag(models.Model):
-    name = models.CharField(max_length=100, unique=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    
-    def __str__(self):
-        return self.name
-
-
-class Author(models.Model):
-    name = models.CharField(max_length=200)
-    medium_username = models.CharField(max_length=100, blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    
-    def __str__(self):
-        return self.name
-
-
-class Blog(models.Model):
-    title = models.CharField(max_length=500)
-    content = models.TextField()
-    summary = models.TextField(blank=True, null=True)
-    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='blogs')
-    tags = models.ManyToManyField(Tag, related_name='blogs')
-    medium_url = models.URLField(unique=True)
-    published_date = models.DateTimeField(blank=True, null=True)
-    crawled_at = models.DateTimeField(auto_now_add=True)
-    claps_count = models.IntegerField(default=0)
-    reading_time = models.CharField(max_length=50, blank=True, null=True)
-    
-    class Meta:
-        ordering = ['-published_date', '-crawled_at']
-    
-    def __str__(self):
-        return f"{self.title} by {self.author.name}"
-
-
-class Comment(models.Model):
-    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='comments')
-    author_name = models.CharField(max_length=200)
-    content = models.TextField()
-    published_date = models.DateTimeField(blank=True, null=True)
-    crawled_at = models.DateTimeField(auto_now_add=True)
-    
-    class Meta:
-        ordering = ['-published_date']
-    
-    def __str__(self):
-        return f"Comment by {self.author_name} on {self.blog.title[:50]}"
-
-
-class SearchHistory(models.Model):
-    tag_searched = models.CharField(max_length=100)
-    search_time = models.DateTimeField(auto_now_add=True)
-    results_count = models.IntegerField(default=0)
-    crawl_duration = models.FloatField(help_text="Duration in seconds")
-    
-    class Meta:
-        ordering = ['-search_time']
-        verbose_name_plural = "Search Histories"
-    
-    def __str__(self):
-        return f"Search for '{self.tag_searched}' - {self.results_count} results"
-
-
-class CrawlStatus(models.Model):
-    CRAWL_STATUS_CHOICES = [
-        ('pending', 'Pending'),
-        ('in_progress', 'In Progress'),
-        ('completed', 'Completed'),
-        ('failed', 'Failed'),
-    ]
-    
-    tag = models.CharField(max_length=100)
-    status = models.CharField(max_length=20, choices=CRAWL_STATUS_CHOICES, default='pending')
-    started_at = models.DateTimeField(auto_now_add=True)
-    completed_at = models.DateTimeField(blank=True, null=True)
-    blogs_found = models.IntegerField(default=0)
-    error_message = models.TextField(blank=True, null=True)
-    
-    class Meta:
-        ordering = ['-started_at']
-    
-    def __str__(self):
-        return f"Crawl for '{self.tag}' - {self.status}"
+import zlib
+from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
+from .search import index_contents
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    blog_count = models.IntegerField(default=0, help_text="Maintained by crawler.tags.refresh_tag_counts")
+    
+    class Meta:
+        indexes = [
+            # Case-insensitive tag lookups filter on name__lower
+            models.Index(Lower('name'), name='crawler_tag_name_lower'),
+        ]
+    
+    def __str__(self):
+        return self.name
+
+
+# tags__name__lower=... compiles to LOWER(name) = ..., which the index above serves
+Tag._meta.get_field('name').register_lookup(Lower)
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=200)
+    medium_username = models.CharField(max_length=100, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.name
+
+
+class Blog(models.Model):
+    title = models.CharField(max_length=500)
+    summary = models.TextField(blank=True, null=True)
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='blogs')
+    tags = models.ManyToManyField(Tag, related_name='blogs')
+    medium_url = models.URLField(unique=True)
+    published_date = models.DateTimeField(blank=True, null=True)
+    crawled_at = models.DateTimeField(auto_now_add=True)
+    claps_count = models.IntegerField(default=0)
+    reading_time = models.CharField(max_length=50, blank=True, null=True)
+    
+    class Meta:
+        ordering = ['-published_date', '-crawled_at']
+        indexes = [
+            models.Index(fields=['-published_date', '-crawled_at', '-id'], name='crawler_blog_published'),
+            models.Index(fields=['crawled_at'], name='crawler_blog_crawled_at'),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} by {self.author.name}"
+    
+    @property
+    def content(self):
+        """
+        Full text, decompressed from BlogBody on first access. Use
+        select_related('body') when loading blogs whose text is shown.
+        """
+        if '_content' not in self.__dict__:
+            try:
+                self._content = self.body.text if self.pk else ''
+            except BlogBody.DoesNotExist:
+                self._content = ''
+        return self._content
+    
+    @content.setter
+    def content(self, value):
+        self._content = value
+        self._content_changed = True
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if self.__dict__.pop('_content_changed', False):
+            BlogBody.store({self.pk: self._content})
+
+
+class BlogBody(models.Model):
+    """
+    zlib-compressed text of a blog, kept out of crawler_blog so list queries
+    never read it
+    """
+    blog = models.OneToOneField(Blog, on_delete=models.CASCADE, primary_key=True, related_name='body')
+    data = models.BinaryField()
+    
+    @staticmethod
+    def compress(text):
+        return zlib.compress(text.encode('utf-8'), 6)
+    
+    @staticmethod
+    def decompress(data):
+        return zlib.decompress(data).decode('utf-8')
+    
+    @property
+    def text(self):
+        return self.decompress(self.data)
+    
+    @classmethod
+    def store(cls, contents):
+        """
+        Write {blog_id: text}, replacing the blogs' current bodies, and index
+        the text for search
+        """
+        cls.objects.filter(blog_id__in=list(contents)).delete()
+        cls.objects.bulk_create([
+            cls(blog_id=blog_id, data=cls.compress(text or '')) for blog_id, text in contents.items()
+        ])
+        index_contents(contents)
+    
+    def __str__(self):
+        return f"Body of {self.blog_id} ({len(self.data)} bytes)"
+
+
+class RelatedBlog(models.Model):
+    """
+    Precomputed "related articles" of a blog, scored by tag overlap
+    """
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(help_text="Jaccard similarity of the two blogs' tags")
+    
+    class Meta:
+        ordering = ['blog', '-score']
+        constraints = [
+            models.UniqueConstraint(fields=['blog', 'related'], name='crawler_related_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['blog', '-score'], name='crawler_related_blog_score'),
+        ]
+    
+    def __str__(self):
+        return f"{self.blog_id} -> {self.related_id} ({self.score:.2f})"
+
+
+class ContentFingerprint(models.Model):
+    """
+    SimHash of a blog's content, split into four 16-bit bands for the LSH
+    lookup in crawler.dedup
+    """
+    blog = models.OneToOneField(Blog, on_delete=models.CASCADE, primary_key=True, related_name='fingerprint')
+    simhash = models.BigIntegerField()
+    band0 = models.IntegerField(db_index=True)
+    band1 = models.IntegerField(db_index=True)
+    band2 = models.IntegerField(db_index=True)
+    band3 = models.IntegerField(db_index=True)
+    
+    def __str__(self):
+        return f"Fingerprint of {self.blog_id}: {self.simhash & 0xFFFFFFFFFFFFFFFF:016x}"
+
+
+class BlogAlias(models.Model):
+    """
+    Another URL under which a stored blog was found (a syndicated copy)
+    """
+    url = models.URLField(unique=True)
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='aliases')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name_plural = "Blog Aliases"
+    
+    def __str__(self):
+        return f"{self.url} -> {self.blog_id}"
+
+
+class Comment(models.Model):
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='comments')
+    author_name = models.CharField(max_length=200)
+    content = models.TextField()
+    published_date = models.DateTimeField(blank=True, null=True)
+    crawled_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-published_date']
+    
+    def __str__(self):
+        return f"Comment by {self.author_name} on {self.blog.title[:50]}"
+
+
+class SearchHistory(models.Model):
+    tag_searched = models.CharField(max_length=100)
+    search_time = models.DateTimeField(auto_now_add=True)
+    results_count = models.IntegerField(default=0)
+    crawl_duration = models.FloatField(help_text="Duration in seconds")
+    
+    class Meta:
+        ordering = ['-search_time']
+        verbose_name_plural = "Search Histories"
+        indexes = [
+            models.Index(fields=['-search_time', '-id'], name='crawler_search_time'),
+        ]
+    
+    def __str__(self):
+        return f"Search for '{self.tag_searched}' - {self.results_count} results"
+
+
+class CrawlStatus(models.Model):
+    CRAWL_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('in_progress', 'In Progress'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    tag = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=CRAWL_STATUS_CHOICES, default='pending')
+    started_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(blank=True, null=True, help_text="When a worker started running the crawl")
+    completed_at = models.DateTimeField(blank=True, null=True)
+    blogs_found = models.IntegerField(default=0)
+    error_message = models.TextField(blank=True, null=True)
+    metrics = models.JSONField(default=dict, blank=True, help_text="Stage timings and counters, see crawler.metrics")
+    
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            # Latest crawl of a tag, and the job queue's oldest pending job
+            models.Index(fields=['tag', '-started_at'], name='crawler_crawl_tag_started'),
+            models.Index(fields=['status', 'started_at'], name='crawler_crawl_status_started'),
+        ]
+        constraints = [
+            # At most one queued job per tag, also when requests race to enqueue
+            models.UniqueConstraint(
+                fields=['tag'], condition=models.Q(status='pending'), name='crawler_crawl_one_pending'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Crawl for '{self.tag}' - {self.status}"
+
+
+class CrawlMetricTotal(models.Model):
+    """
+    Running total of one crawl metric across all crawls, exported by /metrics
+    """
+    name = models.CharField(max_length=100, unique=True)
+    value = models.FloatField(default=0)
+    
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+
+class TagSchedule(models.Model):
+    tag = models.CharField(max_length=100, unique=True)
+    interval = models.FloatField(help_text="Seconds between polls")
+    next_due_at = models.DateTimeField(db_index=True)
+    last_crawled_at = models.DateTimeField(blank=True, null=True)
+    last_new_count = models.IntegerField(default=0)
+    empty_streak = models.IntegerField(default=0, help_text="Consecutive polls without new articles")
+    
+    class Meta:
+        ordering = ['next_due_at']
+    
+    def __str__(self):
+        return f"Schedule for '{self.tag}' - every {self.interval / 60:.0f} min"
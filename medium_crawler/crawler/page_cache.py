@@ -0,0 +1,118 @@
+import hashlib
+import time
+from functools import wraps
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+
+
+VERSION_KEY = 'pages:version'
+
+
+def page_cache_alias():
+    return getattr(settings, 'CRAWLER_PAGE_CACHE', 'default')
+
+
+def page_cache():
+    return caches[page_cache_alias()]
+
+
+def page_cache_timeout():
+    return getattr(settings, 'CRAWLER_PAGE_CACHE_TIMEOUT', 10 * 60)
+
+
+def version_cache():
+    # Shared with the crawl workers, which are the ones saving blogs
+    return caches[getattr(settings, 'CRAWLER_PAGE_CACHE_VERSION_CACHE', 'crawler')]
+
+
+_version = None
+_checked_at = 0
+
+
+def pages_changed():
+    """
+    Invalidate the cached pages of every process
+    """
+    global _version, _checked_at
+    _version = str(time.time())
+    _checked_at = time.monotonic()
+    version_cache().set(VERSION_KEY, _version, None)
+
+
+def pages_changed_on_commit():
+    """
+    Invalidate the cached pages once the current transaction commits, so no
+    process caches a page without the changes in the meantime
+    """
+    transaction.on_commit(pages_changed)
+
+
+def page_version():
+    """
+    Version of the cached pages: the shared version bumped by pages_changed,
+    checked at most every CRAWLER_PAGE_CACHE_CHECK_INTERVAL seconds, and the
+    current CRAWLER_PAGE_CACHE_TIMEOUT period, so relative times such as
+    "crawled 5 minutes ago" are refreshed even when nothing changes.
+    """
+    global _version, _checked_at
+    if _version is None or time.monotonic() - _checked_at >= getattr(settings, 'CRAWLER_PAGE_CACHE_CHECK_INTERVAL', 1):
+        version = version_cache().get(VERSION_KEY)
+        if version is None:
+            version_cache().add(VERSION_KEY, str(time.time()), None)
+            version = version_cache().get(VERSION_KEY)
+        _version = version
+        _checked_at = time.monotonic()
+    return f'{_version}-{int(time.time() // page_cache_timeout())}'
+
+
+def page_key(request):
+    return hashlib.md5(f'{page_version()}:{request.get_full_path()}'.encode('utf-8')).hexdigest()
+
+
+def cached_page(store=True):
+    """
+    Decorator answering a view's GET requests from the page cache.
+    
+    Responses are cached per full path, so every page, filter and search
+    has its own entry, and carry an ETag so browsers revalidate them with a
+    304. With store=False only the ETag is used; for pages with a CSRF token,
+    which must be rendered per visitor and cache their fragments instead.
+    Requests with pending messages always get a freshly rendered page.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or len(get_messages(request)):
+                return view(request, *args, **kwargs)
+            
+            key = page_key(request)
+            # The browser's copy holds a CSRF token for its own cookie only
+            etag = '"%s"' % hashlib.md5(
+                f"{key}:{request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')}".encode('utf-8')
+            ).hexdigest()
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                response = HttpResponseNotModified()
+            else:
+                cached = page_cache().get(f'page:{key}') if store else None
+                if cached:
+                    content, content_type = cached
+                    response = HttpResponse(content, content_type=content_type)
+                else:
+                    response = view(request, *args, **kwargs)
+                    if response.status_code != 200 or response.streaming:
+                        return response
+                    if store:
+                        page_cache().set(
+                            f'page:{key}', (response.content, response['Content-Type']), page_cache_timeout()
+                        )
+            
+            response['ETag'] = etag
+            patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
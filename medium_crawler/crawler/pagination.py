@@ -0,0 +1,197 @@
+import base64
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q, prefetch_related_objects
+
+
+class CursorPage:
+    """
+    One page of results with opaque cursors to the neighbouring pages
+    """
+    
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, count=None, count_is_exact=True):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_is_exact = count_is_exact
+    
+    def has_next(self):
+        return self.next_cursor is not None
+    
+    def has_previous(self):
+        return self.previous_cursor is not None
+    
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+    
+    def __iter__(self):
+        return iter(self.object_list)
+    
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(data):
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by encode_cursor; None when missing or malformed
+    """
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        return None
+
+
+def approximate_count(queryset, limit=None):
+    """
+    Count rows but stop at `limit`, so the cost is bounded on large tables.
+    Returns (count, exact).
+    """
+    limit = limit or getattr(settings, 'CRAWLER_PAGINATION_COUNT_LIMIT', 1000)
+    count = queryset.order_by()[:limit + 1].count()
+    return min(count, limit), count <= limit
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a fixed ordering, without OFFSET or COUNT(*).
+    
+    `ordering` lists (field, descending) pairs and must end with a unique
+    field. Descending fields sort NULLs last, ascending ones NULLs first.
+    A cursor holds the key of the last (or first) row of the page it came
+    from, and the next page is read with index range queries starting right
+    after it, so a deep page costs the same as the first one when an index
+    covers the ordering.
+    """
+    
+    def __init__(self, queryset, ordering, per_page=10, with_count=True):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+        self.with_count = with_count
+        self.fields = {name: queryset.model._meta.get_field(name) for name, descending in ordering}
+    
+    def order_by(self, reverse=False):
+        expressions = []
+        for name, descending in self.ordering:
+            if descending != reverse:
+                expressions.append(F(name).desc(nulls_last=True))
+            else:
+                expressions.append(F(name).asc(nulls_first=True))
+        return expressions
+    
+    def key(self, obj):
+        return [self.fields[name].value_to_string(obj) if getattr(obj, name) is not None else None
+                for name, descending in self.ordering]
+    
+    def branches(self, key, reverse=False):
+        """
+        Filters that together select the rows after `key` (before it if
+        reversed), in traversal order: every row matched by one filter comes
+        before the rows of the next. Each one is a plain index range, unlike a
+        single OR of all of them, which SQLite cannot walk in index order.
+        """
+        values = [self.fields[name].to_python(value) if value is not None else None
+                  for (name, descending), value in zip(self.ordering, key)]
+        branches = []
+        for i in reversed(range(len(self.ordering))):
+            name, descending = self.ordering[i]
+            value = values[i]
+            nulls_last = descending != reverse
+            equal = Q()
+            for (prefix_name, prefix_descending), prefix_value in zip(self.ordering[:i], values[:i]):
+                if prefix_value is None:
+                    equal &= Q(**{f'{prefix_name}__isnull': True})
+                else:
+                    equal &= Q(**{prefix_name: prefix_value})
+            
+            if value is None:
+                if not nulls_last:
+                    branches.append(equal & Q(**{f'{name}__isnull': False}))
+            else:
+                lookup = 'lt' if nulls_last else 'gt'
+                branches.append(equal & Q(**{f'{name}__{lookup}': value}))
+                if nulls_last and self.fields[name].null:
+                    branches.append(equal & Q(**{f'{name}__isnull': True}))
+        return branches
+    
+    def rows_after(self, queryset, key, reverse=False):
+        """
+        Up to per_page + 1 rows of `queryset` after `key` (before it if reversed)
+        """
+        # Prefetch once for the whole page rather than per branch
+        prefetch_lookups = queryset._prefetch_related_lookups
+        rows = []
+        for branch in self.branches(key, reverse):
+            rows.extend(queryset.prefetch_related(None).filter(branch)[:self.per_page + 1 - len(rows)])
+            if len(rows) > self.per_page:
+                break
+        prefetch_related_objects(rows[:self.per_page], *prefetch_lookups)
+        return rows
+    
+    def get_page(self, cursor=None):
+        data = decode_cursor(cursor)
+        if not isinstance(data, dict) or len(data.get('key') or []) != len(self.ordering):
+            data = None
+        
+        reverse = bool(data and data.get('previous'))
+        queryset = self.queryset.order_by(*self.order_by(reverse))
+        if data:
+            try:
+                rows = self.rows_after(queryset, data['key'], reverse)
+            except (ValidationError, TypeError, ValueError):
+                # A cursor whose key does not fit the fields, e.g. tampered with
+                return self.get_page()
+        else:
+            rows = list(queryset[:self.per_page + 1])
+        
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            if not more:
+                # Back at the start: show a full first page
+                return self.get_page()
+            rows.reverse()
+        
+        next_cursor = previous_cursor = None
+        if rows:
+            # Coming back from a later page there always is a next page
+            if more or reverse:
+                next_cursor = encode_cursor({'key': self.key(rows[-1])})
+            if data is not None:
+                previous_cursor = encode_cursor({'key': self.key(rows[0]), 'previous': True})
+        
+        count, exact = approximate_count(self.queryset) if self.with_count else (None, True)
+        return CursorPage(rows, next_cursor, previous_cursor, count, exact)
+
+
+def paginate_sequence(items, cursor=None, per_page=10):
+    """
+    Cursor pages over an in-memory sequence, such as a bounded list of
+    ranked search hits. The cursor holds the position in the sequence.
+    """
+    data = decode_cursor(cursor)
+    start = data.get('position', 0) if isinstance(data, dict) else 0
+    if not isinstance(start, int) or not 0 <= start < len(items):
+        start = 0
+    end = start + per_page
+    next_cursor = encode_cursor({'position': end}) if end < len(items) else None
+    previous_cursor = encode_cursor({'position': max(start - per_page, 0)}) if start > 0 else None
+    return CursorPage(list(items[start:end]), next_cursor, previous_cursor, len(items))
+
+
+def cursor_url(request, cursor):
+    """
+    Query string for the current request with the cursor swapped in
+    """
+    params = request.GET.copy()
+    params.pop('page', None)
+    params['cursor'] = cursor
+    return '?' + params.urlencode()
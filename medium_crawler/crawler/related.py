@@ -0,0 +1,205 @@
+import heapq
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import transaction
+from .models import Blog, RelatedBlog, Tag
+from .page_cache import pages_changed_on_commit
+
+
+def related_per_blog():
+    return getattr(settings, 'CRAWLER_RELATED_PER_BLOG', 5)
+
+
+# Blogs whose tags changed inside collect_related_changes, or None outside it
+changed_blogs = ContextVar('changed_blogs', default=None)
+
+
+@contextmanager
+def collect_related_changes():
+    """
+    Collect the blogs whose tags change inside the block into the yielded
+    set instead of refreshing their related blogs after every commit. The
+    caller refreshes them once (refresh_related), which costs far less
+    than one refresh per saved batch.
+    """
+    changed = set()
+    token = changed_blogs.set(changed)
+    try:
+        yield changed
+    finally:
+        changed_blogs.reset(token)
+
+
+def mark_related_stale(blog_ids):
+    """
+    Note that the tags of `blog_ids` changed: they are collected when inside
+    collect_related_changes, otherwise refreshed once the transaction commits
+    """
+    changed = changed_blogs.get()
+    if changed is not None:
+        changed.update(blog_ids)
+    else:
+        blog_ids = list(blog_ids)
+        transaction.on_commit(lambda: refresh_related(blog_ids), robust=True)
+
+
+def load_blog_tags(blog_ids=None):
+    """
+    {blog_id: set of tag ids} from the link table, for some blogs
+    """
+    links = Blog.tags.through.objects.all()
+    if blog_ids is not None:
+        links = links.filter(blog_id__in=list(blog_ids))
+    blog_tags = {}
+    for blog_id, tag_id in links.values_list('blog_id', 'tag_id').iterator():
+        blog_tags.setdefault(blog_id, set()).add(tag_id)
+    return blog_tags
+
+
+def top_related(blog_id, tags, postings, tag_counts, limit):
+    """
+    Best `limit` (score, related_id) pairs for one blog.
+    
+    `postings` maps a tag to the blogs that have it; overlaps are counted over
+    them, so only blogs sharing at least one tag are ever scored. Ties go to
+    the newer blog.
+    """
+    overlaps = Counter()
+    for tag_id in tags:
+        overlaps.update(postings.get(tag_id, ()))
+    overlaps.pop(blog_id, None)
+    return heapq.nlargest(limit, (
+        (shared / (len(tags) + tag_counts[other_id] - shared), other_id)
+        for other_id, shared in overlaps.items()
+    ))
+
+
+def build_postings(blog_tags):
+    postings = {}
+    for blog_id, tags in blog_tags.items():
+        for tag_id in tags:
+            postings.setdefault(tag_id, []).append(blog_id)
+    return postings
+
+
+def replace_related(lists):
+    """
+    Store {blog_id: [(score, related_id)]} in place of those blogs' current rows
+    """
+    with transaction.atomic():
+        RelatedBlog.objects.filter(blog_id__in=list(lists)).delete()
+        RelatedBlog.objects.bulk_create([
+            RelatedBlog(blog_id=blog_id, related_id=related_id, score=score)
+            for blog_id, pairs in lists.items()
+            for score, related_id in pairs
+        ])
+        pages_changed_on_commit()
+
+
+def rebuild_related(batch_size=500):
+    """
+    Recompute the related blogs of every blog. Tags are loaded once; the
+    lists are computed and written a batch of blogs at a time.
+    Returns the number of blogs processed.
+    """
+    blog_tags = load_blog_tags()
+    tag_counts = {blog_id: len(tags) for blog_id, tags in blog_tags.items()}
+    postings = build_postings(blog_tags)
+    limit = related_per_blog()
+    
+    blog_ids = sorted(blog_tags)
+    for start in range(0, len(blog_ids), batch_size):
+        batch = blog_ids[start:start + batch_size]
+        replace_related({
+            blog_id: top_related(blog_id, blog_tags[blog_id], postings, tag_counts, limit)
+            for blog_id in batch
+        })
+    
+    # Blogs that lost all their tags have no related blogs any more
+    RelatedBlog.objects.exclude(blog_id__in=Blog.tags.through.objects.values('blog_id')).delete()
+    return len(blog_ids)
+
+
+def scored_neighbours(blog_ids, limit):
+    """
+    Best `limit` (score, related_id) pairs of each of `blog_ids`, as
+    {blog_id: pairs}, scored like top_related.
+    
+    Candidates are the blogs most recently linked to each of their tags, at
+    most CRAWLER_RELATED_CANDIDATES per tag, so the cost does not grow with
+    the size of popular tags; `manage.py compute_related` scores every blog
+    sharing a tag.
+    """
+    blog_tags = load_blog_tags(blog_ids)
+    per_tag = getattr(settings, 'CRAWLER_RELATED_CANDIDATES', 1000)
+    links = Blog.tags.through.objects
+    postings = {
+        tag_id: list(links.filter(tag_id=tag_id).order_by('-id').values_list('blog_id', flat=True)[:per_tag])
+        for tag_id in set().union(*blog_tags.values())
+    }
+    known_tags = dict(blog_tags)
+    known_tags.update(load_blog_tags(set().union(*postings.values()) - blog_tags.keys()))
+    
+    lists = {}
+    for blog_id in blog_ids:
+        tags = blog_tags.get(blog_id, set())
+        others = set().union(*(postings[tag_id] for tag_id in tags)) - {blog_id}
+        # Overlaps come from the candidates' own tags; a capped posting may miss some
+        shared = {other_id: len(tags & known_tags[other_id]) for other_id in others}
+        lists[blog_id] = heapq.nlargest(limit, (
+            (count / (len(tags) + len(known_tags[other_id]) - count), other_id)
+            for other_id, count in shared.items()
+        ))
+    return lists
+
+
+def refresh_related(blog_ids, chunk_size=50):
+    """
+    Update related blogs after the tags of `blog_ids` changed (new blogs or
+    new tag links).
+    
+    Their own lists are recomputed (see scored_neighbours), and so are the
+    lists of blogs that list one of them, where its score may have dropped.
+    Their other best-scoring neighbours (CRAWLER_RELATED_NEIGHBOURS per blog) can only
+    gain, so the new pair scores are merged into their lists; a pair's
+    score only depends on the two blogs' tags, so the other entries there
+    stay valid. `manage.py compute_related` rebuilds every list from scratch.
+    """
+    blog_ids = list(blog_ids)
+    for start in range(0, len(blog_ids), chunk_size):
+        _refresh_related_chunk(blog_ids[start:start + chunk_size])
+
+
+def _refresh_related_chunk(blog_ids):
+    limit = related_per_blog()
+    neighbour_limit = max(limit, getattr(settings, 'CRAWLER_RELATED_NEIGHBOURS', 100))
+    neighbours = scored_neighbours(blog_ids, neighbour_limit)
+    lists = {blog_id: pairs[:limit] for blog_id, pairs in neighbours.items()}
+    
+    # A blog listing a changed blog may have to rank it lower or drop it,
+    # which can bring in a blog it did not list
+    listing = set(RelatedBlog.objects.filter(
+        related_id__in=blog_ids
+    ).exclude(blog_id__in=blog_ids).values_list('blog_id', flat=True))
+    lists.update(scored_neighbours(listing, limit))
+    
+    new_scores = {}
+    for blog_id, pairs in neighbours.items():
+        for score, related_id in pairs:
+            if related_id not in lists:
+                new_scores.setdefault(related_id, []).append((score, blog_id))
+    
+    # Merge the new pair scores into the other neighbours' current lists
+    current = {}
+    for blog_id, related_id, score in RelatedBlog.objects.filter(
+        blog_id__in=list(new_scores)
+    ).values_list('blog_id', 'related_id', 'score'):
+        current.setdefault(blog_id, {})[related_id] = score
+    for blog_id, pairs in new_scores.items():
+        scores = current.get(blog_id, {})
+        scores.update((related_id, score) for score, related_id in pairs)
+        lists[blog_id] = heapq.nlargest(limit, ((score, related_id) for related_id, score in scores.items()))
+    
+    replace_related(lists)
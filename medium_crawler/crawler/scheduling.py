@@ -0,0 +1,111 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Max, Min
+from django.db.models.functions import Lower
+from django.utils import timezone
+from .models import Tag, SearchHistory, TagSchedule
+
+
+def interval_bounds():
+    return (
+        getattr(settings, 'CRAWLER_SCHEDULE_MIN_INTERVAL', 15 * 60),
+        getattr(settings, 'CRAWLER_SCHEDULE_MAX_INTERVAL', 7 * 24 * 60 * 60),
+    )
+
+
+def next_interval(interval, new_count, limit):
+    """
+    Adapt a tag's polling interval to what its last poll found.
+    
+    A poll that filled half the feed window or more means we are missing
+    articles, so poll twice as often. A poll with nothing new doubles the
+    interval (exponential backoff). Anything in between keeps the interval.
+    """
+    min_interval, max_interval = interval_bounds()
+    if new_count == 0:
+        interval *= 2
+    elif new_count * 2 >= limit:
+        interval /= 2
+    return min(max(interval, min_interval), max_interval)
+
+
+def sync_schedules(seen=None):
+    """
+    Create schedules for tags that don't have one yet: every tag searched
+    before plus every tag in the Tag table. Tags searched before are first due
+    one default interval after their last search, the others right away.
+    
+    `seen` is what the previous call returned; only searches and tags added
+    since then are read, so a long running scheduler does not scan both
+    tables every round. Returns (schedules created, seen).
+    """
+    default_interval = getattr(settings, 'CRAWLER_SCHEDULE_DEFAULT_INTERVAL', 6 * 60 * 60)
+    now = timezone.now()
+    history_seen, tags_seen = seen or (0, 0)
+    # Upper bounds first, so rows added while we read are left for the next call
+    history_last = SearchHistory.objects.aggregate(last=Max('id'))['last'] or history_seen
+    tags_last = Tag.objects.aggregate(last=Max('id'))['last'] or tags_seen
+    
+    searches = SearchHistory.objects.filter(id__gt=history_seen, id__lte=history_last)
+    last_searched = {
+        row['tag']: row['last_search']
+        for row in searches.values(tag=Lower('tag_searched')).annotate(last_search=Max('search_time'))
+    }
+    tag_names = set(last_searched) | {
+        name.lower() for name in Tag.objects.filter(id__gt=tags_seen, id__lte=tags_last).values_list('name', flat=True)
+    }
+    known = set(TagSchedule.objects.filter(tag__in=tag_names).values_list('tag', flat=True))
+    
+    schedules = []
+    for tag_name in sorted(tag_names - known):
+        last_search = last_searched.get(tag_name)
+        schedules.append(TagSchedule(
+            tag=tag_name,
+            interval=default_interval,
+            next_due_at=last_search + timedelta(seconds=default_interval) if last_search else now,
+            last_crawled_at=last_search,
+        ))
+    TagSchedule.objects.bulk_create(schedules, ignore_conflicts=True)
+    return len(schedules), (history_last, tags_last)
+
+
+def due_schedules(limit=None):
+    """
+    Schedules whose next poll is due, most overdue first
+    """
+    schedules = TagSchedule.objects.filter(next_due_at__lte=timezone.now()).order_by('next_due_at')
+    return list(schedules[:limit] if limit else schedules)
+
+
+def record_polls(schedules, results, limit, failed=()):
+    """
+    Store the outcome of a poll round and set each tag's next due time.
+    `results` maps tag name to the number of new articles found. Tags in
+    `failed` or missing from it (because the crawl failed) tell nothing about
+    the feed: they keep their interval and are retried after the minimum one.
+    """
+    now = timezone.now()
+    min_interval = interval_bounds()[0]
+    for schedule in schedules:
+        if schedule.tag in failed or schedule.tag not in results:
+            schedule.next_due_at = now + timedelta(seconds=min(schedule.interval, min_interval))
+            continue
+        new_count = results.get(schedule.tag, 0)
+        schedule.interval = next_interval(schedule.interval, new_count, limit)
+        schedule.next_due_at = now + timedelta(seconds=schedule.interval)
+        schedule.last_crawled_at = now
+        schedule.last_new_count = new_count
+        schedule.empty_streak = schedule.empty_streak + 1 if new_count == 0 else 0
+    TagSchedule.objects.bulk_update(
+        schedules, ['interval', 'next_due_at', 'last_crawled_at', 'last_new_count', 'empty_streak']
+    )
+
+
+def seconds_until_next_due():
+    """
+    Seconds until the earliest schedule is due, or None if there are none
+    """
+    next_due_at = TagSchedule.objects.aggregate(next_due_at=Min('next_due_at'))['next_due_at']
+    if next_due_at is None:
+        return None
+    return max((next_due_at - timezone.now()).total_seconds(), 0)
@@ -0,0 +1,85 @@
+import re
+from django.conf import settings
+from django.db import connection
+from django.utils.html import escape
+
+
+# Control characters marking highlighted terms in FTS snippets; they cannot
+# appear in crawled text, so the snippet can be escaped safely before marking
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+
+_index_available = {}
+
+
+def search_index_available():
+    """
+    True when the SQLite FTS5 table created by migration 0002 exists.
+    Checked once per database.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+    name = str(connection.settings_dict['NAME'])
+    if name not in _index_available:
+        _index_available[name] = 'crawler_blog_fts' in connection.introspection.table_names()
+    return _index_available[name]
+
+
+def index_contents(contents):
+    """
+    Put {blog_id: text} into the search index. Triggers index titles and
+    author names, but blog bodies are stored compressed, out of SQL's reach.
+    """
+    if not contents or not search_index_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "UPDATE crawler_blog_fts SET content = %s WHERE rowid = %s",
+            [(text or '', blog_id) for blog_id, text in contents.items()]
+        )
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix.
+    Quoting each term keeps FTS syntax characters in user input harmless.
+    """
+    terms = re.findall(r'\w+', text)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def highlight(snippet):
+    """
+    Escape a snippet and wrap the matched terms in <mark>
+    """
+    return escape(snippet).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+
+
+def search_blogs(text, limit=None):
+    """
+    Full-text search over blogs, best matches first.
+    
+    Returns a list of (blog_id, snippet_html) pairs, or None when the FTS
+    index is not available on this database so callers can fall back.
+    """
+    if not search_index_available():
+        return None
+    
+    match_query = build_match_query(text)
+    if not match_query:
+        return []
+    
+    limit = limit or getattr(settings, 'CRAWLER_SEARCH_MAX_RESULTS', 200)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT rowid, snippet(crawler_blog_fts, -1, %s, %s, '...', 24)
+            FROM crawler_blog_fts
+            WHERE crawler_blog_fts MATCH %s
+            ORDER BY bm25(crawler_blog_fts, 10.0, 1.0, 5.0)
+            LIMIT %s
+            """,
+            [HIGHLIGHT_START, HIGHLIGHT_END, match_query, limit]
+        )
+        return [(blog_id, highlight(snippet)) for blog_id, snippet in cursor.fetchall()]
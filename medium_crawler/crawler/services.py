@@ -1,249 +1,956 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-import re
-from datetime import datetime
-from django.utils import timezone
-from .models import Blog, Author, Tag, SearchHistory, CrawlStatus
-import feedparser
-from urllib.parse import quote
-
-
-class MediumCrawler:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-    
-    def search_by_tag(self, tag_name, limit=10):
-        """
-        Search Medium articles by tag using RSS feed
-        """
-        try:
-            # Clean and encode the tag name properly
-            clean_tag = tag_name.strip().lower().replace(' ', '-')
-            encoded_tag = quote(clean_tag, safe='')
-            rss_url = f"https://medium.com/feed/tag/{encoded_tag}"
-            
-            print(f"Fetching RSS from: {rss_url}")
-            feed = feedparser.parse(rss_url)
-            print(feed)
-            if not feed.entries:
-                return []
-                
-            articles = []
-            for entry in feed.entries[:limit]:
-                # Clean title from RSS artifacts
-                title = entry.title
-                title = re.sub(r'\?Source=Rss.*$', '', title, flags=re.IGNORECASE)
-                title = re.sub(r'[A-F0-9]{12,}$', '', title).strip()
-                
-                # Extract author
-                author = entry.get('author', 'Unknown Author')
-                
-                # Extract published date
-                published_date = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    try:
-                        published_date = datetime(*entry.published_parsed[:6])
-                        published_date = timezone.make_aware(published_date)
-                    except:
-                        published_date = timezone.now()
-                
-                # Extract content/summary
-                content = entry.get('summary', '')
-                if content:
-                    content = BeautifulSoup(content, 'html.parser').get_text()
-                
-                articles.append({
-                    'url': entry.link,
-                    'title': title,
-                    'author': author,
-                    'content': content,
-                    'published_date': published_date,
-                    'tags': [tag_name]
-                })
-            
-            return articles
-            
-        except Exception as e:
-            print(f"Error fetching RSS feed for {tag_name}: {str(e)}")
-            return []
-    
-    def crawl_article_content(self, article_url):
-        """
-        Extract full article content from Medium URL
-        """
-        try:
-            response = self.session.get(article_url, timeout=15)
-            if response.status_code != 200:
-                return None
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract full content from paragraphs
-            content_elements = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            full_content = '\n\n'.join([elem.get_text().strip() 
-                                      for elem in content_elements 
-                                      if elem.get_text().strip()])
-            
-            # Extract reading time
-            reading_time = 'Unknown'
-            time_patterns = [
-                r'\d+\s*min\s*read',
-                r'\d+\s*minute\s*read'
-            ]
-            
-            page_text = soup.get_text()
-            for pattern in time_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    reading_time = match.group()
-                    break
-            
-            # Extract claps count (basic attempt)
-            claps_count = 0
-            clap_patterns = [r'(\d+)\s*clap', r'(\d+)\s*applause']
-            for pattern in clap_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    try:
-                        claps_count = int(match.group(1))
-                        break
-                    except:
-                        pass
-            
-            return {
-                'content': full_content,
-                'reading_time': reading_time,
-                'claps_count': claps_count
-            }
-            
-        except Exception as e:
-            print(f"Error extracting content from {article_url}: {str(e)}")
-            return None
-    
-    def crawl_tag_articles(self, tag_name, limit=10, status_callback=None):
-        """
-        Crawl articles for a specific tag with real-time updates
-        """
-        start_time = time.time()
-        
-        crawl_status = CrawlStatus.objects.create(
-            tag=tag_name,
-            status='in_progress'
-        )
-        
-        try:
-            articles = self.search_by_tag(tag_name, limit)
-            
-            if not articles:
-                crawl_status.status = 'completed'
-                crawl_status.completed_at = timezone.now()
-                crawl_status.blogs_found = 0
-                crawl_status.error_message = "No articles found for this tag"
-                crawl_status.save()
-                return []
-            
-            crawled_blogs = []
-            
-            for i, article_data in enumerate(articles):
-                if status_callback:
-                    status_callback(f"Crawling {i+1}/{len(articles)}: {article_data['title'][:50]}...")
-                
-                # Get additional content
-                additional_content = self.crawl_article_content(article_data['url'])
-                
-                if additional_content:
-                    article_data.update(additional_content)
-                
-                # Save to database
-                blog = self._save_article_data(article_data)
-                if blog:
-                    crawled_blogs.append(blog)
-                
-                # Respectful delay
-                time.sleep(2)
-            
-            # Update status
-            crawl_status.status = 'completed'
-            crawl_status.completed_at = timezone.now()
-            crawl_status.blogs_found = len(crawled_blogs)
-            crawl_status.save()
-            
-            # Save search history
-            duration = time.time() - start_time
-            SearchHistory.objects.create(
-                tag_searched=tag_name,
-                results_count=len(crawled_blogs),
-                crawl_duration=duration
-            )
-            
-            return crawled_blogs
-            
-        except Exception as e:
-            crawl_status.status = 'failed'
-            crawl_status.error_message = str(e)
-            crawl_status.completed_at = timezone.now()
-            crawl_status.save()
-            return []
-    
-    def _save_article_data(self, article_data):
-        """
-        Save article data to database
-        """
-        try:
-            # Check if already exists
-            if Blog.objects.filter(medium_url=article_data['url']).exists():
-                return None
-            
-            # Get or create author
-            author, created = Author.objects.get_or_create(
-                name=article_data['author'],
-                defaults={'medium_username': ''}
-            )
-            
-            # Create blog
-            content = article_data.get('content', '')
-            summary = content[:300] + '...' if len(content) > 300 else content
-            
-            blog = Blog.objects.create(
-                title=article_data['title'],
-                content=content,
-                summary=summary,
-                author=author,
-                medium_url=article_data['url'],
-                published_date=article_data.get('published_date'),
-                claps_count=article_data.get('claps_count', 0),
-                reading_time=article_data.get('reading_time', 'Unknown')
-            )
-            
-            # Add tags
-            for tag_name in article_data.get('tags', []):
-                tag, created = Tag.objects.get_or_create(name=tag_name.lower())
-                blog.tags.add(tag)
-            
-            return blog
-            
-        except Exception as e:
-            print(f"Error saving article: {str(e)}")
-            return None
-    
-    def suggest_tags(self, query):
-        """
-        Suggest related tags based on query
-        """
-        existing_tags = Tag.objects.filter(name__icontains=query).values_list('name', flat=True)[:5]
-        
-        common_tags = [
-            'technology', 'programming', 'python', 'javascript', 'data-science',
-            'machine-learning', 'web-development', 'startup', 'business',
-            'productivity', 'design', 'marketing', 'entrepreneurship',
-            'artificial-intelligence', 'blockchain', 'software-engineering'
-        ]
-        
-        suggested_tags = [tag for tag in common_tags if query.lower() in tag.lower()]
-        all_suggestions = list(existing_tags) + suggested_tags
-        
-        return list(dict.fromkeys(all_suggestions))[:5]
\ No newline at end of file
+import logging
+import requests
+import time
+import re
+from datetime import timezone as dt_timezone
+from email.utils import parsedate_to_datetime
+from html import unescape
+from io import BytesIO
+from django.utils import timezone
+from django.conf import settings
+from django.db import connection, transaction
+from .models import Blog, BlogBody, Author, Tag, SearchHistory, CrawlStatus, BlogAlias, ContentFingerprint
+from .fetching import (
+    RETRY_STATUSES, CircuitOpenError, FetchError, HostCircuitBreaker, HostRateLimiter,
+    backoff_delay, bounded_map, parse_retry_after
+)
+from .metrics import CrawlMetrics, record_totals
+from .http_cache import HttpCache
+from .jobs import heartbeat
+from .page_cache import pages_changed, pages_changed_on_commit
+from .suggestions import suggest_tags
+from .tags import refresh_tag_counts
+from .related import collect_related_changes, mark_related_stale, refresh_related
+from .dedup import add_aliases, canonical_url, find_near_duplicates, fingerprint, hamming, max_distance, simhash
+from lxml import etree, html as lxml_html
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote
+
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+MEDIUM_URL = 'https://medium.com'
+
+
+def medium_base_url():
+    return getattr(settings, 'CRAWLER_MEDIUM_BASE_URL', MEDIUM_URL).rstrip('/')
+
+
+def fetch_url(url):
+    """
+    The URL to request for a Medium URL. Blogs keep their medium.com URLs;
+    requests go to CRAWLER_MEDIUM_BASE_URL, such as a local stand-in server.
+    """
+    base_url = medium_base_url()
+    if base_url != MEDIUM_URL and url.startswith(MEDIUM_URL + '/'):
+        return base_url + url[len(MEDIUM_URL):]
+    return url
+
+
+def tag_feed_url(tag_name):
+    """
+    Build the Medium RSS feed URL for a tag
+    """
+    # Clean and encode the tag name properly
+    clean_tag = tag_name.strip().lower().replace(' ', '-')
+    encoded_tag = quote(clean_tag, safe='')
+    return f"{medium_base_url()}/feed/tag/{encoded_tag}"
+
+
+DC_CREATOR = '{http://purl.org/dc/elements/1.1/}creator'
+CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+HTML_TAG_RE = re.compile(r'<[^>]*>')
+
+
+def strip_html(text):
+    """
+    Plain text of an HTML fragment: tags are dropped and entities decoded
+    """
+    return unescape(HTML_TAG_RE.sub('', text))
+
+
+def parse_feed_date(value):
+    """
+    Aware datetime of an RSS date (RFC 822); dates without a zone are UTC
+    """
+    if not value:
+        return None
+    try:
+        published_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return timezone.now()
+    if timezone.is_naive(published_date):
+        published_date = timezone.make_aware(published_date, dt_timezone.utc)
+    return published_date
+
+
+def iter_feed_items(xml, limit):
+    """
+    Yield the first `limit` items of an RSS feed as {child tag: text} dicts.
+    
+    The feed is parsed incrementally and parsing stops at the limit, so the
+    rest of a long feed is never parsed. Items are freed once read. A
+    malformed or truncated feed yields the items read before the damage.
+    """
+    if limit <= 0:
+        return
+    items = etree.iterparse(
+        BytesIO(xml), events=('end',), tag='item', recover=True, resolve_entities=False, no_network=True
+    )
+    try:
+        for count, (event, item) in enumerate(items, 1):
+            yield {child.tag: (child.text or '').strip() for child in item if isinstance(child.tag, str)}
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+            if count >= limit:
+                return
+    except etree.XMLSyntaxError:
+        # Not even recovery could make sense of the rest, e.g. an empty body
+        return
+
+
+def parse_feed(xml, tag_name, limit=10):
+    """
+    Turn the items of an RSS feed into article dicts
+    """
+    articles = []
+    for item in iter_feed_items(xml, limit):
+        link = item.get('link') or item.get('guid')
+        if not link:
+            continue
+        
+        # Clean title from RSS artifacts; entities inside CDATA are left encoded
+        title = unescape(item.get('title', ''))
+        title = re.sub(r'\?Source=Rss.*$', '', title, flags=re.IGNORECASE)
+        title = re.sub(r'[A-F0-9]{12,}$', '', title).strip()
+        
+        # Extract content/summary; Medium feeds carry the post as content:encoded
+        content = item.get('description') or item.get(CONTENT_ENCODED) or ''
+        if content:
+            content = strip_html(content)
+        
+        articles.append({
+            'url': canonical_url(link),
+            'title': title,
+            'author': unescape(item.get(DC_CREATOR) or item.get('author') or '') or 'Unknown Author',
+            'content': content,
+            'published_date': parse_feed_date(item.get('pubDate')),
+            'tags': [tag_name]
+        })
+    
+    return articles
+
+
+ARTICLE_TEXT_TAGS = {'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+NON_TEXT_TAGS = {'script', 'style', 'noscript', 'template'}
+# Elements that start a new line of text; inline elements such as <span>
+# run on, so "<span>5</span> min read" reads as one line
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'br', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr',
+    'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul',
+}
+READING_TIME_RE = re.compile(r'\d+\s*min(?:ute)?\s*read', re.IGNORECASE)
+CLAPS_RE = re.compile(r'(\d+)\s*(?:clap|applause)', re.IGNORECASE)
+
+
+def parse_article_html(html):
+    """
+    Extract content, reading time and claps from an article page.
+    
+    The page is parsed once with lxml and walked once: paragraph and heading
+    text is collected while the text of each line (see BLOCK_TAGS) is
+    scanned for the reading time and clap count, instead of building a
+    second copy of the page text.
+    """
+    full_content = []
+    found = {'reading_time': None, 'claps_count': None}
+    line = []
+    
+    def end_line():
+        text = ''.join(line)
+        line.clear()
+        if found['reading_time'] is None:
+            match = READING_TIME_RE.search(text)
+            if match:
+                found['reading_time'] = match.group()
+        if found['claps_count'] is None:
+            match = CLAPS_RE.search(text)
+            if match:
+                found['claps_count'] = int(match.group(1))
+    
+    if html:
+        root = lxml_html.fromstring(html)
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            # Comments and processing instructions have a non-string tag
+            tag = element.tag if isinstance(element.tag, str) else None
+            if event == 'start':
+                if tag in ARTICLE_TEXT_TAGS:
+                    text = element.text_content().strip()
+                    if text:
+                        full_content.append(text)
+                if tag in BLOCK_TAGS:
+                    end_line()
+                if tag and tag not in NON_TEXT_TAGS and element.text:
+                    line.append(element.text)
+            else:
+                if tag in BLOCK_TAGS:
+                    end_line()
+                if element.tail:
+                    line.append(element.tail)
+        end_line()
+    
+    return {
+        'content': '\n\n'.join(full_content),
+        'reading_time': found['reading_time'] or 'Unknown',
+        'claps_count': found['claps_count'] or 0
+    }
+
+
+def link_tags(blog_tags):
+    """
+    Attach tags to blogs in bulk.
+    `blog_tags` maps blog ids to sets of lowercase tag names; missing tags are
+    created and links that already exist are left alone.
+    """
+    tag_names = set().union(*blog_tags.values()) if blog_tags else set()
+    if not tag_names:
+        return
+    
+    # Tag name is unique so conflicts are simply ignored
+    Tag.objects.bulk_create([Tag(name=name) for name in tag_names], ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.filter(name__in=tag_names).values_list('name', 'id'))
+    
+    # Link tags through the M2M table in one insert
+    BlogTag = Blog.tags.through
+    BlogTag.objects.bulk_create([
+        BlogTag(blog_id=blog_id, tag_id=tag_ids[name])
+        for blog_id, names in blog_tags.items()
+        for name in names
+    ], ignore_conflicts=True)
+    
+    # bulk_create sends no signals, so keep the tag counts in step here
+    refresh_tag_counts(tag_ids.values())
+    mark_related_stale(blog_tags)
+
+
+def filter_known_articles(articles, refresh_older_than=None):
+    """
+    Drop articles that are already stored before any page is fetched.
+    
+    Known URLs are looked up with one IN query; their feed tags are still
+    linked so a stored article picks up the tag it was found under. With
+    `refresh_older_than` (a timedelta), articles crawled longer ago than that
+    are kept and flagged with `refresh` so the saver updates them.
+    """
+    urls = [article_data['url'] for article_data in articles]
+    known = {
+        url: (blog_id, crawled_at)
+        for blog_id, url, crawled_at in Blog.objects.filter(
+            medium_url__in=urls
+        ).values_list('id', 'medium_url', 'crawled_at')
+    }
+    # URLs already seen as copies of a stored blog
+    known.update({
+        url: (blog_id, crawled_at)
+        for url, blog_id, crawled_at in BlogAlias.objects.filter(
+            url__in=urls
+        ).values_list('url', 'blog_id', 'blog__crawled_at')
+    })
+    if not known:
+        return articles
+    
+    refresh_before = timezone.now() - refresh_older_than if refresh_older_than else None
+    remaining = []
+    known_tags = {}
+    for article_data in articles:
+        if article_data['url'] not in known:
+            remaining.append(article_data)
+            continue
+        
+        blog_id, crawled_at = known[article_data['url']]
+        if refresh_before and crawled_at < refresh_before:
+            article_data['refresh'] = True
+            remaining.append(article_data)
+        else:
+            known_tags.setdefault(blog_id, set()).update(
+                tag_name.lower() for tag_name in article_data.get('tags', [])
+            )
+    
+    link_tags(known_tags)
+    return remaining
+
+
+def save_articles_data(articles):
+    """
+    Save a batch of article dicts to the database.
+    
+    Authors, tags, blogs and tag links are each resolved with set-based
+    queries inside one transaction, so the statement count does not grow
+    with the batch size. Articles whose URL is already stored are skipped,
+    unless they are flagged with `refresh`, in which case the stored blog is
+    updated. Returns the created and refreshed blogs.
+    
+    When the batch fails, the error is logged and its articles are saved one
+    by one, so only the articles that fail on their own are lost.
+    """
+    # Collapse repeated URLs, merging their tags
+    by_url = {}
+    for article_data in articles:
+        tags = {tag_name.lower() for tag_name in article_data.get('tags', [])}
+        if article_data['url'] in by_url:
+            by_url[article_data['url']][1].update(tags)
+        else:
+            by_url[article_data['url']] = (article_data, tags)
+    
+    if not by_url:
+        return []
+    
+    # Content fingerprints, computed before the transaction starts
+    hashes = {url: simhash(article_data.get('content', '')) for url, (article_data, tags) in by_url.items()}
+    
+    try:
+        return _save_articles(by_url, hashes)
+    except Exception:
+        if len(by_url) == 1:
+            logger.exception("Error saving article %s", next(iter(by_url)))
+            return []
+        logger.exception("Error saving a batch of %d articles, saving them one at a time", len(by_url))
+    
+    # One bad article must not cost the rest of the batch
+    blogs = []
+    for url, item in by_url.items():
+        try:
+            blogs.extend(_save_articles({url: item}, hashes))
+        except Exception:
+            logger.exception("Error saving article %s", url)
+    return blogs
+
+
+def _save_articles(by_url, hashes):
+    """
+    Save {url: (article dict, tag names)} in one transaction
+    """
+    with transaction.atomic():
+        existing_urls = set(
+            Blog.objects.filter(medium_url__in=by_url.keys()).values_list('medium_url', flat=True)
+        )
+        new_articles = [item for url, item in by_url.items() if url not in existing_urls]
+        refreshed_blogs = _refresh_blogs([
+            item for url, item in by_url.items()
+            if url in existing_urls and item[0].get('refresh')
+        ], hashes)
+        new_articles, batch_copies = _link_near_duplicates(new_articles, hashes)
+        # Cached pages start showing the new and refreshed blogs once this commits
+        pages_changed_on_commit()
+        if not new_articles:
+            return refreshed_blogs
+        
+        # Resolve authors, creating the missing ones in bulk
+        author_names = {article_data['author'] for article_data, tags in new_articles}
+        authors = {}
+        for author in Author.objects.filter(name__in=author_names).order_by('id'):
+            authors.setdefault(author.name, author)
+        missing_authors = author_names - authors.keys()
+        if missing_authors:
+            Author.objects.bulk_create([
+                Author(name=name, medium_username='') for name in missing_authors
+            ])
+            for author in Author.objects.filter(name__in=missing_authors).order_by('id'):
+                authors.setdefault(author.name, author)
+        
+        # Create blogs
+        blogs = []
+        for article_data, tags in new_articles:
+            content = article_data.get('content', '')
+            summary = content[:300] + '...' if len(content) > 300 else content
+            blogs.append(Blog(
+                title=article_data['title'],
+                summary=summary,
+                author=authors[article_data['author']],
+                medium_url=article_data['url'],
+                published_date=article_data.get('published_date'),
+                claps_count=article_data.get('claps_count', 0),
+                reading_time=article_data.get('reading_time', 'Unknown')
+            ))
+        Blog.objects.bulk_create(blogs, ignore_conflicts=True)
+        
+        # ignore_conflicts leaves primary keys unset, so read the rows back
+        new_urls = [article_data['url'] for article_data, tags in new_articles]
+        saved_blogs = {
+            blog.medium_url: blog
+            for blog in Blog.objects.filter(medium_url__in=new_urls).select_related('author')
+        }
+        
+        BlogBody.store({
+            saved_blogs[article_data['url']].id: article_data.get('content', '')
+            for article_data, tags in new_articles
+            if article_data['url'] in saved_blogs
+        })
+        link_tags({
+            saved_blogs[article_data['url']].id: tags
+            for article_data, tags in new_articles
+            if article_data['url'] in saved_blogs
+        })
+        ContentFingerprint.objects.bulk_create([
+            fingerprint(saved_blogs[url].id, hashes[url])
+            for url in new_urls
+            if url in saved_blogs and hashes[url] is not None
+        ], ignore_conflicts=True)
+        add_aliases({
+            url: saved_blogs[original_url].id
+            for url, original_url in batch_copies.items()
+            if original_url in saved_blogs
+        })
+        
+        return [saved_blogs[url] for url in new_urls if url in saved_blogs] + refreshed_blogs
+
+
+def _link_near_duplicates(new_articles, hashes):
+    """
+    Split off new articles whose content nearly matches a stored blog or an
+    earlier article of the same batch (a syndicated copy under another URL).
+    
+    Copies of stored blogs are linked right away: the URL becomes an alias
+    of the blog and their tags are added to it. Copies within the batch give
+    their tags to the first article; the returned {url: original_url} lets
+    the caller alias them once that article is saved.
+    """
+    duplicates = find_near_duplicates({
+        article_data['url']: hashes[article_data['url']] for article_data, tags in new_articles
+    })
+    distance = max_distance()
+    
+    kept = []
+    batch_copies = {}
+    stored_copies = {}
+    for article_data, tags in new_articles:
+        url = article_data['url']
+        if url in duplicates:
+            stored_copies.setdefault(duplicates[url], set()).update(tags)
+            continue
+        
+        original = None
+        if hashes[url] is not None and distance is not None:
+            original = next((
+                (kept_data, kept_tags) for kept_data, kept_tags in kept
+                if hashes[kept_data['url']] is not None
+                and hamming(hashes[url], hashes[kept_data['url']]) <= distance
+            ), None)
+        if original:
+            original[1].update(tags)
+            batch_copies[url] = original[0]['url']
+        else:
+            kept.append((article_data, tags))
+    
+    add_aliases({url: blog_id for url, blog_id in duplicates.items()})
+    link_tags(stored_copies)
+    return kept, batch_copies
+
+
+def _refresh_blogs(items, hashes=None):
+    """
+    Overwrite stored blogs with freshly crawled data, in bulk
+    """
+    if not items:
+        return []
+    
+    by_url = dict((article_data['url'], (article_data, tags)) for article_data, tags in items)
+    blogs = list(Blog.objects.filter(medium_url__in=by_url.keys()).select_related('author'))
+    now = timezone.now()
+    for blog in blogs:
+        article_data = by_url[blog.medium_url][0]
+        content = article_data.get('content', '')
+        blog.title = article_data['title']
+        blog.summary = content[:300] + '...' if len(content) > 300 else content
+        blog.claps_count = article_data.get('claps_count', 0)
+        blog.reading_time = article_data.get('reading_time', 'Unknown')
+        blog.crawled_at = now
+    Blog.objects.bulk_update(
+        blogs, ['title', 'summary', 'claps_count', 'reading_time', 'crawled_at']
+    )
+    BlogBody.store({blog.id: by_url[blog.medium_url][0].get('content', '') for blog in blogs})
+    
+    hashes = hashes or {}
+    ContentFingerprint.objects.bulk_create(
+        [fingerprint(blog.id, hashes[blog.medium_url]) for blog in blogs if hashes.get(blog.medium_url) is not None],
+        update_conflicts=True,
+        unique_fields=['blog'],
+        update_fields=['simhash', 'band0', 'band1', 'band2', 'band3']
+    )
+    
+    link_tags({blog.id: by_url[blog.medium_url][1] for blog in blogs})
+    return blogs
+
+
+def describe_fetch_errors(errors):
+    """
+    Summary of a crawl's failed requests for CrawlStatus.error_message
+    """
+    if len(errors) == 1:
+        return errors[0]
+    return f"{len(errors)} requests failed, first: {errors[0]}"
+
+
+def save_article_data(article_data):
+    """
+    Save article data to database
+    """
+    blogs = save_articles_data([article_data])
+    return blogs[0] if blogs else None
+
+
+def finish_crawls(crawl_statuses, metrics, status, update_fields=(), **values):
+    """
+    Record the outcome of crawl jobs with the CrawlMetrics of their run,
+    which are added to the /metrics totals once. `status` and `values` are
+    set on every job; pass status=None when the caller set each job's
+    status. `update_fields` names fields the caller already set.
+    """
+    metrics = metrics.as_dict()
+    now = timezone.now()
+    for crawl_status in crawl_statuses:
+        if status:
+            crawl_status.status = status
+        crawl_status.completed_at = now
+        crawl_status.metrics = metrics
+        for name, value in values.items():
+            setattr(crawl_status, name, value)
+    CrawlStatus.objects.bulk_update(
+        crawl_statuses, ['status', 'completed_at', 'metrics', *update_fields, *values]
+    )
+    record_totals(metrics, crawls=len(crawl_statuses))
+
+
+def default_rate_limiter(rate_limit=None, rate_burst=None):
+    return HostRateLimiter(
+        rate_limit or getattr(settings, 'CRAWLER_RATE_LIMIT', 2.0),
+        rate_burst or getattr(settings, 'CRAWLER_RATE_BURST', 4)
+    )
+
+
+def default_circuit_breaker():
+    return HostCircuitBreaker(
+        getattr(settings, 'CRAWLER_CIRCUIT_FAILURES', 5),
+        getattr(settings, 'CRAWLER_CIRCUIT_RESET', 30)
+    )
+
+
+class MediumCrawler:
+    """
+    Pass the same `rate_limiter` and `circuit_breaker` to every crawler of a
+    process, so the per-host budget and breaker hold for all of them
+    together rather than for each crawler.
+    """
+    
+    def __init__(self, max_workers=None, rate_limit=None, rate_burst=None, save_batch_size=None,
+                 use_cache=True, refresh_older_than=None, rate_limiter=None, circuit_breaker=None):
+        self.max_workers = max_workers or getattr(settings, 'CRAWLER_MAX_WORKERS', 4)
+        self.save_batch_size = save_batch_size or getattr(settings, 'CRAWLER_SAVE_BATCH_SIZE', 100)
+        self.save_batch_interval = getattr(settings, 'CRAWLER_SAVE_BATCH_INTERVAL', 2)
+        self.rate_limiter = rate_limiter or default_rate_limiter(rate_limit, rate_burst)
+        
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT
+        })
+        # Size the connection pool to the worker count so concurrent fetches reuse connections
+        adapter = HTTPAdapter(pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Connect and read timeouts are separate: a host that does not answer
+        # is given up on quickly, a slow response still gets time to finish
+        self.timeout = (
+            getattr(settings, 'CRAWLER_CONNECT_TIMEOUT', 5),
+            getattr(settings, 'CRAWLER_READ_TIMEOUT', 15)
+        )
+        self.max_retries = getattr(settings, 'CRAWLER_MAX_RETRIES', 3)
+        self.retry_backoff = getattr(settings, 'CRAWLER_RETRY_BACKOFF', 0.5)
+        self.retry_max_delay = getattr(settings, 'CRAWLER_RETRY_MAX_DELAY', 30)
+        self.circuit_breaker = circuit_breaker or default_circuit_breaker()
+        
+        self.http_cache = HttpCache.from_settings() if use_cache else None
+        self.refresh_older_than = refresh_older_than or getattr(settings, 'CRAWLER_REFRESH_OLDER_THAN', None)
+        # Replaced at the start of every crawl; see crawler.metrics
+        self.metrics = CrawlMetrics()
+        # Tags of the last crawl_tags run that failed
+        self.failed_tags = set()
+    
+    def _get(self, url):
+        """
+        GET a URL through the HTTP cache, the per-host rate limiter and the
+        retry policy of _request
+        """
+        url = fetch_url(url)
+        meta = self.http_cache.lookup(url) if self.http_cache else None
+        if meta and self.http_cache.is_fresh(meta):
+            cached = self.http_cache.load(url, meta)
+            if cached:
+                self.metrics.incr('cache_hits')
+                return cached
+        
+        headers = self.http_cache.conditional_headers(meta) if meta else {}
+        response = self._request(url, headers)
+        
+        if self.http_cache:
+            if response.status_code == 304 and meta:
+                cached = self.http_cache.load(url, meta)
+                if cached:
+                    self.http_cache.revalidated(url, meta, response.headers)
+                    self.metrics.incr('cache_hits')
+                    return cached
+                # The body vanished under us; fetch it again unconditionally
+                response = self._request(url)
+            if response.status_code == 200:
+                self.http_cache.store(url, response.headers, response.content)
+        
+        return response
+    
+    def _request(self, url, headers=None):
+        """
+        GET a URL, retrying 429 and 5xx responses, connection errors and
+        timeouts with jittered exponential backoff.
+        
+        A Retry-After header is honoured, and since throttling concerns the
+        whole host, the host's rate limiter is paused for that long so every
+        thread slows down rather than each running into its own 429s.
+        Raises FetchError once the retries run out, when the server asks for
+        a longer wait than CRAWLER_RETRY_MAX_DELAY, or while the host's
+        circuit is open.
+        """
+        breaker = self.circuit_breaker.breaker_for(url)
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                self.metrics.incr('failed_fetches')
+                raise CircuitOpenError(url, 'Circuit open')
+            
+            with self.metrics.stage('rate_limit_wait'):
+                self.rate_limiter.acquire(url)
+            status = retry_after = None
+            try:
+                response = self.session.get(url, timeout=self.timeout, headers=headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.record_failure()
+                reason = type(e).__name__
+            else:
+                self.metrics.incr('requests')
+                self.metrics.incr('bytes_downloaded', len(response.content))
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                status = response.status_code
+                reason = f"HTTP {status}"
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            
+            if attempt == self.max_retries:
+                break
+            delay = retry_after if retry_after is not None else backoff_delay(
+                attempt, self.retry_backoff, self.retry_max_delay
+            )
+            if delay > self.retry_max_delay:
+                reason += f" (Retry-After {delay:.0f}s)"
+                break
+            
+            self.metrics.incr('retries')
+            if retry_after is not None or status == 429:
+                self.rate_limiter.pause(url, delay)
+            else:
+                with self.metrics.stage('retry_wait'):
+                    time.sleep(delay)
+        
+        self.metrics.incr('failed_fetches')
+        raise FetchError(url, reason, status)
+    
+    def search_by_tag(self, tag_name, limit=10):
+        """
+        Search Medium articles by tag using RSS feed.
+        Raises FetchError when the feed cannot be fetched.
+        """
+        try:
+            rss_url = tag_feed_url(tag_name)
+            
+            with self.metrics.stage('feed_fetch'):
+                response = self._get(rss_url)
+            if response.status_code != 200:
+                return []
+            
+            with self.metrics.stage('feed_parse'):
+                return parse_feed(response.content, tag_name, limit)
+        
+        except FetchError:
+            raise
+        except Exception as e:
+            print(f"Error fetching RSS feed for {tag_name}: {str(e)}")
+            return []
+    
+    def crawl_article_content(self, article_url):
+        """
+        Extract full article content from Medium URL.
+        Returns None when the page is missing or cannot be parsed and raises
+        FetchError when it cannot be fetched.
+        """
+        try:
+            with self.metrics.stage('article_fetch'):
+                response = self._get(article_url)
+            if response.status_code != 200:
+                return None
+                
+            with self.metrics.stage('article_parse'):
+                return parse_article_html(response.content)
+        
+        except FetchError:
+            raise
+        except Exception as e:
+            print(f"Error extracting content from {article_url}: {str(e)}")
+            return None
+    
+    def crawl_tag_articles(self, tag_name, limit=10, status_callback=None, crawl_status=None, blog_callback=None):
+        """
+        Crawl articles for a specific tag with real-time updates.
+        Pass `crawl_status` to run a job already claimed from the crawl queue.
+        `status_callback(message)` receives progress messages and
+        `blog_callback(blogs)` every batch of saved blogs.
+        Stage timings and counters are stored on the job (CrawlStatus.metrics).
+        Requests that fail for good are listed in the job's error message; the
+        job fails when nothing could be saved because of them.
+        Returns the number of blogs saved.
+        """
+        start_time = time.time()
+        self.metrics = CrawlMetrics()
+        
+        if crawl_status is None:
+            crawl_status = CrawlStatus.objects.create(
+                tag=tag_name,
+                status='in_progress',
+                claimed_at=timezone.now()
+            )
+        
+        try:
+            with connection.execute_wrapper(self.metrics.count_queries), heartbeat([crawl_status.id]):
+                found, saved, results, errors = self._crawl([tag_name], limit, status_callback, blog_callback)
+                errors = errors.get(tag_name.lower())
+                
+                if errors and not saved:
+                    self._finish_crawls(
+                        [crawl_status], 'failed', blogs_found=0, error_message=describe_fetch_errors(errors)
+                    )
+                    return 0
+                
+                if not found:
+                    self._finish_crawls(
+                        [crawl_status], 'completed', blogs_found=0, error_message="No articles found for this tag"
+                    )
+                    return 0
+                
+                # Update status
+                self._finish_crawls(
+                    [crawl_status], 'completed', blogs_found=saved,
+                    error_message=describe_fetch_errors(errors) if errors else None
+                )
+                
+                # Save search history
+                duration = time.time() - start_time
+                SearchHistory.objects.create(
+                    tag_searched=tag_name,
+                    results_count=saved,
+                    crawl_duration=duration
+                )
+            
+            return saved
+        
+        except Exception as e:
+            self._finish_crawls([crawl_status], 'failed', error_message=str(e))
+            return 0
+    
+    def crawl_tags(self, tag_names, limit=10, status_callback=None, blog_callback=None, record_history=True):
+        """
+        Crawl many tags in one run.
+        
+        Feeds are fetched concurrently and an article listed under several
+        tags is fetched and parsed once and saved with all of them. Returns
+        {tag_name: number of new blogs}, or {} when the crawl failed.
+        Every tag's CrawlStatus gets the metrics of the whole run, and fails
+        when requests for the tag failed and none of its articles was saved;
+        those tags are left in self.failed_tags.
+        With record_history=False the run is not added to the search history,
+        for polls nobody searched for.
+        """
+        start_time = time.time()
+        self.metrics = CrawlMetrics()
+        tag_names = list(dict.fromkeys(tag_name.strip().lower() for tag_name in tag_names if tag_name.strip()))
+        self.failed_tags = set(tag_names)
+        
+        crawl_statuses = CrawlStatus.objects.bulk_create([
+            CrawlStatus(tag=tag_name, status='in_progress', claimed_at=timezone.now()) for tag_name in tag_names
+        ])
+        
+        try:
+            with connection.execute_wrapper(self.metrics.count_queries), heartbeat([s.id for s in crawl_statuses]):
+                found, saved, results, errors = self._crawl(tag_names, limit, status_callback, blog_callback)
+                
+                # Record the run per tag
+                for crawl_status in crawl_statuses:
+                    tag_errors = errors.get(crawl_status.tag)
+                    crawl_status.blogs_found = results[crawl_status.tag]
+                    crawl_status.status = 'failed' if tag_errors and not crawl_status.blogs_found else 'completed'
+                    crawl_status.error_message = describe_fetch_errors(tag_errors) if tag_errors else None
+                self._finish_crawls(crawl_statuses, None, ['blogs_found', 'error_message'])
+                self.failed_tags = {crawl_status.tag for crawl_status in crawl_statuses if crawl_status.status == 'failed'}
+        
+        except Exception as e:
+            self._finish_crawls(crawl_statuses, 'failed', error_message=str(e))
+            return {}
+        
+        if record_history:
+            duration = time.time() - start_time
+            SearchHistory.objects.bulk_create([
+                SearchHistory(tag_searched=tag_name, results_count=count, crawl_duration=duration)
+                for tag_name, count in results.items()
+            ])
+            # bulk_create sends no signals; the home page lists recent searches
+            pages_changed()
+        
+        return results
+    
+    def _crawl(self, tag_names, limit, status_callback=None, blog_callback=None):
+        """
+        Stream the articles of some tags through discover -> fetch and parse
+        -> save with bounded buffers.
+        
+        Feeds are read only as fetch slots free up, at most 2 * max_workers
+        pages are being fetched, and pages are saved, reported and dropped
+        batch by batch (CRAWLER_SAVE_BATCH_SIZE, or CRAWLER_SAVE_BATCH_INTERVAL
+        seconds), so memory does not grow with the number of articles.
+        Saving stays on this thread.
+        
+        A feed or page that cannot be fetched (FetchError) is recorded under
+        its tags and the crawl carries on; such articles are not saved, so a
+        later crawl picks them up again.
+        
+        Returns (feed entries found, blogs saved, {tag_name: blogs saved},
+        {tag_name: [fetch errors]}).
+        """
+        # Articles discovered but not saved yet; a feed listing one of them
+        # again only adds its tag
+        in_flight = {}
+        found = 0
+        saved = 0
+        results = dict.fromkeys((tag_name.lower() for tag_name in tag_names), 0)
+        errors = {}
+        
+        # Fetch errors are handed back as results so one failure does not stop the crawl
+        def fetch_feed(tag_name):
+            try:
+                return self.search_by_tag(tag_name, limit)
+            except FetchError as e:
+                return e
+        
+        def fetch_page(article_data):
+            try:
+                return self.crawl_article_content(article_data['url'])
+            except FetchError as e:
+                return e
+        
+        def record_error(tags, error):
+            for tag_name in tags:
+                errors.setdefault(tag_name.lower(), []).append(str(error))
+        
+        def discover(feeds):
+            nonlocal found
+            for tag_name, articles in feeds:
+                if isinstance(articles, FetchError):
+                    record_error([tag_name], articles)
+                    continue
+                found += len(articles)
+                fresh = {}
+                for article_data in articles:
+                    queued = in_flight.get(article_data['url']) or fresh.get(article_data['url'])
+                    if queued:
+                        queued['tags'].extend(t for t in article_data['tags'] if t not in queued['tags'])
+                    else:
+                        fresh[article_data['url']] = article_data
+                
+                # Skip articles we already have before spending requests on them
+                for article_data in filter_known_articles(list(fresh.values()), self.refresh_older_than):
+                    in_flight[article_data['url']] = article_data
+                    yield article_data
+        
+        def save(batch):
+            nonlocal saved
+            blogs = self._save_batch(batch, blog_callback)
+            saved += len(blogs)
+            for blog in blogs:
+                for tag_name in in_flight[blog.medium_url]['tags']:
+                    if tag_name.lower() in results:
+                        results[tag_name.lower()] += 1
+            for article_data in batch:
+                in_flight.pop(article_data['url'], None)
+        
+        # Fetch pages concurrently; the per-host rate limiter paces the
+        # requests, so there is no fixed delay
+        with collect_related_changes() as changed_blogs, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            feeds = bounded_map(executor, fetch_feed, tag_names, self.max_workers)
+            pages = bounded_map(executor, fetch_page, discover(feeds), 2 * self.max_workers)
+            
+            batch = []
+            for i, (article_data, additional_content) in enumerate(pages):
+                if isinstance(additional_content, FetchError):
+                    record_error(article_data['tags'], additional_content)
+                    in_flight.pop(article_data['url'], None)
+                    continue
+                
+                if status_callback:
+                    status_callback(f"Crawled article {i+1}: {article_data['title'][:50]}...")
+                
+                if additional_content:
+                    article_data.update(additional_content)
+                
+                batch.append(article_data)
+                if len(batch) == 1:
+                    batch_started = time.monotonic()
+                if len(batch) >= self.save_batch_size or time.monotonic() - batch_started >= self.save_batch_interval:
+                    save(batch)
+                    batch = []
+            
+            # Save whatever is left of the last batch
+            if batch:
+                save(batch)
+        
+        # Related blogs are refreshed once per crawl, not once per batch
+        with self.metrics.stage('db_save'):
+            refresh_related(changed_blogs)
+        return found, saved, results, errors
+    
+    def _finish_crawls(self, crawl_statuses, status, update_fields=(), **values):
+        finish_crawls(crawl_statuses, self.metrics, status, update_fields, **values)
+    
+    def _save_batch(self, articles, blog_callback=None):
+        """
+        Save a batch of crawled articles and report the saved blogs
+        """
+        with self.metrics.stage('db_save'):
+            blogs = save_articles_data(articles)
+        self.metrics.incr('articles_saved', len(blogs))
+        if blogs and blog_callback:
+            blog_callback(blogs)
+        return blogs
+    
+    def _save_article_data(self, article_data):
+        """
+        Save article data to database
+        """
+        with self.metrics.stage('db_save'):
+            blog = save_article_data(article_data)
+        self.metrics.incr('articles_saved', 1 if blog else 0)
+        return blog
+    
+    def suggest_tags(self, query):
+        """
+        Suggest related tags based on query
+        """
+        return suggest_tags(query)
\ No newline at end of file
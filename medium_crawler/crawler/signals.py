@@ -0,0 +1,36 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .models import Author, Blog, Comment, SearchHistory, Tag
+from .page_cache import pages_changed_on_commit
+from .tags import refresh_all_tag_counts_on_commit, refresh_tag_counts, tags_changed
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def tag_saved(sender, **kwargs):
+    tags_changed()
+
+
+@receiver(post_delete, sender=Blog)
+def blog_deleted(sender, **kwargs):
+    refresh_all_tag_counts_on_commit()
+
+
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=SearchHistory)
+@receiver(post_delete, sender=SearchHistory)
+def page_content_changed(sender, **kwargs):
+    pages_changed_on_commit()
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def blog_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_clear':
+        refresh_all_tag_counts_on_commit()
+    elif action in ('post_add', 'post_remove'):
+        refresh_tag_counts([instance.pk] if reverse else pk_set)
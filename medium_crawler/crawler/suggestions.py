@@ -0,0 +1,117 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from .models import Tag
+
+
+COMMON_TAGS = [
+    'technology', 'programming', 'python', 'javascript', 'data-science',
+    'machine-learning', 'web-development', 'startup', 'business',
+    'productivity', 'design', 'marketing', 'entrepreneurship',
+    'artificial-intelligence', 'blockchain', 'software-engineering'
+]
+
+VERSION_KEY = 'tag-suggestions:version'
+MAX_CACHED_QUERIES = 10000
+
+# Positions where a word starts inside a tag name, e.g. "learning" in "machine-learning"
+WORD_START_RE = re.compile(r'(?:^|(?<=[\s\-_]))\w')
+
+
+class TagSuggestionIndex:
+    """
+    Sorted array of (word start, rank, name) used to answer prefix queries
+    with a binary search. Every word of a tag name is indexed, so "learn"
+    finds "machine-learning". Rank orders tags by blog count.
+    """
+    
+    def __init__(self, tag_counts):
+        ranked = sorted(tag_counts.items(), key=lambda item: (-item[1], item[0]))
+        self.names = [name for name, count in ranked]
+        self.entries = []
+        for rank, name in enumerate(self.names):
+            for match in WORD_START_RE.finditer(name):
+                self.entries.append((name[match.start():], rank, name))
+        self.entries.sort()
+        self.keys = [key for key, rank, name in self.entries]
+        # Short prefixes match many tags and are the most repeated queries
+        self.results = {}
+    
+    def suggest(self, query, limit=5):
+        query = query.strip().lower()
+        if not query:
+            return []
+        if (query, limit) in self.results:
+            return self.results[query, limit]
+        
+        start = bisect.bisect_left(self.keys, query)
+        end = bisect.bisect_left(self.keys, query + '\uffff', lo=start)
+        
+        # Tags that start with the query come before those matching a later word
+        ranks = {}
+        for key, rank, name in self.entries[start:end]:
+            order = (not name.startswith(query), rank)
+            if order < ranks.get(name, (True, len(self.names))):
+                ranks[name] = order
+        suggestions = [name for name, order in heapq.nsmallest(limit, ranks.items(), key=lambda item: item[1])]
+        if len(self.results) < MAX_CACHED_QUERIES:
+            self.results[query, limit] = suggestions
+        return suggestions
+
+
+def build_index():
+    tag_counts = dict.fromkeys(COMMON_TAGS, 0)
+    for name, blog_count in Tag.objects.values_list('name', 'blog_count'):
+        tag_counts[name.lower()] = max(blog_count, tag_counts.get(name.lower(), 0))
+    return TagSuggestionIndex(tag_counts)
+
+
+def version_cache():
+    # Shared with the crawl workers, which are the ones changing tags
+    return caches[getattr(settings, 'CRAWLER_TAG_SUGGESTIONS_CACHE', 'default')]
+
+
+def invalidate_index():
+    """
+    Mark the suggestion index stale in every process
+    """
+    version_cache().set(VERSION_KEY, time.time(), None)
+
+
+_index = None
+_index_version = None
+_checked_at = 0
+_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Process-wide suggestion index, rebuilt when another process invalidated it.
+    The shared version is only checked every CRAWLER_TAG_SUGGESTIONS_CHECK_INTERVAL
+    seconds so most keystrokes touch neither the cache nor the database.
+    """
+    global _index, _index_version, _checked_at
+    check_interval = getattr(settings, 'CRAWLER_TAG_SUGGESTIONS_CHECK_INTERVAL', 5)
+    if _index is not None and time.monotonic() - _checked_at < check_interval:
+        return _index
+    
+    with _lock:
+        if _index is not None and time.monotonic() - _checked_at < check_interval:
+            return _index
+        version = version_cache().get(VERSION_KEY)
+        if _index is None or version != _index_version:
+            _index = build_index()
+            _index_version = version
+        _checked_at = time.monotonic()
+    return _index
+
+
+def suggest_tags(query, limit=5):
+    """
+    Tag names matching the query, most used first
+    """
+    return get_index().suggest(query, limit)
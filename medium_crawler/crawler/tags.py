@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import Blog, Tag
+from .page_cache import pages_changed
+from .suggestions import invalidate_index
+
+
+TAG_LIST_KEY = 'tags:list'
+TAG_LIST_TIMEOUT = 60 * 60
+
+
+def tag_cache():
+    return caches[getattr(settings, 'CRAWLER_TAG_SUGGESTIONS_CACHE', 'default')]
+
+
+def refresh_tag_counts(tag_ids=None):
+    """
+    Recount Tag.blog_count from the blog/tag link table in one UPDATE,
+    for the given tags or for all of them
+    """
+    counts = Blog.tags.through.objects.filter(
+        tag_id=OuterRef('id')
+    ).values('tag_id').annotate(count=Count('*')).values('count')
+    tags = Tag.objects.all() if tag_ids is None else Tag.objects.filter(id__in=list(tag_ids))
+    tags.update(blog_count=Coalesce(Subquery(counts), 0))
+    # Other processes must not cache the old counts before this commits
+    transaction.on_commit(tags_changed)
+
+
+def refresh_all_tag_counts_on_commit():
+    """
+    Recount every tag once the current transaction commits. Deleting many
+    blogs in one transaction schedules a single recount.
+    """
+    connection = transaction.get_connection()
+    # run_on_commit is emptied on rollback, so a stale entry never blocks a recount
+    if any(callback[1] is refresh_tag_counts for callback in connection.run_on_commit):
+        return
+    transaction.on_commit(refresh_tag_counts)
+
+
+def tags_changed():
+    """
+    Drop the cached tag list, the tag suggestion index and the cached pages
+    showing tags
+    """
+    tag_cache().delete(TAG_LIST_KEY)
+    invalidate_index()
+    pages_changed()
+
+
+def tag_list():
+    """
+    [(name, blog_count)] of every tag in name order, cached until tags change
+    """
+    tags = tag_cache().get(TAG_LIST_KEY)
+    if tags is None:
+        tags = list(Tag.objects.order_by('name').values_list('name', 'blog_count'))
+        tag_cache().set(TAG_LIST_KEY, tags, TAG_LIST_TIMEOUT)
+    return tags
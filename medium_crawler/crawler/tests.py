@@ -1,3 +1,1095 @@
-from django.test import TestCase
-
-# Create your tests here.
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+from email.utils import format_datetime
+from importlib import import_module
+from unittest import mock, skipUnless
+import httpx
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.forms.models import model_to_dict
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from .admin import BlogAdminForm
+from .async_services import AsyncMediumCrawler
+from .benchmark import article_page, feed_xml
+from .jobs import claim_next_job, enqueue_crawl, heartbeat, requeue_stale_jobs
+from .http_cache import HttpCache
+from .fetching import CircuitBreaker, HostRateLimiter, TokenBucket, backoff_delay, parse_retry_after
+from .dedup import canonical_url, find_near_duplicates, fingerprint, hamming, simhash
+from .metrics import CrawlMetrics, record_totals
+from .models import Author, Blog, BlogAlias, CrawlMetricTotal, CrawlStatus, RelatedBlog, SearchHistory, Tag, TagSchedule
+from .page_cache import pages_changed
+from .pagination import encode_cursor
+from .related import collect_related_changes, rebuild_related, refresh_related
+from .scheduling import record_polls, sync_schedules
+from .search import search_blogs, search_index_available
+from . import suggestions
+from .services import MediumCrawler, filter_known_articles, parse_article_html, parse_feed, save_articles_data
+from .suggestions import suggest_tags
+from .tags import tag_list
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked on SQLite')
+class QueryPlanTests(TestCase):
+    """
+    The hot views and the job queue must be served by the indexes from
+    migration 0005 rather than by full table scans.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='author')
+        tag = Tag.objects.create(name='python')
+        for i in range(30):
+            blog = Blog.objects.create(
+                title=f'Blog {i}', content='content', author=author,
+                medium_url=f'https://medium.com/p/{i}'
+            )
+            blog.tags.add(tag)
+        for i in range(30):
+            SearchHistory.objects.create(tag_searched='python', results_count=i, crawl_duration=1.0)
+        CrawlStatus.objects.create(tag='python', status='completed')
+    
+    def query_plans(self, func):
+        """
+        Run func and return the EXPLAIN QUERY PLAN lines of every query it made
+        """
+        # A cached page would make no queries at all
+        pages_changed()
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if not query['sql'].startswith('SELECT'):
+                    continue
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plans.extend(row[-1] for row in cursor.fetchall())
+        return plans
+    
+    def assertUsesIndex(self, plans, index_name):
+        self.assertTrue(
+            any(index_name in line for line in plans),
+            f"{index_name} not used in:\n" + '\n'.join(plans)
+        )
+    
+    def assertNoFullScan(self, plans, table):
+        full_scans = [line for line in plans if re.match(rf'SCAN {table}$', line)]
+        self.assertEqual(full_scans, [], '\n'.join(plans))
+    
+    def test_crawl_progress_api(self):
+        url = reverse('crawler:crawl_progress_api', args=['python'])
+        plans = self.query_plans(lambda: self.client.get(url))
+        self.assertUsesIndex(plans, 'crawler_crawl_tag_started')
+        self.assertUsesIndex(plans, 'crawler_tag_name_lower')
+        self.assertNoFullScan(plans, 'crawler_blog')
+        self.assertNoFullScan(plans, 'crawler_crawlstatus')
+    
+    def test_blog_list_pages(self):
+        url = reverse('crawler:blog_list')
+        response = self.client.get(url)
+        next_url = url + response.context['next_url']
+        
+        for page_url in (url, next_url):
+            plans = self.query_plans(lambda: self.client.get(page_url))
+            self.assertUsesIndex(plans, 'crawler_blog_published')
+            self.assertNoFullScan(plans, 'crawler_blog')
+    
+    def test_blog_list_tag_filter(self):
+        url = reverse('crawler:blog_list')
+        plans = self.query_plans(lambda: self.client.get(url, {'tag': 'PYTHON'}))
+        self.assertUsesIndex(plans, 'crawler_tag_name_lower')
+        self.assertNoFullScan(plans, 'crawler_tag')
+    
+    def test_search_history(self):
+        url = reverse('crawler:search_history')
+        plans = self.query_plans(lambda: self.client.get(url))
+        self.assertUsesIndex(plans, 'crawler_search_time')
+        self.assertNoFullScan(plans, 'crawler_searchhistory')
+    
+    def test_claim_next_job(self):
+        CrawlStatus.objects.create(tag='django', status='pending')
+        plans = self.query_plans(claim_next_job)
+        self.assertUsesIndex(plans, 'crawler_crawl_status_started')
+        self.assertNoFullScan(plans, 'crawler_crawlstatus')
+
+
+def article_text(seed, words=120):
+    return ' '.join(f'word{(seed * 7919 + i * 104729) % 1009}' for i in range(words))
+
+
+class DedupTests(TestCase):
+    """
+    A story is stored once, whatever URL it is found under and when its
+    content is syndicated under another URL.
+    """
+    
+    def test_canonical_url(self):
+        for url in (
+            'https://medium.com/@someone/my-story-1a2b3c4d5e6f?source=rss----1',
+            'https://blog.example.com/my-story-1a2b3c4d5e6f/',
+            'https://medium.com/some-publication/my-story-1a2b3c4d5e6f#comments',
+            'https://medium.com/p/1a2b3c4d5e6f',
+        ):
+            self.assertEqual(canonical_url(url), 'https://medium.com/p/1a2b3c4d5e6f', url)
+        self.assertEqual(canonical_url('http://Example.com/about/?ref=1'), 'https://example.com/about')
+        # Without a digit the end of a path is a word, not a post id
+        self.assertEqual(canonical_url('https://medium.com/tag/deadbeefcafe'), 'https://medium.com/tag/deadbeefcafe')
+    
+    def test_simhash(self):
+        text = article_text(1)
+        self.assertIsNone(simhash('too short to fingerprint'))
+        self.assertEqual(simhash(text), simhash(text.upper()))
+        edited = text.replace('word', 'term', 1)
+        self.assertLessEqual(hamming(simhash(text), simhash(edited)), 6)
+        self.assertGreater(hamming(simhash(text), simhash(article_text(2))), 12)
+    
+    def test_find_near_duplicates(self):
+        author = Author.objects.create(name='author')
+        stored = simhash(article_text(1))
+        blog = Blog.objects.create(title='Original', author=author, medium_url='https://medium.com/p/1')
+        fingerprint(blog.id, stored).save()
+        
+        # Six bits off with no band left intact, so only the one-bit probes find it
+        near = stored ^ 0b11 ^ (0b11 << 16) ^ (1 << 32) ^ (1 << 48)
+        far = stored ^ 0xFFFF00FF
+        self.assertEqual(
+            find_near_duplicates({'near': near, 'far': far, 'short': None}), {'near': blog.id}
+        )
+        with self.settings(CRAWLER_NEAR_DUPLICATE_DISTANCE=None):
+            self.assertEqual(find_near_duplicates({'near': near}), {})
+    
+    def test_copies_become_aliases(self):
+        original = {
+            'url': 'https://medium.com/p/1a2b3c4d5e6f', 'title': 'Original', 'author': 'author',
+            'content': article_text(1), 'tags': ['python'],
+        }
+        copy = dict(original, url='https://example.com/syndicated', tags=['django'])
+        twin = dict(original, url='https://example.com/twin', tags=['flask'])
+        with self.captureOnCommitCallbacks(execute=True):
+            saved = save_articles_data([original, twin])
+            self.assertEqual(len(saved), 1)
+            self.assertEqual(save_articles_data([copy]), [])
+        
+        blog = Blog.objects.get()
+        self.assertEqual(set(blog.tags.values_list('name', flat=True)), {'python', 'django', 'flask'})
+        self.assertEqual(
+            dict(BlogAlias.objects.values_list('url', 'blog_id')),
+            {'https://example.com/syndicated': blog.id, 'https://example.com/twin': blog.id}
+        )
+        # Aliased URLs are known, so they are not fetched again
+        self.assertEqual(filter_known_articles([dict(copy), dict(twin)]), [])
+
+
+class SaveArticlesTests(TestCase):
+    """
+    An article that cannot be saved is logged and does not take the rest
+    of its batch down with it.
+    """
+    
+    def test_failing_article_is_skipped(self):
+        articles = [
+            {'url': f'https://medium.com/p/{i}', 'title': f'Blog {i}', 'author': 'author', 'tags': ['python']}
+            for i in range(3)
+        ]
+        # Authors must have a name
+        articles[1]['author'] = None
+        with self.assertLogs('crawler.services', 'ERROR') as logs:
+            saved = save_articles_data(articles)
+        
+        self.assertEqual([blog.title for blog in saved], ['Blog 0', 'Blog 2'])
+        self.assertEqual(Blog.objects.count(), 2)
+        self.assertIn('https://medium.com/p/1', logs.output[-1])
+        self.assertIn('Traceback', logs.output[-1])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'The search index is SQLite FTS5')
+class SearchIndexTests(TestCase):
+    """
+    Titles, author names and the compressed blog bodies are all searchable,
+    and stay in step with later writes.
+    """
+    
+    def test_writes_are_indexed(self):
+        self.assertTrue(search_index_available())
+        author = Author.objects.create(name='Ada Lovelace')
+        blog = Blog.objects.create(title='Analytical engines', author=author, medium_url='https://medium.com/p/1')
+        blog.content = 'notes on the difference engine'
+        blog.save()
+        self.assertEqual([blog_id for blog_id, snippet in search_blogs('difference')], [blog.id])
+        self.assertEqual([blog_id for blog_id, snippet in search_blogs('lovelace analytical')], [blog.id])
+        
+        blog.content = 'a note on bernoulli numbers'
+        blog.save()
+        Author.objects.filter(id=author.id).update(name='Augusta King')
+        self.assertEqual(search_blogs('difference'), [])
+        self.assertEqual([blog_id for blog_id, snippet in search_blogs('bernoulli augusta')], [blog.id])
+        
+        blog.delete()
+        self.assertEqual(search_blogs('bernoulli'), [])
+
+class BlogAdminTests(TestCase):
+    """
+    The blog text, stored compressed in BlogBody, can be read and edited in
+    the admin.
+    """
+    
+    def test_content_is_shown_and_saved(self):
+        author = Author.objects.create(name='author')
+        blog = Blog.objects.create(title='Engines', author=author, medium_url='https://medium.com/p/1')
+        blog.content = 'notes on the difference engine'
+        blog.save()
+        blog.tags.add(Tag.objects.create(name='history'))
+        
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        response = self.client.get(reverse('admin:crawler_blog_change', args=[blog.id]))
+        self.assertContains(response, 'notes on the difference engine')
+        
+        form = BlogAdminForm(
+            data=dict(model_to_dict(blog), content='a note on bernoulli numbers'), instance=blog
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertEqual(Blog.objects.get(id=blog.id).content, 'a note on bernoulli numbers')
+
+
+@override_settings(CRAWLER_RELATED_PER_BLOG=2)
+class RelatedTests(TestCase):
+    """
+    Refreshing the blogs whose tags changed gives the same lists as a full
+    rebuild, also where a score dropped.
+    """
+    
+    def related_lists(self):
+        lists = {}
+        for blog_id, related_id, score in RelatedBlog.objects.order_by('blog_id', '-score', '-related_id').values_list(
+            'blog_id', 'related_id', 'score'
+        ):
+            lists.setdefault(blog_id, []).append((round(score, 6), related_id))
+        return lists
+    
+    def create_blogs(self):
+        author = Author.objects.create(name='author')
+        tags = [Tag.objects.create(name=f'tag{i}') for i in range(7)]
+        tag_sets = [(0, 1), (0, 1), (0, 1, 2), (0, 3), (3, 4), (2, 4, 5), (5,)]
+        blogs = []
+        for i, tag_set in enumerate(tag_sets):
+            blog = Blog.objects.create(title=f'Blog {i}', author=author, medium_url=f'https://medium.com/p/{i}')
+            blog.tags.set([tags[tag] for tag in tag_set])
+            blogs.append(blog)
+        return author, tags, blogs
+    
+    def test_refresh_matches_rebuild(self):
+        author, tags, blogs = self.create_blogs()
+        rebuild_related()
+        
+        # Blog 1 drifts away from blog 0, which listed it first and now lists
+        # blog 3 instead, and a new blog joins
+        blogs[1].tags.add(*tags[2:])
+        blog = Blog.objects.create(title='New', author=author, medium_url='https://medium.com/p/new')
+        blog.tags.set([tags[4], tags[6]])
+        refresh_related([blogs[1].id, blog.id])
+        refreshed = self.related_lists()
+        
+        rebuild_related()
+        self.assertEqual(refreshed, self.related_lists())
+    
+    def test_migration_fills_related(self):
+        self.create_blogs()
+        import_module('crawler.migrations.0006_related_blog').fill_related(apps, None)
+        filled = self.related_lists()
+        
+        rebuild_related()
+        self.assertTrue(filled)
+        self.assertEqual(filled, self.related_lists())
+    
+    def test_crawl_refreshes_once(self):
+        articles = [
+            {'url': f'https://medium.com/p/{i}', 'title': f'Blog {i}', 'author': 'author', 'tags': ['python']}
+            for i in range(4)
+        ]
+        with collect_related_changes() as changed, self.captureOnCommitCallbacks(execute=True):
+            save_articles_data(articles[:2])
+            save_articles_data(articles[2:])
+        self.assertFalse(RelatedBlog.objects.exists())
+        self.assertEqual(changed, set(Blog.objects.values_list('id', flat=True)))
+        
+        refresh_related(changed)
+        self.assertEqual(RelatedBlog.objects.count(), 4 * 2)
+    
+    def test_detail_falls_back_to_shared_tags(self):
+        author, tags, blogs = self.create_blogs()
+        Blog.objects.create(title='Newest', author=author, medium_url='https://medium.com/p/newest')
+        pages_changed()
+        response = self.client.get(reverse('crawler:blog_detail', args=[blogs[0].id]))
+        self.assertEqual([blog.id for blog in response.context['related_blogs']], [blogs[2].id, blogs[1].id, blogs[3].id])
+
+
+class JobQueueTests(TestCase):
+    """
+    A tag is queued at most once, and only jobs a worker claimed long ago
+    count as stale.
+    """
+    
+    def test_enqueue_reuses_pending_job(self):
+        job = enqueue_crawl('python')
+        self.assertEqual(enqueue_crawl('python'), job)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CrawlStatus.objects.create(tag='python', status='pending')
+        
+        self.assertEqual(claim_next_job(), job)
+        self.assertNotEqual(enqueue_crawl('python'), job)
+    
+    def test_requeue_stale_jobs(self):
+        long_ago = timezone.now() - timedelta(hours=2)
+        # Queued long ago but only just claimed
+        running = enqueue_crawl('running')
+        CrawlStatus.objects.filter(id=running.id).update(started_at=long_ago)
+        claim_next_job()
+        abandoned = enqueue_crawl('abandoned')
+        claim_next_job()
+        CrawlStatus.objects.filter(id=abandoned.id).update(claimed_at=long_ago)
+        requeued_again = enqueue_crawl('abandoned')
+        
+        self.assertEqual(requeue_stale_jobs(3600), 0)
+        self.assertEqual(CrawlStatus.objects.get(id=abandoned.id).status, 'failed')
+        self.assertEqual(CrawlStatus.objects.get(id=running.id).status, 'in_progress')
+        
+        CrawlStatus.objects.filter(id=running.id).update(claimed_at=long_ago)
+        self.assertEqual(requeue_stale_jobs(3600), 1)
+        self.assertEqual(CrawlStatus.objects.get(id=running.id).status, 'pending')
+        self.assertEqual(CrawlStatus.objects.get(id=requeued_again.id).status, 'pending')
+
+
+class JobHeartbeatTests(TransactionTestCase):
+    """
+    A crawl that runs longer than --stale-after is not requeued while its
+    worker is alive. The heartbeat writes from its own thread, so this cannot
+    run inside a test transaction.
+    """
+    
+    @override_settings(CRAWLER_JOB_HEARTBEAT=0.05)
+    def test_heartbeat_keeps_running_job_claimed(self):
+        long_ago = timezone.now() - timedelta(hours=2)
+        job = enqueue_crawl('slow')
+        claim_next_job()
+        CrawlStatus.objects.filter(id=job.id).update(claimed_at=long_ago)
+        
+        with heartbeat([job.id]):
+            deadline = time.monotonic() + 5
+            while CrawlStatus.objects.get(id=job.id).claimed_at == long_ago and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(requeue_stale_jobs(3600), 0)
+        self.assertEqual(CrawlStatus.objects.get(id=job.id).status, 'in_progress')
+        
+        CrawlStatus.objects.filter(id=job.id).update(claimed_at=long_ago)
+        time.sleep(0.2)
+        self.assertEqual(requeue_stale_jobs(3600), 1)
+
+
+class AsyncCrawlerTests(TestCase):
+    """
+    AsyncMediumCrawler against a mock transport: articles are saved, throttled
+    requests are retried and a feed that keeps failing fails the job.
+    """
+    
+    def crawl(self, handler, tag_name='python'):
+        async def run():
+            async with AsyncMediumCrawler(
+                rate_limit=1000, use_cache=False, transport=httpx.MockTransport(handler)
+            ) as crawler:
+                return await crawler.crawl_tag_articles(tag_name, limit=3, blog_callback=saved.extend)
+        
+        saved = []
+        count = async_to_sync(run)()
+        self.assertEqual(count, len(saved))
+        return count, CrawlStatus.objects.get(tag=tag_name)
+    
+    def medium(self, request):
+        path = request.url.path
+        if path.startswith('/feed/tag/'):
+            return httpx.Response(200, content=feed_xml(path[len('/feed/tag/'):], 3))
+        return httpx.Response(200, content=article_page(path.rsplit('/', 1)[-1]))
+    
+    def test_crawl_saves_articles(self):
+        count, job = self.crawl(self.medium)
+        
+        self.assertEqual(count, 3)
+        self.assertEqual(Blog.objects.filter(tags__name='python').count(), 3)
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.blogs_found, 3)
+        self.assertEqual(job.metrics['counters']['requests'], 4)
+        self.assertTrue(SearchHistory.objects.filter(tag_searched='python', results_count=3).exists())
+    
+    def test_batches_flush_by_size_and_time(self):
+        for interval, batches in ((60, 1), (0, 3)):
+            saved_batches = []
+            
+            async def run():
+                async with AsyncMediumCrawler(
+                    rate_limit=1000, use_cache=False, transport=httpx.MockTransport(self.medium)
+                ) as crawler:
+                    return await crawler.crawl_tag_articles(f'tag{interval}', limit=3, blog_callback=saved_batches.append)
+            
+            with self.settings(CRAWLER_SAVE_BATCH_SIZE=100, CRAWLER_SAVE_BATCH_INTERVAL=interval):
+                self.assertEqual(async_to_sync(run)(), 3)
+            self.assertEqual(len(saved_batches), batches)
+    
+    def test_throttled_request_is_retried(self):
+        throttled = []
+        
+        def handler(request):
+            if request.url.path.startswith('/p/') and not throttled:
+                throttled.append(request.url.path)
+                return httpx.Response(429, headers={'Retry-After': '0'})
+            return self.medium(request)
+        
+        count, job = self.crawl(handler)
+        self.assertEqual(count, 3)
+        self.assertEqual(job.metrics['counters']['retries'], 1)
+    
+    @override_settings(CRAWLER_MAX_RETRIES=1, CRAWLER_RETRY_BACKOFF=0)
+    def test_failing_feed_fails_job(self):
+        count, job = self.crawl(lambda request: httpx.Response(503))
+        
+        self.assertEqual(count, 0)
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('HTTP 503', job.error_message)
+        self.assertEqual(job.metrics['counters']['requests'], 2)
+        self.assertFalse(SearchHistory.objects.exists())
+
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"
+     xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>
+<title>Python on Medium</title>
+<item>
+    <title><![CDATA[My &amp; story]]></title>
+    <link>https://medium.com/@jane/my-story-1a2b3c4d5e6f?source=rss----tag_python</link>
+    <dc:creator><![CDATA[Jane &amp; Co]]></dc:creator>
+    <pubDate>Wed, 21 Oct 2015 07:28:00 GMT</pubDate>
+    <content:encoded><![CDATA[<p>Fish &amp; <b>chips</b></p>]]></content:encoded>
+</item>
+<item>
+    <title>No date</title>
+    <guid>https://medium.com/p/0abcdef12345</guid>
+</item>
+<item>
+    <title>No link</title>
+</item>
+<item>
+    <title>Cut off"""
+
+
+class FeedParsingTests(SimpleTestCase):
+    """
+    Feed items become article dicts: CDATA text is decoded, missing fields
+    get defaults and a broken feed gives what could be read.
+    """
+    
+    def test_parse_feed(self):
+        first, second = parse_feed(FEED, 'python')
+        self.assertEqual(first['url'], 'https://medium.com/p/1a2b3c4d5e6f')
+        self.assertEqual(first['title'], 'My & story')
+        self.assertEqual(first['author'], 'Jane & Co')
+        self.assertEqual(first['content'], 'Fish & chips')
+        self.assertEqual(first['published_date'], datetime(2015, 10, 21, 7, 28, tzinfo=dt_timezone.utc))
+        self.assertEqual(first['tags'], ['python'])
+        
+        self.assertEqual(second['url'], 'https://medium.com/p/0abcdef12345')
+        self.assertEqual(second['author'], 'Unknown Author')
+        self.assertIsNone(second['published_date'])
+    
+    def test_limit(self):
+        self.assertEqual([article['title'] for article in parse_feed(FEED, 'python', limit=1)], ['My & story'])
+        self.assertEqual(parse_feed(FEED, 'python', limit=0), [])
+    
+    def test_malformed_feeds(self):
+        for xml in (b'', b'not a feed', b'<rss><channel><item><title>x</title'):
+            self.assertEqual(parse_feed(xml, 'python'), [], xml)
+        # External entities are not resolved
+        article, = parse_feed(
+            b'<!DOCTYPE rss [<!ENTITY x SYSTEM "file:///etc/passwd">]><rss><channel>'
+            b'<item><title>&x;</title><link>https://medium.com/p/1</link></item></channel></rss>', 'python'
+        )
+        self.assertNotIn('root', article['title'])
+
+
+class ArticleParsingTests(SimpleTestCase):
+    """
+    Reading time and claps are found however the page splits them over
+    inline elements, and never in scripts.
+    """
+    
+    def test_parse_article_html(self):
+        article = parse_article_html(
+            b'<html><head><script>var stats = "99 claps"</script></head><body><article>'
+            b'<h1>Title</h1><div><span>5</span> <span>min read</span></div>'
+            b'<p>Some <b>bold</b> text</p><!-- 3 min read -->'
+            b'<div><button><span>12</span></button> claps</div>'
+            b'</article></body></html>'
+        )
+        self.assertEqual(article['content'], 'Title\n\nSome bold text')
+        self.assertEqual(article['reading_time'], '5 min read')
+        self.assertEqual(article['claps_count'], 12)
+    
+    def test_lines_do_not_run_together(self):
+        article = parse_article_html(b'<div><p>Chapter 5</p><p>min read</p><p>42</p>claps</div>')
+        self.assertEqual(article['reading_time'], 'Unknown')
+        self.assertEqual(article['claps_count'], 0)
+        self.assertEqual(parse_article_html(b'')['reading_time'], 'Unknown')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FetchingTests(SimpleTestCase):
+    """
+    Rate limiting and circuit breaking on a fake clock, and Retry-After
+    given in seconds or as an HTTP date.
+    """
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('crawler.fetching.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_token_bucket_refills(self):
+        bucket = TokenBucket(rate=2, capacity=2)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.5])
+        
+        # Refills at `rate` per second, up to `capacity`
+        self.clock.sleep(1)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.clock.sleep(60)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.5])
+        
+        # A throttled response holds every caller back
+        self.clock.sleep(60)
+        bucket.pause(3)
+        self.assertEqual(bucket.reserve(), 3.5)
+        # The next caller queues behind that one
+        start = self.clock.now
+        bucket.acquire()
+        self.assertEqual(self.clock.now - start, 4.0)
+    
+    def test_hosts_have_their_own_buckets(self):
+        limiter = HostRateLimiter(rate=1, capacity=1)
+        self.assertEqual(limiter.reserve('https://medium.com/a'), 0.0)
+        self.assertEqual(limiter.reserve('https://MEDIUM.com/b'), 1.0)
+        self.assertEqual(limiter.reserve('https://example.com/a'), 0.0)
+    
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(threshold=2, reset_timeout=10)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        
+        # Half-open: one trial request after the reset timeout
+        self.clock.sleep(10)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        # A failed trial opens the circuit again at once
+        breaker.record_failure()
+        self.clock.sleep(9)
+        self.assertFalse(breaker.allow())
+        
+        # A successful trial closes it
+        self.clock.sleep(1)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+    
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertEqual(parse_retry_after(' 0 '), 0.0)
+        in_two_minutes = format_datetime(datetime.now(dt_timezone.utc) + timedelta(minutes=2), usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(in_two_minutes), 120, delta=2)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        for value in (None, '', 'soon', '-5'):
+            self.assertIsNone(parse_retry_after(value), value)
+    
+    def test_backoff_delay_is_capped(self):
+        for attempt in range(10):
+            self.assertLessEqual(backoff_delay(attempt, 0.5, 4), min(4, 0.5 * 2 ** attempt))
+
+
+class CrawlMetricsTests(TestCase):
+    """
+    Crawl metrics add up across threads and crawls, and /metrics serves the
+    totals in the Prometheus text exposition format.
+    """
+    
+    def test_accumulation(self):
+        metrics = CrawlMetrics()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: metrics.incr('bytes_downloaded', 10), range(1000)))
+        with mock.patch('crawler.metrics.time.perf_counter', side_effect=[1.0, 1.25]):
+            with metrics.stage('article_fetch'):
+                pass
+        metrics.add_time('article_fetch', 0.5)
+        with connection.execute_wrapper(metrics.count_queries):
+            Tag.objects.count()
+            Tag.objects.exists()
+        
+        stats = metrics.as_dict()
+        self.assertEqual(stats['stages']['article_fetch'], {'seconds': 0.75, 'calls': 2})
+        self.assertEqual(stats['stages']['db_save'], {'seconds': 0.0, 'calls': 0})
+        self.assertEqual(stats['counters']['bytes_downloaded'], 10000)
+        self.assertEqual(stats['counters']['db_queries'], 2)
+        self.assertEqual(stats['counters']['requests'], 0)
+        
+        # Totals keep adding up over crawls
+        record_totals(stats)
+        record_totals(stats, crawls=2)
+        totals = dict(CrawlMetricTotal.objects.values_list('name', 'value'))
+        self.assertEqual(totals['crawls'], 3)
+        self.assertEqual(totals['stage_seconds:article_fetch'], 1.5)
+        self.assertEqual(totals['stage_calls:article_fetch'], 4)
+        self.assertEqual(totals['counter:bytes_downloaded'], 20000)
+        self.assertEqual(totals['counter:requests'], 0)
+    
+    def test_prometheus_exposition(self):
+        metrics = CrawlMetrics()
+        metrics.add_time('feed_fetch', 0.125)
+        metrics.incr('requests', 3)
+        record_totals(metrics.as_dict())
+        CrawlStatus.objects.create(tag='python', status='pending')
+        CrawlStatus.objects.create(tag='django', status='pending')
+        
+        response = self.client.get(reverse('crawler:metrics'))
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        lines = response.content.decode().splitlines()
+        for expected in [
+            '# HELP crawler_crawls_total Crawls finished, failed ones included',
+            '# TYPE crawler_crawls_total counter',
+            'crawler_crawls_total 1',
+            'crawler_stage_seconds_total{stage="feed_fetch"} 0.125',
+            'crawler_stage_seconds_total{stage="db_save"} 0.0',
+            'crawler_stage_calls_total{stage="feed_fetch"} 1',
+            'crawler_requests_total 3',
+            'crawler_cache_hits_total 0',
+            '# TYPE crawler_jobs gauge',
+            'crawler_jobs{status="pending"} 2',
+            'crawler_jobs{status="failed"} 0',
+        ]:
+            self.assertIn(expected, lines)
+        
+        # Every sample follows the HELP and TYPE lines of its metric
+        sample_re = re.compile(r'^([a-z_]+)(\{[a-z_]+="[a-z_]+"\})? -?\d+(\.\d+)?$')
+        declared = None
+        for line in lines:
+            if line.startswith('# HELP '):
+                declared = None
+                help_name = line.split()[2]
+            elif line.startswith('# TYPE '):
+                self.assertEqual(line.split()[2], help_name)
+                self.assertIn(line.split()[3], ('counter', 'gauge'))
+                declared = help_name
+            else:
+                match = sample_re.match(line)
+                self.assertIsNotNone(match, line)
+                self.assertEqual(match.group(1), declared)
+
+
+class TagCountTests(TestCase):
+    """
+    Tag.blog_count follows links added and removed from either side, and
+    blogs being deleted.
+    """
+    
+    def setUp(self):
+        author = Author.objects.create(name='author')
+        self.python, self.django = Tag.objects.create(name='python'), Tag.objects.create(name='django')
+        self.blogs = [
+            Blog.objects.create(
+                title=f'Blog {i}', content='content', author=author, medium_url=f'https://medium.com/p/{i}'
+            )
+            for i in range(3)
+        ]
+    
+    def assertCounts(self, python, django):
+        self.assertEqual(
+            dict(Tag.objects.values_list('name', 'blog_count')), {'python': python, 'django': django}
+        )
+    
+    def test_link_and_unlink(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for blog in self.blogs:
+                blog.tags.add(self.python)
+            self.django.blogs.add(*self.blogs[:2])
+        self.assertCounts(3, 2)
+        # The cached tag list is dropped along with the old counts
+        self.assertEqual(tag_list(), [('django', 2), ('python', 3)])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blogs[0].tags.remove(self.python)
+            self.django.blogs.remove(self.blogs[1])
+        self.assertCounts(2, 1)
+        self.assertEqual(tag_list(), [('django', 1), ('python', 2)])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blogs[0].tags.clear()
+            self.python.blogs.clear()
+        self.assertCounts(0, 0)
+    
+    def test_delete(self):
+        for blog in self.blogs:
+            blog.tags.add(self.python, self.django)
+        
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.blogs[0].delete()
+            Blog.objects.filter(id__in=[blog.id for blog in self.blogs[1:]]).delete()
+        self.assertCounts(0, 0)
+        # Deleting many blogs schedules one recount
+        self.assertEqual(len([callback for callback in callbacks if callback.__name__ == 'refresh_tag_counts']), 1)
+        
+        Blog.objects.create(
+            title='Blog 3', content='content', author=Author.objects.get(), medium_url='https://medium.com/p/3'
+        ).tags.add(self.django)
+        self.assertCounts(0, 1)
+
+
+@override_settings(CRAWLER_TAG_SUGGESTIONS_CHECK_INTERVAL=0)
+class TagSuggestionTests(TestCase):
+    """
+    Suggestions match the start of any word of a tag, most used first, and
+    new tags show up once a crawl saves them.
+    """
+    
+    def setUp(self):
+        # Start every test from an empty process-wide index
+        patcher = mock.patch.object(suggestions, '_index', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_suggestions(self):
+        Tag.objects.create(name='pytorch', blog_count=5)
+        Tag.objects.create(name='learn-python', blog_count=9)
+        
+        # Tags starting with the query come first, then by blog count
+        self.assertEqual(suggest_tags('py'), ['pytorch', 'python', 'learn-python'])
+        self.assertEqual(suggest_tags(' LEARN '), ['learn-python', 'machine-learning'])
+        self.assertEqual(suggest_tags('py', limit=1), ['pytorch'])
+        self.assertEqual(suggest_tags('zzz'), [])
+        self.assertEqual(suggest_tags(''), [])
+        
+        response = self.client.get(reverse('crawler:tag_suggestions_api'), {'q': 'pyto'})
+        self.assertEqual(response.json(), {'suggestions': ['pytorch']})
+        self.assertEqual(self.client.get(reverse('crawler:tag_suggestions_api'), {'q': 'p'}).json(), {'suggestions': []})
+    
+    def test_new_tags_invalidate_the_index(self):
+        self.assertEqual(suggest_tags('rust'), [])
+        
+        articles = [
+            {'url': f'https://medium.com/p/rust-{i}', 'title': f'Rust {i}', 'author': 'author', 'tags': tags}
+            for i, tags in enumerate([['rustlang'], ['rustlang', 'rust-embedded']])
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            save_articles_data(articles)
+        self.assertEqual(suggest_tags('rust'), ['rustlang', 'rust-embedded'])
+        
+        # Blog counts feed the ranking too
+        with self.captureOnCommitCallbacks(execute=True):
+            save_articles_data([
+                {'url': f'https://medium.com/p/embedded-{i}', 'title': f'Embedded {i}', 'author': 'author',
+                 'tags': ['rust-embedded']}
+                for i in range(2)
+            ])
+        self.assertEqual(suggest_tags('rust'), ['rust-embedded', 'rustlang'])
+
+
+class StubResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class StubSession:
+    """
+    Stands in for requests.Session, answering with the queued responses and
+    recording the headers of every request
+    """
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+    
+    def get(self, url, timeout=None, headers=None):
+        self.sent_headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+class HttpCacheTests(SimpleTestCase):
+    """
+    Conditional requests from cached validators, and cached bodies reused on
+    304 Not Modified.
+    """
+    
+    url = 'https://medium.com/@writer/cached-article-1'
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.crawler = MediumCrawler(use_cache=False)
+        # TTL 0: every lookup goes back to the server to revalidate
+        self.crawler.http_cache = HttpCache(directory.name, ttl=0)
+    
+    def test_revalidates_with_etag_and_reuses_body_on_304(self):
+        self.crawler.session = StubSession(
+            StubResponse(200, b'<html>first</html>', {
+                'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT', 'Content-Type': 'text/html'
+            }),
+            StubResponse(304, headers={'ETag': '"v2"'}),
+            StubResponse(304),
+        )
+        
+        self.assertEqual(self.crawler._get(self.url).content, b'<html>first</html>')
+        response = self.crawler._get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'<html>first</html>')
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.headers, {'Content-Type': 'text/html'})
+        # The validator from the 304 replaces the stored one
+        self.crawler._get(self.url)
+        
+        self.assertEqual(self.crawler.session.sent_headers, [
+            {},
+            {'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'},
+            {'If-None-Match': '"v2"', 'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'},
+        ])
+        self.assertEqual(self.crawler.metrics.counters['cache_hits'], 2)
+    
+    def test_last_modified_only_and_changed_body(self):
+        self.crawler.session = StubSession(
+            StubResponse(200, b'old', {'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}),
+            StubResponse(200, b'new', {'Last-Modified': 'Thu, 22 Oct 2015 07:28:00 GMT'}),
+            StubResponse(304),
+        )
+        
+        self.crawler._get(self.url)
+        self.assertEqual(self.crawler._get(self.url).content, b'new')
+        # A changed body replaces the cached one
+        self.assertEqual(self.crawler._get(self.url).content, b'new')
+        self.assertEqual(self.crawler.session.sent_headers[1:], [
+            {'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'},
+            {'If-Modified-Since': 'Thu, 22 Oct 2015 07:28:00 GMT'},
+        ])
+    
+    def test_fresh_entries_skip_the_request(self):
+        self.crawler.http_cache.ttl = 300
+        self.crawler.session = StubSession(StubResponse(200, b'body', {'ETag': '"v1"'}))
+        
+        self.crawler._get(self.url)
+        self.assertEqual(self.crawler._get(self.url).content, b'body')
+        self.assertEqual(len(self.crawler.session.sent_headers), 1)
+    
+    def test_refetches_when_the_body_is_gone(self):
+        self.crawler.session = StubSession(
+            StubResponse(200, b'body', {'ETag': '"v1"'}),
+            StubResponse(304),
+            StubResponse(200, b'body again', {'ETag': '"v1"'}),
+        )
+        
+        self.crawler._get(self.url)
+        meta_path, body_path = self.crawler.http_cache._paths(self.url)
+        meta = self.crawler.http_cache.lookup(self.url)
+        # Evicted between the lookup and the 304
+        with mock.patch.object(self.crawler.http_cache, 'lookup', return_value=meta):
+            os.remove(body_path)
+            self.assertEqual(self.crawler._get(self.url).content, b'body again')
+        self.assertEqual(self.crawler.session.sent_headers[2], {})
+
+
+class SchedulingTests(TestCase):
+    """
+    Failed polls do not back a tag off, and new tags are picked up without
+    rereading what earlier rounds saw.
+    """
+    
+    def test_failed_polls_keep_interval(self):
+        schedules = [
+            TagSchedule.objects.create(tag=tag_name, interval=6 * 60 * 60, next_due_at=timezone.now())
+            for tag_name in ('quiet', 'broken', 'down')
+        ]
+        with self.settings(CRAWLER_SCHEDULE_MIN_INTERVAL=15 * 60):
+            record_polls(schedules, {'quiet': 0, 'broken': 0}, 10, failed={'broken'})
+        
+        quiet, broken, down = [TagSchedule.objects.get(tag=tag_name) for tag_name in ('quiet', 'broken', 'down')]
+        self.assertEqual(quiet.interval, 12 * 60 * 60)
+        self.assertEqual(quiet.empty_streak, 1)
+        for schedule in (broken, down):
+            self.assertEqual(schedule.interval, 6 * 60 * 60)
+            self.assertEqual(schedule.empty_streak, 0)
+            self.assertLess(schedule.next_due_at, timezone.now() + timedelta(minutes=16))
+    
+    def test_sync_schedules_reads_new_rows_only(self):
+        SearchHistory.objects.create(tag_searched='Python', results_count=1, crawl_duration=1.0)
+        created, seen = sync_schedules()
+        self.assertEqual(created, 1)
+        
+        # Searches seen before are not read again
+        TagSchedule.objects.filter(tag='python').delete()
+        Tag.objects.create(name='django')
+        created, seen = sync_schedules(seen)
+        self.assertEqual(created, 1)
+        self.assertEqual(sync_schedules(seen)[0], 0)
+        self.assertEqual(list(TagSchedule.objects.values_list('tag', flat=True)), ['django'])
+
+
+class PaginationTests(TestCase):
+    """
+    Cursors come from the query string, so a malformed one must fall back to
+    the first page rather than fail.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='author')
+        for i in range(25):
+            Blog.objects.create(title=f'Blog {i}', content='content', author=author, medium_url=f'https://medium.com/p/{i}')
+            SearchHistory.objects.create(tag_searched='python', results_count=i, crawl_duration=1.0)
+    
+    def test_tampered_cursors(self):
+        cursors = [
+            encode_cursor({'key': ['x', 'y', 'z']}),
+            encode_cursor({'key': [1, 2, 3]}),
+            encode_cursor({'key': [[1], {'a': 1}, 'z'], 'previous': True}),
+            encode_cursor({'key': 'abc'}),
+            'not a cursor',
+        ]
+        for url, per_page in ((reverse('crawler:blog_list'), 10), (reverse('crawler:search_history'), 20)):
+            # Rendered pages, not cached ones, carry the context
+            pages_changed()
+            first_page = list(self.client.get(url).context['page_obj'])
+            self.assertEqual(len(first_page), per_page)
+            for cursor in cursors:
+                pages_changed()
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 200, cursor)
+                self.assertEqual(list(response.context['page_obj']), first_page, cursor)
+
+
+class PageCacheTests(TestCase):
+    """
+    Blog pages are served from the page cache between crawls and
+    invalidated when a crawl saves blogs.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='author')
+        cls.blog = Blog.objects.create(
+            title='Cached blog', content='content', author=author, medium_url='https://medium.com/p/cached'
+        )
+    
+    def setUp(self):
+        pages_changed()
+    
+    def test_pages_served_from_cache(self):
+        for url in (reverse('crawler:home'), reverse('crawler:blog_list'),
+                    reverse('crawler:blog_detail', args=[self.blog.id])):
+            self.client.get(url)
+            with self.assertNumQueries(0):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'Cached blog')
+    
+    def test_home_form_posts_visitors_own_csrf_token(self):
+        url = reverse('crawler:home')
+        Client(enforce_csrf_checks=True).get(url)
+        
+        client = Client(enforce_csrf_checks=True)
+        page = client.get(url).content.decode()
+        tokens = re.findall(r'name="csrfmiddlewaretoken" value="([^"]+)"', page)
+        self.assertEqual(len(tokens), 1)
+        response = client.post(reverse('crawler:search_tag'), {'tag_name': 'python', 'csrfmiddlewaretoken': tokens[0]})
+        self.assertEqual(response.status_code, 302)
+    
+    def test_etag_revalidation(self):
+        url = reverse('crawler:blog_list')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        
+        self.assertNotEqual(self.client.get(url, {'tag': 'python'})['ETag'], etag)
+    
+    def test_saving_blogs_invalidates_pages(self):
+        url = reverse('crawler:blog_list')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            save_articles_data([{
+                'url': 'https://medium.com/p/new', 'title': 'Freshly crawled', 'author': 'author',
+                'content': 'new content', 'tags': ['python'],
+            }])
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Freshly crawled')
+
+
+@override_settings(CRAWLER_EVENTS_POLL_INTERVAL=0, CRAWLER_EVENTS_STATUS_INTERVAL=0)
+class CrawlEventsStreamTests(TestCase):
+    """
+    The progress stream ends once the crawl is over, including crawls run by
+    crawl_tags or crawl_scheduler, which publish no events.
+    """
+    
+    def stream(self, tag_name):
+        response = self.client.get(reverse('crawler:crawl_events', args=[tag_name]))
+        self.assertTrue(response.streaming)
+        return (chunk.decode() for chunk in response.streaming_content)
+    
+    def test_unknown_tag(self):
+        messages = list(self.stream('nothing'))
+        self.assertEqual(len(messages), 1)
+        self.assertIn('"not_found"', messages[0])
+    
+    def test_finished_crawl(self):
+        CrawlStatus.objects.create(tag='python', status='completed', blogs_found=3)
+        messages = list(self.stream('python'))
+        self.assertEqual(len(messages), 1)
+        self.assertIn('"completed"', messages[0])
+    
+    def test_crawl_without_events(self):
+        crawl_status = CrawlStatus.objects.create(tag='python', status='in_progress')
+        messages = self.stream('python')
+        self.assertIn('"in_progress"', next(messages))
+        
+        CrawlStatus.objects.filter(pk=crawl_status.pk).update(status='completed', blogs_found=3)
+        self.assertIn('"completed"', next(messages))
+        self.assertEqual(list(messages), [])
+    
+    async def test_asgi_stream_sends_events_as_they_happen(self):
+        crawl_status = await CrawlStatus.objects.acreate(tag='python', status='in_progress')
+        response = await self.async_client.get(reverse('crawler:crawl_events', args=['python']))
+        self.assertTrue(response.is_async)
+        messages = aiter(response.streaming_content)
+        self.assertIn('"in_progress"', (await anext(messages)).decode())
+        
+        await CrawlStatus.objects.filter(pk=crawl_status.pk).aupdate(status='completed', blogs_found=3)
+        self.assertIn('"completed"', (await anext(messages)).decode())
+        with self.assertRaises(StopAsyncIteration):
+            await anext(messages)
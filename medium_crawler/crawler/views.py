@@ -1,196 +1,378 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
-from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db.models import Q
-from .models import Blog, Tag, SearchHistory, CrawlStatus
-from .services import MediumCrawler
-from .forms import TagSearchForm
-import json
-import threading
-
-
-def home(request):
-    """Home page with search form and recent blogs"""
-    form = TagSearchForm()
-    recent_blogs = Blog.objects.all()[:10]
-    search_history = SearchHistory.objects.all()[:5]
-    
-    context = {
-        'form': form,
-        'recent_blogs': recent_blogs,
-        'search_history': search_history,
-    }
-    return render(request, 'crawler/home.html', context)
-
-
-def search_tag(request):
-    """Handle tag search and initiate crawling"""
-    if request.method == 'POST':
-        form = TagSearchForm(request.POST)
-        if form.is_valid():
-            tag_name = form.cleaned_data['tag_name'].strip().lower()
-            
-            # Start crawling in background thread
-            crawler = MediumCrawler()
-            
-            # Create a unique identifier for this crawl session
-            crawl_id = f"crawl_{tag_name}_{request.session.session_key}"
-            request.session['current_crawl_id'] = crawl_id
-            
-            # Start background crawling
-            thread = threading.Thread(
-                target=background_crawl,
-                args=(tag_name, crawl_id)
-            )
-            thread.daemon = True
-            thread.start()
-            
-            return redirect('crawler:crawl_status', tag_name=tag_name)
-    
-    return redirect('crawler:home')
-
-
-def background_crawl(tag_name, crawl_id):
-    """Background function to crawl articles"""
-    crawler = MediumCrawler()
-    try:
-        crawler.crawl_tag_articles(tag_name, limit=10)
-    except Exception as e:
-        print(f"Error in background crawl: {str(e)}")
-
-
-def crawl_status(request, tag_name):
-    """Show crawl status page with real-time updates"""
-    context = {
-        'tag_name': tag_name,
-    }
-    return render(request, 'crawler/crawl_status.html', context)
-
-
-def crawl_progress_api(request, tag_name):
-    """API endpoint to get crawl progress"""
-    try:
-        # Get latest crawl status for this tag
-        crawl_status = CrawlStatus.objects.filter(tag=tag_name).first()
-        
-        if not crawl_status:
-            return JsonResponse({
-                'status': 'not_found',
-                'message': 'Crawl not found'
-            })
-        
-        # Get currently crawled blogs for this tag
-        blogs = Blog.objects.filter(
-            tags__name__iexact=tag_name,
-            crawled_at__gte=crawl_status.started_at
-        ).order_by('-crawled_at')
-        
-        blogs_data = []
-        for blog in blogs:
-            blogs_data.append({
-                'title': blog.title,
-                'author': blog.author.name,
-                'summary': blog.summary or blog.content[:200] + '...',
-                'url': blog.medium_url,
-                'published_date': blog.published_date.strftime('%Y-%m-%d') if blog.published_date else 'Unknown',
-                'reading_time': blog.reading_time,
-                'tags': [tag.name for tag in blog.tags.all()],
-            })
-        
-        return JsonResponse({
-            'status': crawl_status.status,
-            'blogs_found': len(blogs_data),
-            'blogs': blogs_data,
-            'total_expected': 10,
-            'completed_at': crawl_status.completed_at.isoformat() if crawl_status.completed_at else None,
-            'error_message': crawl_status.error_message,
-        })
-        
-    except Exception as e:
-        return JsonResponse({
-            'status': 'error',
-            'message': str(e)
-        })
-
-
-def blog_list(request):
-    """Display paginated list of all blogs"""
-    blogs = Blog.objects.all()
-    
-    # Search functionality
-    search_query = request.GET.get('search')
-    if search_query:
-        blogs = blogs.filter(
-            Q(title__icontains=search_query) |
-            Q(content__icontains=search_query) |
-            Q(author__name__icontains=search_query)
-        )
-    
-    # Tag filtering
-    tag_filter = request.GET.get('tag')
-    if tag_filter:
-        blogs = blogs.filter(tags__name__iexact=tag_filter)
-    
-    # Pagination
-    paginator = Paginator(blogs, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    # Get all tags for filter dropdown
-    all_tags = Tag.objects.all()
-    
-    context = {
-        'page_obj': page_obj,
-        'search_query': search_query,
-        'tag_filter': tag_filter,
-        'all_tags': all_tags,
-    }
-    return render(request, 'crawler/blog_list.html', context)
-
-
-def blog_detail(request, blog_id):
-    """Display detailed view of a single blog"""
-    blog = get_object_or_404(Blog, id=blog_id)
-    comments = blog.comments.all()
-    
-    # Get related blogs based on tags
-    if blog.tags.exists():
-        related_blogs = Blog.objects.filter(
-            tags__in=blog.tags.all()
-        ).exclude(id=blog.id).distinct()[:3]
-    else:
-        related_blogs = Blog.objects.exclude(id=blog.id)[:3]
-    
-    context = {
-        'blog': blog,
-        'comments': comments,
-        'related_blogs': related_blogs,
-    }
-    return render(request, 'crawler/blog_detail.html', context)
-
-
-def search_history_view(request):
-    """Display search history"""
-    history = SearchHistory.objects.all()
-    
-    paginator = Paginator(history, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    context = {
-        'page_obj': page_obj,
-    }
-    return render(request, 'crawler/search_history.html', context)
-
-
-def tag_suggestions_api(request):
-    """API endpoint to get tag suggestions"""
-    query = request.GET.get('q', '')
-    if len(query) < 2:
-        return JsonResponse({'suggestions': []})
-    
-    crawler = MediumCrawler()
-    suggestions = crawler.suggest_tags(query)
-    
-    return JsonResponse({'suggestions': suggestions})
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.cache import patch_cache_control
+from django.contrib import messages
+from django.db.models import Count, Q
+from .models import Blog, Tag, SearchHistory, CrawlStatus
+from .forms import TagSearchForm
+from .jobs import enqueue_crawl
+from .metrics import render_metrics
+from .page_cache import cached_page, page_cache_alias, page_cache_timeout, page_version
+from .search import search_blogs
+from .events import read_events
+from .suggestions import suggest_tags
+from .tags import tag_list
+from .pagination import KeysetPaginator, cursor_url, paginate_sequence
+import asyncio
+import json
+import time
+from asgiref.sync import sync_to_async
+from datetime import datetime
+
+
+@cached_page(store=False)
+def home(request):
+    """Home page with search form and recent blogs"""
+    form = TagSearchForm()
+    # Lazy: the template only runs these when its cached fragments are stale
+    recent_blogs = Blog.objects.select_related('author').prefetch_related('tags')[:10]
+    search_history = SearchHistory.objects.all()[:5]
+    
+    context = {
+        'form': form,
+        'recent_blogs': recent_blogs,
+        'search_history': search_history,
+        'page_cache': page_cache_alias(),
+        'page_cache_timeout': page_cache_timeout(),
+        'page_version': page_version(),
+    }
+    return render(request, 'crawler/home.html', context)
+
+
+def search_tag(request):
+    """Handle tag search and initiate crawling"""
+    if request.method == 'POST':
+        form = TagSearchForm(request.POST)
+        if form.is_valid():
+            tag_name = form.cleaned_data['tag_name'].strip().lower()
+            
+            # Queue the crawl; a crawl_worker process picks it up
+            job = enqueue_crawl(tag_name)
+            request.session['current_crawl_id'] = job.id
+            
+            return redirect('crawler:crawl_status', tag_name=tag_name)
+    
+    return redirect('crawler:home')
+
+
+def crawl_status(request, tag_name):
+    """Show crawl status page with real-time updates"""
+    context = {
+        'tag_name': tag_name,
+    }
+    return render(request, 'crawler/crawl_status.html', context)
+
+
+def crawl_progress_api(request, tag_name):
+    """
+    API endpoint to get crawl progress.
+    
+    Pass the `cursor` from the previous response as `since` to receive only
+    the blogs crawled after it; `blogs_found` then counts just those.
+    """
+    try:
+        # Get latest crawl status for this tag
+        crawl_status = CrawlStatus.objects.filter(tag=tag_name).first()
+        
+        if not crawl_status:
+            return JsonResponse({
+                'status': 'not_found',
+                'message': 'Crawl not found'
+            })
+        
+        # Get currently crawled blogs for this tag, oldest first so the
+        # cursor can resume after the last one returned
+        blogs = Blog.objects.filter(
+            tags__name__lower=tag_name.lower(),
+            crawled_at__gte=crawl_status.started_at
+        )
+        
+        since = parse_progress_cursor(request.GET.get('since'))
+        if since:
+            since_crawled_at, since_id = since
+            blogs = blogs.filter(
+                Q(crawled_at__gt=since_crawled_at) |
+                Q(crawled_at=since_crawled_at, id__gt=since_id)
+            )
+        
+        blogs = list(blogs.order_by('crawled_at', 'id').values(
+            'id', 'title', 'author__name', 'summary', 'medium_url',
+            'published_date', 'reading_time', 'crawled_at'
+        ))
+        
+        # One query for the tags of every returned blog
+        blog_tags = {}
+        for blog_id, name in Blog.tags.through.objects.filter(
+            blog_id__in=[blog['id'] for blog in blogs]
+        ).values_list('blog_id', 'tag__name'):
+            blog_tags.setdefault(blog_id, []).append(name)
+        
+        blogs_data = []
+        for blog in blogs:
+            blogs_data.append({
+                'title': blog['title'],
+                'author': blog['author__name'],
+                'summary': blog['summary'] or '',
+                'url': blog['medium_url'],
+                'published_date': blog['published_date'].strftime('%Y-%m-%d') if blog['published_date'] else 'Unknown',
+                'reading_time': blog['reading_time'],
+                'tags': blog_tags.get(blog['id'], []),
+            })
+        
+        cursor = request.GET.get('since') or ''
+        if blogs:
+            cursor = f"{blogs[-1]['crawled_at'].isoformat()}|{blogs[-1]['id']}"
+        
+        return JsonResponse({
+            'status': crawl_status.status,
+            'blogs_found': len(blogs_data),
+            'blogs': blogs_data,
+            'cursor': cursor,
+            'total_expected': 10,
+            'completed_at': crawl_status.completed_at.isoformat() if crawl_status.completed_at else None,
+            'error_message': crawl_status.error_message,
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        })
+
+
+def parse_progress_cursor(value):
+    """Split a crawl progress cursor into (crawled_at, id), or None if invalid"""
+    try:
+        crawled_at, blog_id = value.rsplit('|', 1)
+        return datetime.fromisoformat(crawled_at), int(blog_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def crawl_events_stream(request, tag_name):
+    """
+    Server-Sent Events stream of a tag's latest crawl.
+    
+    Events are read from the cache the crawl worker publishes to, so a
+    watcher costs one query to find the crawl and, while streaming, only
+    an occasional look at the job's status. That look also covers crawls
+    run by crawl_tags or crawl_scheduler, which publish no events.
+    
+    Under ASGI the stream is an async generator that waits with
+    asyncio.sleep, so events are sent as they happen and an open stream
+    holds no thread. Under WSGI it is a plain generator, sent as it goes,
+    and each open stream holds one server thread.
+    """
+    crawl_status = CrawlStatus.objects.filter(tag=tag_name).first()
+    
+    # Resume after the last event the browser saw when it reconnects
+    try:
+        last_seq = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_seq = 0
+    
+    steps = crawl_event_steps(crawl_status, last_seq)
+    poll_interval = getattr(settings, 'CRAWLER_EVENTS_POLL_INTERVAL', 0.5)
+    
+    def stream():
+        for message in steps:
+            if message is None:
+                time.sleep(poll_interval)
+            else:
+                yield message
+    
+    async def astream():
+        # Each step reads the cache or the database, so it runs on the sync thread
+        next_step = sync_to_async(next)
+        while (message := await next_step(steps, STREAM_END)) is not STREAM_END:
+            if message is None:
+                await asyncio.sleep(poll_interval)
+            else:
+                yield message
+    
+    response = StreamingHttpResponse(
+        astream() if isinstance(request, ASGIRequest) else stream(), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+STREAM_END = object()
+
+
+def crawl_event_steps(crawl_status, last_seq):
+    """
+    The messages of a crawl event stream; None means nothing new yet and
+    the caller should wait CRAWLER_EVENTS_POLL_INTERVAL before asking again
+    """
+    if not crawl_status:
+        yield sse_message('status', {'status': 'not_found', 'message': 'Crawl not found'})
+        return
+    
+    status = crawl_status.status
+    if last_seq == 0:
+        yield sse_message('status', status_data(crawl_status))
+        if status in ('completed', 'failed'):
+            return
+    
+    status_interval = getattr(settings, 'CRAWLER_EVENTS_STATUS_INTERVAL', 5)
+    deadline = time.monotonic() + getattr(settings, 'CRAWLER_EVENTS_MAX_DURATION', 30 * 60)
+    idle_since = status_checked_at = time.monotonic()
+    while time.monotonic() < deadline:
+        for seq, event in read_events(crawl_status.id, last_seq):
+            last_seq = seq
+            idle_since = time.monotonic()
+            yield sse_message(event['type'], event['data'], seq)
+            if event['type'] == 'status':
+                status = event['data']['status']
+                if status in ('completed', 'failed'):
+                    return
+        
+        if time.monotonic() - status_checked_at >= status_interval:
+            status_checked_at = time.monotonic()
+            crawl_status.refresh_from_db(fields=['status', 'blogs_found', 'completed_at', 'error_message'])
+            if crawl_status.status != status:
+                # Send what the worker published before the change first
+                for seq, event in read_events(crawl_status.id, last_seq):
+                    last_seq = seq
+                    yield sse_message(event['type'], event['data'], seq)
+                status = crawl_status.status
+                idle_since = time.monotonic()
+                yield sse_message('status', status_data(crawl_status))
+                if status in ('completed', 'failed'):
+                    return
+        
+        # Comment line keeps proxies from closing an idle connection
+        if time.monotonic() - idle_since > 15:
+            idle_since = time.monotonic()
+            yield ': keep-alive\n\n'
+        yield None
+
+
+def status_data(crawl_status):
+    return {
+        'status': crawl_status.status,
+        'blogs_found': crawl_status.blogs_found,
+        'completed_at': crawl_status.completed_at.isoformat() if crawl_status.completed_at else None,
+        'error_message': crawl_status.error_message,
+    }
+
+
+def sse_message(event_type, data, event_id=None):
+    """Format one Server-Sent Events message"""
+    message = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+    if event_id is not None:
+        message = f"id: {event_id}\n" + message
+    return message
+
+
+# Blog.Meta ordering, with id as the tie-breaker that makes keys unique
+BLOG_ORDERING = [('published_date', True), ('crawled_at', True), ('id', True)]
+
+
+@cached_page()
+def blog_list(request):
+    """Display paginated list of all blogs"""
+    blogs = Blog.objects.select_related('author').prefetch_related('tags')
+    
+    # Search functionality
+    search_query = request.GET.get('search')
+    search_results = search_blogs(search_query) if search_query else None
+    if search_results is not None:
+        blogs = blogs.filter(id__in=[blog_id for blog_id, snippet in search_results])
+    elif search_query:
+        # No full-text index on this database
+        blogs = blogs.filter(
+            Q(title__icontains=search_query) |
+            Q(summary__icontains=search_query) |
+            Q(author__name__icontains=search_query)
+        )
+    
+    # Tag filtering
+    tag_filter = request.GET.get('tag')
+    if tag_filter:
+        blogs = blogs.filter(tags__name__lower=tag_filter.lower())
+    
+    cursor = request.GET.get('cursor')
+    if search_results is not None:
+        # Page through the hits in relevance order and show the matching snippet
+        snippets = dict(search_results)
+        matching_ids = set(blogs.values_list('id', flat=True)) if tag_filter else snippets
+        page_obj = paginate_sequence([blog_id for blog_id, snippet in search_results if blog_id in matching_ids], cursor, 10)
+        blogs_by_id = blogs.in_bulk(page_obj.object_list)
+        page_obj.object_list = [blogs_by_id[blog_id] for blog_id in page_obj.object_list if blog_id in blogs_by_id]
+        for blog in page_obj.object_list:
+            blog.search_snippet = snippets[blog.id]
+    else:
+        page_obj = KeysetPaginator(blogs, BLOG_ORDERING, per_page=10).get_page(cursor)
+    
+    # Tags for the filter dropdown, cached until tags change
+    all_tags = tag_list()
+    
+    context = {
+        'page_obj': page_obj,
+        'search_query': search_query,
+        'tag_filter': tag_filter,
+        'all_tags': all_tags,
+        'next_url': cursor_url(request, page_obj.next_cursor) if page_obj.has_next() else None,
+        'previous_url': cursor_url(request, page_obj.previous_cursor) if page_obj.has_previous() else None,
+    }
+    return render(request, 'crawler/blog_list.html', context)
+
+
+@cached_page()
+def blog_detail(request, blog_id):
+    """Display detailed view of a single blog"""
+    # The only view that shows the full text
+    blog = get_object_or_404(Blog.objects.select_related('author', 'body'), id=blog_id)
+    comments = blog.comments.all()
+    
+    # Related blogs are precomputed by crawler.related
+    related_blogs = [
+        entry.related
+        for entry in blog.related_entries.select_related('related__author')[:3]
+    ]
+    if not related_blogs:
+        # Not computed yet: the blogs sharing most tags with this one
+        related_blogs = Blog.objects.select_related('author').filter(
+            tags__in=blog.tags.all()
+        ).exclude(id=blog.id).annotate(shared_tags=Count('id')).order_by('-shared_tags', '-id')[:3]
+    
+    context = {
+        'blog': blog,
+        'comments': comments,
+        'related_blogs': related_blogs,
+    }
+    return render(request, 'crawler/blog_detail.html', context)
+
+
+def search_history_view(request):
+    """Display search history"""
+    paginator = KeysetPaginator(SearchHistory.objects.all(), [('search_time', True), ('id', True)], per_page=20)
+    page_obj = paginator.get_page(request.GET.get('cursor'))
+    
+    context = {
+        'page_obj': page_obj,
+        'next_url': cursor_url(request, page_obj.next_cursor) if page_obj.has_next() else None,
+        'previous_url': cursor_url(request, page_obj.previous_cursor) if page_obj.has_previous() else None,
+    }
+    return render(request, 'crawler/search_history.html', context)
+
+
+def tag_suggestions_api(request):
+    """API endpoint to get tag suggestions"""
+    query = request.GET.get('q', '')
+    if len(query) < 2:
+        return JsonResponse({'suggestions': []})
+    
+    response = JsonResponse({'suggestions': suggest_tags(query)})
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'CRAWLER_TAG_SUGGESTIONS_MAX_AGE', 60))
+    return response
+
+
+def metrics(request):
+    """Crawl stage timings, counters and queue sizes for Prometheus"""
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,139 +1,239 @@
-"""
-Django settings for medium_crawler project.
-
-Generated by 'django-admin startproject' using Django 4.2.7.
-
-For more information on this file, see
-https://docs.djangoproject.com/en/4.2/topics/settings/
-
-For the full list of settings and their values, see
-https://docs.djangoproject.com/en/4.2/ref/settings/
-"""
-
-from pathlib import Path
-
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
-
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-ft^sk=kj7##79=117ou@*f3#=rm&^zhzyfliinj-tku*1ym7!t'
-
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
-
-ALLOWED_HOSTS = []
-
-
-# Application definition
-
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-    
-    # Third party apps
-    'bootstrap4',
-    'crispy_forms',
-    'crispy_bootstrap4',
-    
-    # Local apps
-    'crawler',
-    # Note: admin_panel app removed - using Django's built-in admin
-]
-
-MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
-
-ROOT_URLCONF = 'medium_crawler.urls'
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = 'medium_crawler.wsgi.application'
-
-
-# Database
-# https://docs.djangoproject.com/en/4.2/ref/settings/#databases
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
-
-
-# Password validation
-# https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
-
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
-    },
-]
-
-
-# Internationalization
-# https://docs.djangoproject.com/en/4.2/topics/i18n/
-
-LANGUAGE_CODE = 'en-us'
-
-TIME_ZONE = 'UTC'
-
-USE_I18N = True
-
-USE_TZ = True
-
-
-# Static files (CSS, JavaScript, Images)
-# https://docs.djangoproject.com/en/4.2/howto/static-files/
-
-STATIC_URL = 'static/'
-STATICFILES_DIRS = [
-    BASE_DIR / "static",
-]
-
-# Crispy Forms Configuration
-CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap4"
-CRISPY_TEMPLATE_PACK = "bootstrap4"
-
-# Default primary key field type
-# https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
-
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+"""
+Django settings for medium_crawler project.
+
+Generated by 'django-admin startproject' using Django 4.2.7.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/4.2/ref/settings/
+"""
+
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'django-insecure-ft^sk=kj7##79=117ou@*f3#=rm&^zhzyfliinj-tku*1ym7!t'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+ALLOWED_HOSTS = []
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    
+    # Third party apps
+    'bootstrap4',
+    'crispy_forms',
+    'crispy_bootstrap4',
+    
+    # Local apps
+    'crawler',
+    # Note: admin_panel app removed - using Django's built-in admin
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'medium_crawler.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'medium_crawler.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/4.2/topics/i18n/
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/4.2/howto/static-files/
+
+STATIC_URL = 'static/'
+STATICFILES_DIRS = [
+    BASE_DIR / "static",
+]
+
+# Crispy Forms Configuration
+CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap4"
+CRISPY_TEMPLATE_PACK = "bootstrap4"
+
+# Cache
+# The 'crawler' cache is file based so crawl workers and the web process share it
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'crawler': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+}
+
+# Crawler Configuration
+# Number of article pages fetched concurrently per crawl
+CRAWLER_MAX_WORKERS = 4
+# Politeness budget per host: sustained requests per second and burst size
+CRAWLER_RATE_LIMIT = 2.0
+CRAWLER_RATE_BURST = 4
+# Crawl jobs processed concurrently by `manage.py crawl_worker`
+CRAWLER_QUEUE_WORKERS = 2
+# Running crawls refresh their job's claimed_at this often (seconds), so
+# only jobs whose process is gone look stale to `crawl_worker --stale-after`
+CRAWLER_JOB_HEARTBEAT = 60
+# On-disk HTTP cache for feeds and article pages (set the directory to None to disable).
+# Entries younger than the TTL are served without a request; older ones are
+# revalidated with If-None-Match / If-Modified-Since.
+CRAWLER_HTTP_CACHE_DIR = BASE_DIR / 'http_cache'
+CRAWLER_HTTP_CACHE_TTL = 300
+CRAWLER_HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# Articles already stored are not fetched again, unless they were crawled longer
+# ago than this timedelta (None never refreshes)
+CRAWLER_REFRESH_OLDER_THAN = None
+# Ranked full-text matches considered by the blog list search
+CRAWLER_SEARCH_MAX_RESULTS = 200
+# Crawl progress events for the SSE stream: cache alias, how often an open
+# stream checks for new events and for a change of the job's status, and how
+# long a stream may stay open (seconds)
+CRAWLER_EVENTS_CACHE = 'crawler'
+CRAWLER_EVENTS_POLL_INTERVAL = 0.5
+CRAWLER_EVENTS_STATUS_INTERVAL = 5
+CRAWLER_EVENTS_MAX_DURATION = 30 * 60
+# Crawled articles are written to the database in batches of up to this size,
+# or sooner once the oldest unsaved article has waited this long (seconds), so
+# the live progress of a slow crawl does not stall behind a large batch
+CRAWLER_SAVE_BATCH_SIZE = 100
+CRAWLER_SAVE_BATCH_INTERVAL = 2
+# Connection pool size shared by all in-flight requests of AsyncMediumCrawler
+CRAWLER_ASYNC_MAX_CONNECTIONS = 100
+# Adaptive polling by `manage.py crawl_scheduler` (seconds): new tags start at
+# the default interval, busy tags are polled down to the minimum and tags with
+# no new articles back off exponentially up to the maximum
+CRAWLER_SCHEDULE_DEFAULT_INTERVAL = 6 * 60 * 60
+CRAWLER_SCHEDULE_MIN_INTERVAL = 15 * 60
+CRAWLER_SCHEDULE_MAX_INTERVAL = 7 * 24 * 60 * 60
+# Tag autocomplete is served from an in-process index. Crawl workers mark it
+# stale through this cache; web processes check for that every few seconds.
+CRAWLER_TAG_SUGGESTIONS_CACHE = 'crawler'
+CRAWLER_TAG_SUGGESTIONS_CHECK_INTERVAL = 5
+# Browser cache lifetime of autocomplete responses (seconds)
+CRAWLER_TAG_SUGGESTIONS_MAX_AGE = 60
+# List pages count matching rows only up to this many and show "N+" beyond it
+CRAWLER_PAGINATION_COUNT_LIMIT = 1000
+# Related articles stored per blog, how many of a new blog's closest
+# neighbours get it merged into their lists when it is saved, and how many of
+# each tag's most recently tagged blogs are scored against it
+CRAWLER_RELATED_PER_BLOG = 5
+CRAWLER_RELATED_NEIGHBOURS = 100
+CRAWLER_RELATED_CANDIDATES = 1000
+# New articles whose content SimHash is within this many bits (at most 7) of a
+# stored blog are linked to it as an alias instead of being saved again (None
+# disables). Texts shorter than the word minimum are not fingerprinted.
+CRAWLER_NEAR_DUPLICATE_DISTANCE = 6
+CRAWLER_NEAR_DUPLICATE_MIN_WORDS = 50
+# Rendered blog list and blog detail pages, and the blog sections of the home
+# page, are cached in this cache alias: 'default' keeps them in process memory,
+# 'crawler' on disk where every web process shares them, and an alias using
+# DummyCache disables caching. Saving blogs bumps a version kept in the shared
+# version cache; web processes check it at most every CHECK_INTERVAL seconds.
+# Pages are also re-rendered every TIMEOUT seconds, for their relative times.
+CRAWLER_PAGE_CACHE = 'default'
+CRAWLER_PAGE_CACHE_VERSION_CACHE = 'crawler'
+CRAWLER_PAGE_CACHE_TIMEOUT = 10 * 60
+CRAWLER_PAGE_CACHE_CHECK_INTERVAL = 1
+# Request timeouts (seconds): connecting, and waiting for response data
+CRAWLER_CONNECT_TIMEOUT = 5
+CRAWLER_READ_TIMEOUT = 15
+# 429 and 5xx responses, connection errors and timeouts are retried up to this
+# many times with jittered exponential backoff starting at the base delay
+# (seconds). A Retry-After longer than the maximum delay fails the request.
+CRAWLER_MAX_RETRIES = 3
+CRAWLER_RETRY_BACKOFF = 0.5
+CRAWLER_RETRY_MAX_DELAY = 30
+# After this many failed requests in a row a host's circuit opens and its
+# requests fail fast for the reset time (seconds) before one is tried again
+CRAWLER_CIRCUIT_FAILURES = 5
+CRAWLER_CIRCUIT_RESET = 30
+# Where feeds and article pages are requested from. Stored URLs always point
+# at medium.com; `manage.py bench_crawl` points this at a local stand-in.
+CRAWLER_MEDIUM_BASE_URL = 'https://medium.com'
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'